@@ -5,217 +5,55 @@ Eine agentenbasierte Simulation zur Erforschung kultureller Dynamiken in Primate
 """
 
 import tkinter as tk
-from tkinter import ttk, messagebox, filedialog
+from tkinter import ttk, messagebox, filedialog, simpledialog
 import numpy as np
-import random
-from datetime import datetime
-import csv
-from PIL import Image, ImageTk, ImageDraw
+from PIL import ImageTk
 import threading
 import time
+import os
+import queue
+from primaten_export import StreamExporter
+from primaten_bild import status_bild, kultur_bild, kultur_palette, diagramm_bild, BildRekorder
+from primaten_ansicht import Ansicht
+from primaten_karten import KartenAkkumulator, karten_bilder
+from primaten_takt import TaktSteuerung, GESCHWINDIGKEITEN
+from primaten_kern import FeldSimulation, anteil_matrix
+# Früher in diesem Modul definiert; bleiben für ältere Aufrufer importierbar
+from primaten_kern import Primat, PrimatenSimulation
 
-class Primat:
-    """Klasse für einen einzelnen Primaten"""
-    def __init__(self, status=0, alter=0, geschlecht=0, kultur=0, macht=0):
-        self.status = status      # 0=kein Primat, 1=jung, 2=erwachsen
-        self.alter = alter        # in Ticks
-        self.geschlecht = geschlecht  # 1=weiblich, 2=männlich
-        self.kultur = kultur      # 1-9 für verschiedene Kulturen
-        self.macht = macht        # Sozialer Einfluss (1-9)
-
-class PrimatenSimulation:
-    """Hauptklasse für die Primaten-Simulation"""
-    
-    def __init__(self, breite=60, hoehe=60, initial_dichte=0.1):
-        self.breite = breite
-        self.hoehe = hoehe
-        self.raum = np.empty((hoehe, breite), dtype=object)
-        self.tick_index = 0
-        self.history = []
-        self.max_history = 5000
-        self.kultur_farben = [
-            None, '#e6194B', '#3cb44b', '#ffe119', '#4363d8', 
-            '#f58231', '#911eb4', '#46f0f0', '#f032e6', '#bcf60c'
-        ]
-        self.initialisiere_raum(initial_dichte)
-        
-    def initialisiere_raum(self, dichte=0.1):
-        """Initialisiert den Raum mit zufällig verteilten Primaten"""
-        for y in range(self.hoehe):
-            for x in range(self.breite):
-                if random.random() < dichte:
-                    # Zufällige Eigenschaften für neuen Primaten
-                    geschlecht = 1 if random.random() < 0.5 else 2
-                    kultur = random.randint(1, 9)
-                    macht = random.randint(1, 9)
-                    self.raum[y][x] = Primat(1, 0, geschlecht, kultur, macht)
-                else:
-                    self.raum[y][x] = Primat()
-        
-        self.tick_index = 0
-        self.history = []
-        self.berechne_statistik()
-    
-    def nachbarn(self, x, y):
-        """Gibt die 8 Nachbarn einer Position zurück (toroidale Geometrie)"""
-        nachbarn_pos = []
-        for dy in [-1, 0, 1]:
-            for dx in [-1, 0, 1]:
-                if dx == 0 and dy == 0:
-                    continue
-                nx = (x + dx) % self.breite
-                ny = (y + dy) % self.hoehe
-                nachbarn_pos.append(self.raum[ny][nx])
-        return nachbarn_pos
-    
-    def kind_erzeugen(self, mutter):
-        """Erzeugt ein neues Kind basierend auf der Mutter"""
-        geschlecht = 1 if random.random() < 0.5 else 2
-        return Primat(1, 0, geschlecht, mutter.kultur, mutter.macht)
-    
-    def neue_generation(self, x, y):
-        """Berechnet den neuen Zustand für eine Position"""
-        aktuell = self.raum[y][x]
-        nachbarn = self.nachbarn(x, y)
-        
-        # Kopie des aktuellen Zustands
-        neu = Primat(aktuell.status, aktuell.alter, aktuell.geschlecht, 
-                    aktuell.kultur, aktuell.macht)
-        
-        # Alterungsprozess
-        if neu.status > 0:
-            if random.random() < 0.8:
-                neu.alter += 1
-            if neu.alter > 19:
-                neu.status = 0  # Tod
-            elif neu.alter >= 3 and neu.status == 1:
-                neu.status = 2  # Erwachsen werden
-        
-        # Geburt neuer Primaten
-        if neu.status == 0:
-            weibchen = [p for p in nachbarn if p.status == 2 and p.geschlecht == 1]
-            maennchen = [p for p in nachbarn if p.status == 2 and p.geschlecht == 2]
-            
-            if weibchen and maennchen and random.random() < 0.25:
-                mutter = random.choice(weibchen)
-                return self.kind_erzeugen(mutter)
-            
-            # Spontane Entstehung (Migration)
-            if random.random() < 0.001:
-                geschlecht = 1 if random.random() < 0.5 else 2
-                kultur = random.randint(1, 9)
-                macht = random.randint(1, 9)
-                return Primat(1, 0, geschlecht, kultur, macht)
-        
-        # Isolationstod - wenn komplett von anderen Kulturen umgeben
-        if neu.status > 0:
-            fremde = [p for p in nachbarn if p.kultur != neu.kultur]
-            if len(fremde) == 8:  # Alle Nachbarn sind fremd
-                return Primat()
-        
-        # Kulturelle Beeinflussung
-        if neu.status == 2:
-            staerkere = [p for p in nachbarn if p.status == 2 and p.macht > neu.macht]
-            if staerkere:
-                einflussreichster = max(staerkere, key=lambda p: p.macht)
-                if random.random() < 0.3:
-                    neu.kultur = einflussreichster.kultur
-                    neu.macht = max(0, neu.macht - 1)
-            else:
-                neu.macht = min(9, neu.macht + 0.1)
-        
-        return neu
-    
-    def tick(self):
-        """Führt einen Simulationsschritt durch"""
-        neuer_raum = np.empty((self.hoehe, self.breite), dtype=object)
-        
-        for y in range(self.hoehe):
-            for x in range(self.breite):
-                neuer_raum[y][x] = self.neue_generation(x, y)
-        
-        self.raum = neuer_raum
-        self.tick_index += 1
-        return self.berechne_statistik()
-    
-    def berechne_statistik(self):
-        """Berechnet Statistiken über die aktuelle Population"""
-        kultur_zaehler = [0] * 9
-        gesamt_population = 0
-        
-        for y in range(self.hoehe):
-            for x in range(self.breite):
-                p = self.raum[y][x]
-                if p.status > 0 and p.kultur > 0:
-                    kultur_zaehler[p.kultur - 1] += 1
-                    gesamt_population += 1
-        
-        # Anteile berechnen
-        anteile = [count / gesamt_population if gesamt_population > 0 else 0 
-                  for count in kultur_zaehler]
-        
-        # Zur Historie hinzufügen
-        datenpunkt = {
-            'tick': self.tick_index,
-            'population': gesamt_population,
-            'anteile': anteile.copy(),
-            'kultur_counts': kultur_zaehler.copy()
-        }
-        
-        self.history.append(datenpunkt)
-        if len(self.history) > self.max_history:
-            self.history.pop(0)
-        
-        return anteile, gesamt_population
-    
-    def monokultur_erkannt(self, anteile, population):
-        """Prüft, ob eine Monokultur erreicht wurde"""
-        if population < 10:
-            return False, None
-        
-        max_anteil = max(anteile)
-        if max_anteil >= 0.995:
-            dominante_kultur = anteile.index(max_anteil) + 1
-            return True, dominante_kultur
-        
-        return False, None
-    
-    def export_csv(self, dateiname=None):
-        """Exportiert die Simulationsdaten als CSV"""
-        if not dateiname:
-            zeitstempel = datetime.now().strftime("%Y%m%d_%H%M%S")
-            dateiname = f"kulturverlauf_{zeitstempel}.csv"
-        
-        with open(dateiname, 'w', newline='', encoding='utf-8') as csvfile:
-            writer = csv.writer(csvfile)
-            # Header schreiben
-            header = ['tick', 'population'] + [f'kultur_{i+1}' for i in range(9)]
-            writer.writerow(header)
-            
-            # Daten schreiben
-            for eintrag in self.history:
-                zeile = [eintrag['tick'], eintrag['population']]
-                zeile.extend([f"{a:.5f}" for a in eintrag['anteile']])
-                writer.writerow(zeile)
-        
-        return dateiname
+# Anzeigearten der Kulturanzeige
+KULTUR_MODI = ("Kultur (aktuell)", "Kultur (Mittel)", "Belegung (Mittel)", "Ressourcen-Erschöpfung (Mittel)")
 
 class PrimatenGUI:
     """Grafische Benutzeroberfläche für die Primaten-Simulation"""
     
-    def __init__(self, root):
+    def __init__(self, root, variante='basis'):
         self.root = root
-        self.root.title("Primaten – erweiterte Kultursimulation")
+        titel = "Primaten – erweiterte Kultursimulation"
+        if variante == 'opt':
+            titel += " (Optimiert)"
+        self.root.title(titel)
         self.root.geometry("1200x800")
         
-        # Simulation initialisieren
-        self.simulation = PrimatenSimulation(40, 40, 0.1)
+        # Simulation initialisieren (schneller Feld-Kern, Regeln der gewählten Variante)
+        self.simulation = FeldSimulation(40, 40, 0.1, variante=variante)
         self.laufend = False
-        self.tick_intervall = 150  # ms
+        self.takt = TaktSteuerung(ziel_tps=10)  # Ticks pro Sekunde, mehrere Ticks pro Bild
+        self.stream_exporter = None
+        self.rekorder = None
+        self._export_meldungen = queue.Queue()
+        # Gemeinsamer Ausschnitt beider Gitteranzeigen (Ziehen verschiebt, Mausrad zoomt)
+        self.ansicht = Ansicht(self.simulation.breite, self.simulation.hoehe)
+        self.palette = kultur_palette(self.simulation.kultur_farben)
+        self._bilder = {}
+        self._zieh_punkt = None
+        # Zeitgemittelte Karten für die Kulturanzeige (seit der letzten Zufallsverteilung)
+        self.karten = KartenAkkumulator().verfolge(self.simulation)
         
         # GUI-Elemente erstellen
         self.erste_gui()
         self.aktualisiere_anzeige()
+        self.root.protocol("WM_DELETE_WINDOW", self.beenden)
         
     def erste_gui(self):
         """Erstellt die grafische Benutzeroberfläche"""
@@ -260,10 +98,10 @@ class PrimatenGUI:
         speed_frame = ttk.Frame(control_frame)
         speed_frame.grid(row=1, column=0, columnspan=2, sticky=(tk.W, tk.E), pady=(5, 0))
         
-        ttk.Label(speed_frame, text="Geschwindigkeit:").grid(row=0, column=0, padx=(0, 5))
-        self.speed_var = tk.StringVar(value="150")
+        ttk.Label(speed_frame, text="Geschwindigkeit (Ticks/s):").grid(row=0, column=0, padx=(0, 5))
+        self.speed_var = tk.StringVar(value="10")
         speed_combo = ttk.Combobox(speed_frame, textvariable=self.speed_var, 
-                                  values=["50", "100", "150", "250", "400"], 
+                                  values=GESCHWINDIGKEITEN, 
                                   state="readonly", width=8)
         speed_combo.grid(row=0, column=1, padx=5)
         speed_combo.bind('<<ComboboxSelected>>', self.geschwindigkeit_aendern)
@@ -308,6 +146,20 @@ class PrimatenGUI:
         self.kultur_canvas = tk.Canvas(kultur_frame, width=320, height=320, bg="black")
         self.kultur_canvas.grid(row=0, column=0, sticky=(tk.W, tk.E, tk.N, tk.S))
         
+        self.kultur_modus_var = tk.StringVar(value=KULTUR_MODI[0])
+        modus_combo = ttk.Combobox(kultur_frame, textvariable=self.kultur_modus_var,
+                                   values=KULTUR_MODI, state="readonly", width=24)
+        modus_combo.grid(row=1, column=0, sticky=tk.W, pady=(3, 0))
+        modus_combo.bind('<<ComboboxSelected>>', lambda event: self.zeichne_kultur())
+        
+        for canvas in (self.status_canvas, self.kultur_canvas):
+            canvas.bind('<ButtonPress-1>', self.ziehen_beginnen)
+            canvas.bind('<B1-Motion>', self.ziehen)
+            canvas.bind('<MouseWheel>', self.mausrad)
+            canvas.bind('<Button-4>', self.mausrad)
+            canvas.bind('<Button-5>', self.mausrad)
+            canvas.bind('<Double-Button-1>', self.einpassen)
+        
         # Rechte Seite: Diagramm und Legende
         right_frame = ttk.Frame(display_frame)
         right_frame.grid(row=0, column=1, sticky=(tk.W, tk.E, tk.N, tk.S), padx=(5, 0))
@@ -359,13 +211,17 @@ class PrimatenGUI:
         
         ttk.Label(kultur_legende_frame, text="Kulturen:").grid(row=0, column=0, columnspan=2, sticky=tk.W)
         
-        for i in range(1, 10):
+        anzahl_kulturen = self.simulation.anzahl_kulturen
+        for i in range(1, min(anzahl_kulturen, 9) + 1):
             row = (i-1) // 3 + 1
             col = (i-1) % 3
             farbe = self.simulation.kultur_farben[i]
             canvas = tk.Canvas(kultur_legende_frame, width=15, height=15, bg=farbe, highlightthickness=1)
             canvas.grid(row=row, column=col*2, padx=(5, 2), pady=2)
             ttk.Label(kultur_legende_frame, text=str(i)).grid(row=row, column=col*2+1, sticky=tk.W, pady=2)
+        if anzahl_kulturen > 9:
+            ttk.Label(kultur_legende_frame, text=f"… und {anzahl_kulturen - 9} weitere").grid(
+                row=4, column=0, columnspan=6, sticky=tk.W, pady=2)
         
         # Export-Buttons
         export_frame = ttk.Frame(bottom_right_frame)
@@ -375,58 +231,90 @@ class PrimatenGUI:
                   command=self.export_csv).grid(row=0, column=0, padx=5)
         ttk.Button(export_frame, text="🖼 PNG Export", 
                   command=self.export_png).grid(row=0, column=1, padx=5)
+        self.stream_button = ttk.Button(export_frame, text="⏺ Verlauf streamen", 
+                                       command=self.stream_umschalten)
+        self.stream_button.grid(row=0, column=2, padx=5)
+        self.aufnahme_button = ttk.Button(export_frame, text="🎞 Aufnahme", 
+                                         command=self.aufnahme_umschalten)
+        self.aufnahme_button.grid(row=0, column=3, padx=5)
     
     def hex_to_rgb(self, hex_color):
         """Wandelt Hex-Farben in RGB um"""
         hex_color = hex_color.lstrip('#')
         return tuple(int(hex_color[i:i+2], 16) for i in (0, 2, 4))
     
-    def zeichne_status(self):
-        """Zeichnet die Status-Ansicht"""
-        canvas = self.status_canvas
-        canvas.delete("all")
-        
+    def _groesse(self, canvas):
+        """Pixelgröße einer Canvas (vor dem ersten Zeichnen die angeforderte Größe)"""
         breite = canvas.winfo_width()
         hoehe = canvas.winfo_height()
-        zell_groesse = min(breite // self.simulation.breite, hoehe // self.simulation.hoehe)
-        
-        farb_map = {
-            (1, 1): "#ffb6c1",  # weiblich, jung
-            (1, 2): "#87cefa",  # männlich, jung
-            (2, 1): "#ff69b4",  # weiblich, erwachsen
-            (2, 2): "#1e90ff"   # männlich, erwachsen
-        }
-        
-        for y in range(self.simulation.hoehe):
-            for x in range(self.simulation.breite):
-                p = self.simulation.raum[y][x]
-                if p.status > 0:
-                    farbe = farb_map.get((p.status, p.geschlecht), "white")
-                    x1 = x * zell_groesse
-                    y1 = y * zell_groesse
-                    x2 = x1 + zell_groesse
-                    y2 = y1 + zell_groesse
-                    canvas.create_rectangle(x1, y1, x2, y2, fill=farbe, outline="")
+        if breite <= 1 or hoehe <= 1:
+            breite, hoehe = int(canvas['width']), int(canvas['height'])
+        return breite, hoehe
+    
+    def _zeige_bild(self, canvas, bild):
+        """Ersetzt den Inhalt der Canvas durch ein Bild (Referenz halten, sonst verschwindet es)"""
+        foto = ImageTk.PhotoImage(bild)
+        self._bilder[canvas] = foto
+        canvas.delete("all")
+        canvas.create_image(0, 0, image=foto, anchor=tk.NW)
+    
+    def zeichne_status(self):
+        """Zeichnet die Status-Ansicht (mit Ressourcen-Hintergrund, falls aktiv)"""
+        canvas = self.status_canvas
+        breite, hoehe = self._groesse(canvas)
+        zustand = self.simulation.zustand_arrays()
+        self._zeige_bild(canvas, self.ansicht.status_bild(zustand, breite, hoehe))
     
     def zeichne_kultur(self):
-        """Zeichnet die Kultur-Ansicht"""
+        """Zeichnet die Kultur-Ansicht: aktuelle Kulturen oder eine zeitgemittelte Karte"""
         canvas = self.kultur_canvas
-        canvas.delete("all")
-        
-        breite = canvas.winfo_width()
-        hoehe = canvas.winfo_height()
-        zell_groesse = min(breite // self.simulation.breite, hoehe // self.simulation.hoehe)
-        
-        for y in range(self.simulation.hoehe):
-            for x in range(self.simulation.breite):
-                p = self.simulation.raum[y][x]
-                if p.kultur > 0:
-                    farbe = self.simulation.kultur_farben[p.kultur]
-                    x1 = x * zell_groesse
-                    y1 = y * zell_groesse
-                    x2 = x1 + zell_groesse
-                    y2 = y1 + zell_groesse
-                    canvas.create_rectangle(x1, y1, x2, y2, fill=farbe, outline="")
+        breite, hoehe = self._groesse(canvas)
+        modus = self.kultur_modus_var.get()
+        if modus == "Kultur (aktuell)" or self.karten.aufnahmen == 0:
+            bild = self.ansicht.kultur_bild(self.simulation.zustand_arrays(), self.palette, breite, hoehe)
+        elif modus == "Kultur (Mittel)":
+            bild = self.ansicht.kultur_bild({'kultur': self.karten.dominante_kultur()}, self.palette,
+                                            breite, hoehe)
+        elif modus == "Belegung (Mittel)":
+            bild = self.ansicht.karten_bild(self.karten.belegung(), breite, hoehe)
+        else:
+            erschoepfung = self.karten.erschoepfung()
+            if erschoepfung is None:
+                erschoepfung = np.zeros(self.karten.form)
+            bild = self.ansicht.karten_bild(erschoepfung, breite, hoehe)
+        self._zeige_bild(canvas, bild)
+    
+    def zeichne_gitter(self):
+        """Zeichnet beide Gitteranzeigen neu (nach Verschieben oder Zoomen)"""
+        self.zeichne_status()
+        self.zeichne_kultur()
+    
+    def ziehen_beginnen(self, event):
+        self._zieh_punkt = (event.x, event.y)
+    
+    def ziehen(self, event):
+        """Verschiebt den Ausschnitt mit der Maus"""
+        if self._zieh_punkt is None:
+            return
+        dx = event.x - self._zieh_punkt[0]
+        dy = event.y - self._zieh_punkt[1]
+        self._zieh_punkt = (event.x, event.y)
+        self.ansicht.verschieben(dx, dy, *self._groesse(event.widget))
+        self.zeichne_gitter()
+    
+    def mausrad(self, event):
+        """Zoomt um den Mauszeiger (Windows/macOS: delta, X11: Button-4/5)"""
+        if getattr(event, 'num', None) == 4 or getattr(event, 'delta', 0) > 0:
+            faktor = 1.25
+        else:
+            faktor = 0.8
+        self.ansicht.zoomen(faktor, event.x, event.y, *self._groesse(event.widget))
+        self.zeichne_gitter()
+    
+    def einpassen(self, event=None):
+        """Doppelklick: ganzes Gitter anzeigen"""
+        self.ansicht.einpassen()
+        self.zeichne_gitter()
     
     def zeichne_diagramm(self):
         """Zeichnet das Entwicklungsdiagramm"""
@@ -473,14 +361,15 @@ class PrimatenGUI:
                 canvas.create_text(x, hoehe - padding + 15, text=str(daten[i]['tick']), 
                                   fill="white", anchor="n", font=("Arial", 8))
         
-        # Kulturlinien zeichnen
-        for k in range(9):
-            farbe = self.simulation.kultur_farben[k + 1]
+        # Kulturlinien zeichnen (bei vielen Kulturen nur die mit den größten Anteilen)
+        kulturen, anteile = anteil_matrix(daten, max_kulturen=20)
+        for spalte, kultur in enumerate(kulturen.tolist()):
+            farbe = self.simulation.kultur_farben[kultur]
             punkte = []
             
-            for i, datenpunkt in enumerate(daten):
+            for i in range(len(daten)):
                 x = padding + i * (breite - 2*padding) / len(daten)
-                y = hoehe - padding - datenpunkt['anteile'][k] * (hoehe - 2*padding)
+                y = hoehe - padding - anteile[i, spalte] * (hoehe - 2*padding)
                 punkte.extend([x, y])
             
             if len(punkte) >= 4:
@@ -503,10 +392,12 @@ class PrimatenGUI:
         """Aktualisiert die Statistik-Anzeige"""
         if self.simulation.history:
             aktuell = self.simulation.history[-1]
-            anteile = aktuell['anteile']
-            dominante_kultur = anteile.index(max(anteile)) + 1
+            anteile = dict(zip(aktuell['kulturen'].tolist(), aktuell['anteile'].tolist()))
+            dominante_kultur = max(anteile, key=anteile.get) if anteile else "-"
             
             text = f"Tick: {aktuell['tick']} | Population: {aktuell['population']} | Dominante Kultur: K{dominante_kultur}"
+            if self.laufend:
+                text += f" | {self.takt.gemessene_tps:.1f} Ticks/s"
             
             # Monokultur-Prüfung
             mono, kultur = self.simulation.monokultur_erkannt(anteile, aktuell['population'])
@@ -526,16 +417,35 @@ class PrimatenGUI:
         self.aktualisiere_statistik()
     
     def simulations_loop(self):
-        """Haupt-Schleife für die Simulation"""
+        """Haupt-Schleife: rechnet mehrere Ticks pro Bild, gesteuert von der Taktsteuerung"""
+        if not self.laufend:
+            return
+        
+        anzahl = self.takt.ticks_pro_bild()
+        auto_stopp = self.auto_stopp_var.get()
+        start = time.perf_counter()
+        gerechnet = 0
+        while gerechnet < anzahl:
+            anteile, population = self.simulation.tick()
+            gerechnet += 1
+            if auto_stopp and self.simulation.monokultur_erkannt(anteile, population)[0]:
+                break
+        self.takt.miss_ticks(gerechnet, time.perf_counter() - start)
+        
+        start = time.perf_counter()
+        self.takt.bild_fertig(gerechnet, start)
+        self.aktualisiere_anzeige()
+        self.root.update_idletasks()
+        self.takt.miss_render(time.perf_counter() - start)
+        
         if self.laufend:
-            self.simulation.tick()
-            self.aktualisiere_anzeige()
-            self.root.after(self.tick_intervall, self.simulations_loop)
+            self.root.after(self.takt.verzoegerung_ms(), self.simulations_loop)
     
     def start_simulation(self):
         """Startet die Simulation"""
         if not self.laufend:
             self.laufend = True
+            self.takt.neu_starten()
             self.simulations_loop()
     
     def stopp_simulation(self):
@@ -546,11 +456,14 @@ class PrimatenGUI:
         """Setzt eine neue Zufallsverteilung"""
         self.stopp_simulation()
         self.simulation.initialisiere_raum(0.1)
+        if self.simulation.regeln['ressourcen']:
+            self.simulation.initialisiere_ressourcen()
+        self.karten.zuruecksetzen()
         self.aktualisiere_anzeige()
     
     def geschwindigkeit_aendern(self, event=None):
         """Ändert die Simulationsgeschwindigkeit"""
-        self.tick_intervall = int(self.speed_var.get())
+        self.takt.setze_geschwindigkeit(self.speed_var.get())
     
     def export_csv(self):
         """Exportiert die Daten als CSV"""
@@ -566,22 +479,147 @@ class PrimatenGUI:
         except Exception as e:
             messagebox.showerror("Export Fehler", f"Fehler beim Export: {str(e)}")
     
+    def stream_umschalten(self):
+        """Startet oder beendet den blockweisen Streaming-Export des Verlaufs"""
+        try:
+            if self.stream_exporter is not None:
+                self.simulation.beobachter.remove(self.stream_exporter)
+                self.stream_exporter.schliessen()
+                basisname = self.stream_exporter.basisname
+                self.stream_exporter = None
+                self.stream_button.config(text="⏺ Verlauf streamen")
+                messagebox.showinfo("Streaming beendet", f"Verlauf gespeichert unter:\n{basisname}.*")
+                return
+            
+            dateiname = filedialog.asksaveasfilename(
+                defaultextension=".csv",
+                filetypes=[("CSV Dateien", "*.csv"), ("Alle Dateien", "*.*")],
+                title="Verlauf laufend speichern"
+            )
+            if dateiname:
+                basisname = os.path.splitext(dateiname)[0]
+                self.stream_exporter = StreamExporter(basisname)
+                self.simulation.beobachter.append(self.stream_exporter)
+                self.stream_button.config(text="⏹ Streaming beenden")
+        except Exception as e:
+            messagebox.showerror("Export Fehler", f"Fehler beim Streaming-Export: {str(e)}")
+    
+    def beenden(self):
+        """Schließt offene Exporte und beendet die Anwendung"""
+        self.stopp_simulation()
+        if self.stream_exporter is not None:
+            self.stream_exporter.schliessen()
+            self.stream_exporter = None
+        if self.rekorder is not None:
+            self.rekorder.schliessen()
+            self.rekorder = None
+        self.root.destroy()
+    
     def export_png(self):
-        """Exportiert das Diagramm als PNG (vereinfacht)"""
+        """Exportiert Status-, Kultur- und Diagrammansicht als PNG (Kodierung im Hintergrund)"""
         try:
-            # Hier könnte man mit PIL ein echtes PNG erstellen
-            # Für diese Version zeigen wir einfach eine Info an
-            messagebox.showinfo("PNG Export", 
-                              "PNG Export wird in dieser Version vereinfacht dargestellt.\n"
-                              "Die Daten sind im CSV-Export enthalten.")
+            dateiname = filedialog.asksaveasfilename(
+                defaultextension=".png",
+                filetypes=[("PNG Dateien", "*.png"), ("Alle Dateien", "*.*")],
+                title="Ansichten als PNG speichern"
+            )
+            if not dateiname:
+                return
+            
+            # Momentaufnahme im GUI-Thread, Rendern und Kodieren im Hintergrund
+            basisname = os.path.splitext(dateiname)[0]
+            sim = self.simulation
+            zustand = {name: np.array(feld) for name, feld in sim.zustand_arrays().items()}
+            history = sim.history[-600:]
+            farben = list(sim.kultur_farben)
+            max_population = sim.breite * sim.hoehe
+            zeige_population = self.zeige_population_var.get()
+            karten = self.karten.karten() if self.karten.aufnahmen else {}
+            
+            def speichern():
+                try:
+                    status_bild(zustand).save(f"{basisname}_status.png")
+                    kultur_bild(zustand, farben).save(f"{basisname}_kultur.png")
+                    diagramm_bild(history, farben, max_population,
+                                  zeige_population=zeige_population).save(f"{basisname}_diagramm.png")
+                    for name, bild in karten_bilder(karten, farben).items():
+                        bild.save(f"{basisname}_karte_{name}.png")
+                    self._export_meldungen.put(("info", "PNG Export erfolgreich", 
+                                                f"Ansichten gespeichert unter:\n{basisname}_*.png"))
+                except Exception as e:
+                    self._export_meldungen.put(("fehler", "Export Fehler", 
+                                                f"Fehler beim PNG-Export: {str(e)}"))
+            
+            threading.Thread(target=speichern, daemon=True).start()
+            self.root.after(100, self.pruefe_export_meldungen)
         except Exception as e:
             messagebox.showerror("Export Fehler", f"Fehler beim PNG-Export: {str(e)}")
+    
+    def pruefe_export_meldungen(self):
+        """Zeigt Meldungen aus Hintergrund-Exporten im GUI-Thread an"""
+        try:
+            art, titel, text = self._export_meldungen.get_nowait()
+        except queue.Empty:
+            self.root.after(100, self.pruefe_export_meldungen)
+            return
+        if art == "fehler":
+            messagebox.showerror(titel, text)
+        else:
+            messagebox.showinfo(titel, text)
+    
+    def aufnahme_umschalten(self):
+        """Startet oder beendet die Aufnahme der Kulturansicht als GIF bzw. PNG-Serie"""
+        try:
+            if self.rekorder is not None:
+                self.rekorder.schliessen(warten=False)
+                return
+            
+            dateiname = filedialog.asksaveasfilename(
+                defaultextension=".gif",
+                filetypes=[("Animiertes GIF", "*.gif"), ("PNG-Serie", "*.png")],
+                title="Aufnahme speichern"
+            )
+            if not dateiname:
+                return
+            anzahl = simpledialog.askinteger("Aufnahme", "Anzahl Ticks (0 = bis zum Beenden):",
+                                             initialvalue=500, minvalue=0, parent=self.root)
+            if anzahl is None:
+                return
+            
+            start = self.simulation.tick_index + 1
+            self.rekorder = BildRekorder(self.simulation, dateiname, start_tick=start,
+                                         end_tick=start + anzahl - 1 if anzahl else None)
+            self.simulation.beobachter.append(self.rekorder)
+            self.aufnahme_button.config(text="⏹ Aufnahme beenden")
+            self.root.after(200, self.pruefe_aufnahme)
+        except Exception as e:
+            messagebox.showerror("Export Fehler", f"Fehler bei der Aufnahme: {str(e)}")
+    
+    def pruefe_aufnahme(self):
+        """Wartet, bis der Rekorder alle Bilder geschrieben hat"""
+        rekorder = self.rekorder
+        if rekorder is None:
+            return
+        if rekorder.laeuft or not rekorder.geschrieben:
+            self.root.after(200, self.pruefe_aufnahme)
+            return
+        
+        if rekorder in self.simulation.beobachter:
+            self.simulation.beobachter.remove(rekorder)
+        self.rekorder = None
+        self.aufnahme_button.config(text="🎞 Aufnahme")
+        if rekorder.fehler:
+            messagebox.showerror("Export Fehler", f"Fehler bei der Aufnahme: {rekorder.fehler}")
+        else:
+            messagebox.showinfo("Aufnahme gespeichert", 
+                                f"{rekorder.aufgenommen} Bilder gespeichert, "
+                                f"{rekorder.verworfen} verworfen:\n{rekorder.dateiname}")
 
-def main():
+def main(variante='basis'):
     """Hauptfunktion"""
     try:
         root = tk.Tk()
-        app = PrimatenGUI(root)
+        app = PrimatenGUI(root, variante)
         root.mainloop()
     except Exception as e:
         print(f"Fehler: {e}")
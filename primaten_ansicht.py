@@ -0,0 +1,222 @@
+#!/usr/bin/env python3
+"""
+Primaten – Ansicht mit Detailstufen
+Zeichnet beliebig große Gitter in eine feste Pixelfläche: eine Mipmap-Pyramide fasst je
+Stufe 2×2 Blöcke zusammen (Mehrheitskultur bzw. häufigster Status, mittlere Belegung und
+mittlere Ressourcen), gezeichnet wird nur der sichtbare Ausschnitt in der Stufe, die zur
+aktuellen Vergrößerung passt.
+
+Der Aufwand hängt von der Zahl der Pixel ab, nicht von der Gittergröße: aus dem sichtbaren
+Bereich wird jede wievielte Zelle gelesen, sodass höchstens `genauigkeit` Stufen unter der
+Anzeigestufe exakt zusammengefasst werden (Standard 2, also 16 Stichproben je Pixel).
+"""
+
+import math
+
+import numpy as np
+from PIL import Image
+
+from primaten_bild import status_codes, status_palette, waerme_palette
+
+
+def _gerade(feld):
+    """Ergänzt Zeilen/Spalten mit 0, bis beide Seitenlängen gerade sind"""
+    hoehe, breite = feld.shape
+    if hoehe % 2 == 0 and breite % 2 == 0:
+        return feld
+    return np.pad(feld, ((0, hoehe % 2), (0, breite % 2)))
+
+
+def _viertel(feld):
+    """Die vier Zellen jedes 2×2-Blocks als vier Felder halber Größe"""
+    feld = _gerade(feld)
+    return feld[0::2, 0::2], feld[0::2, 1::2], feld[1::2, 0::2], feld[1::2, 1::2]
+
+
+def mehrheit_2x2(wert, gewicht):
+    """Häufigster Wert je 2×2-Block, gewichtet (Gewicht 0 = leere Zelle).
+    Gibt den Wert und sein Gesamtgewicht im Block zurück; Gleichstand: erster im Block."""
+    werte = _viertel(wert)
+    gewichte = _viertel(gewicht)
+    bester = np.zeros_like(werte[0])
+    bestes_gewicht = np.zeros_like(gewichte[0])
+    for kandidat, eigenes in zip(werte, gewichte):
+        summe = sum(g * (w == kandidat) for w, g in zip(werte, gewichte))
+        summe = np.where(eigenes > 0, summe, 0)
+        besser = summe > bestes_gewicht
+        bester = np.where(besser, kandidat, bester)
+        bestes_gewicht = np.where(besser, summe, bestes_gewicht)
+    return bester, bestes_gewicht
+
+
+def summe_2x2(feld):
+    """Summe je 2×2-Block"""
+    a, b, c, d = _viertel(feld)
+    return a + b + c + d
+
+
+class Pyramide:
+    """Detailstufen eines Zustands für eine Ansicht ('kultur', 'status' oder 'karte' für ein
+    Feld 'karte' mit Gleitkommawerten); Stufe s fasst Blöcke von 2**s × 2**s Zellen zusammen.
+    Stufen werden erst bei Bedarf berechnet."""
+
+    def __init__(self, zustand, ansicht='kultur'):
+        if ansicht == 'karte':
+            karte = np.asarray(zustand['karte'], dtype=np.float64)
+            self._stufen = [{'summe': karte, 'anzahl': np.ones(karte.shape, dtype=np.int32)}]
+            return
+        if ansicht == 'kultur':
+            wert = np.asarray(zustand['kultur'])
+        else:
+            wert = status_codes(np.asarray(zustand['status']), np.asarray(zustand['geschlecht']))
+        gewicht = (wert > 0).astype(np.int32)
+        stufe = {'wert': wert, 'gewicht': gewicht}
+        if ansicht == 'status':
+            stufe['lebend'] = gewicht
+            stufe['anzahl'] = np.ones(wert.shape, dtype=np.int32)   # Zellen im Block
+            if 'ressourcen' in zustand:
+                stufe['ressourcen'] = np.asarray(zustand['ressourcen']).astype(np.int32)
+        self._stufen = [stufe]
+
+    def stufe(self, s):
+        """Stufe s als Dictionary: 'wert' (Mehrheit je Block), bei der Statusansicht dazu
+        'belegung' und 'ressourcen' als Mittelwerte je Block"""
+        while len(self._stufen) <= s:
+            alt = self._stufen[-1]
+            neu = {}
+            if 'wert' in alt:
+                neu['wert'], neu['gewicht'] = mehrheit_2x2(alt['wert'], alt['gewicht'])
+            for name in ('summe', 'lebend', 'anzahl', 'ressourcen'):
+                if name in alt:
+                    neu[name] = summe_2x2(alt[name])
+            self._stufen.append(neu)
+        stufe = self._stufen[s]
+        if 'summe' in stufe:
+            return {'wert': stufe['summe'] / np.maximum(stufe['anzahl'], 1)}
+        ergebnis = {'wert': stufe['wert']}
+        if 'anzahl' in stufe:
+            anzahl = np.maximum(stufe['anzahl'], 1)
+            ergebnis['belegung'] = stufe['lebend'] / anzahl
+            if 'ressourcen' in stufe:
+                ergebnis['ressourcen'] = stufe['ressourcen'] / anzahl
+        return ergebnis
+
+
+class Ansicht:
+    """Sichtbarer Ausschnitt eines Gitters: Mittelpunkt in Zellen und Vergrößerung in Pixel je Zelle.
+
+    Ohne Vergrößerung (zoom=None) wird das ganze Gitter eingepasst.
+    """
+
+    MIN_ZOOM = 1 / 4096
+    MAX_ZOOM = 64
+
+    def __init__(self, breite, hoehe, genauigkeit=2):
+        self.breite = breite
+        self.hoehe = hoehe
+        self.genauigkeit = genauigkeit
+        self.zoom = None
+        self.mitte_x = breite / 2
+        self.mitte_y = hoehe / 2
+
+    def einpassen(self):
+        """Zeigt wieder das ganze Gitter"""
+        self.zoom = None
+        self.mitte_x = self.breite / 2
+        self.mitte_y = self.hoehe / 2
+
+    def _zoom(self, px_breite, px_hoehe):
+        if self.zoom is None:
+            return min(px_breite / self.breite, px_hoehe / self.hoehe)
+        return self.zoom
+
+    def verschieben(self, dx, dy, px_breite, px_hoehe):
+        """Verschiebt den Ausschnitt um (dx, dy) Pixel (Ziehen mit der Maus)"""
+        zoom = self._zoom(px_breite, px_hoehe)
+        self.zoom = zoom
+        self.mitte_x = min(max(self.mitte_x - dx / zoom, 0), self.breite)
+        self.mitte_y = min(max(self.mitte_y - dy / zoom, 0), self.hoehe)
+
+    def zoomen(self, faktor, px_x, px_y, px_breite, px_hoehe):
+        """Vergrößert um `faktor`; die Zelle unter dem Pixel (px_x, px_y) bleibt stehen"""
+        zoom = self._zoom(px_breite, px_hoehe)
+        neu = min(max(zoom * faktor, self.MIN_ZOOM), self.MAX_ZOOM)
+        zelle_x, zelle_y = self.zelle(px_x, px_y, px_breite, px_hoehe)
+        self.zoom = neu
+        self.mitte_x = zelle_x - (px_x - px_breite / 2) / neu
+        self.mitte_y = zelle_y - (px_y - px_hoehe / 2) / neu
+
+    def zelle(self, px_x, px_y, px_breite, px_hoehe):
+        """Zellkoordinaten (als Gleitkommazahlen) unter einem Pixel"""
+        zoom = self._zoom(px_breite, px_hoehe)
+        return (self.mitte_x + (px_x - px_breite / 2) / zoom,
+                self.mitte_y + (px_y - px_hoehe / 2) / zoom)
+
+    def stufe(self, px_breite, px_hoehe):
+        """Detailstufe für die aktuelle Vergrößerung: kleinste, deren Blöcke höchstens ein Pixel groß sind"""
+        zoom = self._zoom(px_breite, px_hoehe)
+        return max(0, int(math.ceil(math.log2(1 / zoom) - 1e-9)))
+
+    def _ausschnitt(self, zustand, ansicht, px_breite, px_hoehe):
+        """Sichtbare Blöcke der Anzeigestufe: (zusammengefasste Stufe, Pixelrechteck) oder None"""
+        zoom = self._zoom(px_breite, px_hoehe)
+        s = self.stufe(px_breite, px_hoehe)
+        block = 2 ** s
+        links = self.mitte_x - px_breite / 2 / zoom
+        oben = self.mitte_y - px_hoehe / 2 / zoom
+        # Auf ganze Blöcke erweitert und auf das Gitter begrenzt
+        bx0 = max(0, int(math.floor(links / block)))
+        by0 = max(0, int(math.floor(oben / block)))
+        bx1 = min(-(-self.breite // block), int(math.ceil((links + px_breite / zoom) / block)))
+        by1 = min(-(-self.hoehe // block), int(math.ceil((oben + px_hoehe / zoom) / block)))
+        if bx1 <= bx0 or by1 <= by0:
+            return None
+        # Stichprobe: nur `genauigkeit` Stufen werden exakt zusammengefasst
+        exakt = s if self.genauigkeit is None else min(s, self.genauigkeit)
+        schritt = 2 ** (s - exakt)
+        ausschnitt = {name: np.asarray(feld)[by0 * block:by1 * block:schritt, bx0 * block:bx1 * block:schritt]
+                      for name, feld in zustand.items()
+                      if name in ('status', 'geschlecht', 'kultur', 'ressourcen', 'karte')}
+        pixel = (round((bx0 * block - links) * zoom), round((by0 * block - oben) * zoom),
+                 round((bx1 * block - links) * zoom), round((by1 * block - oben) * zoom))
+        return Pyramide(ausschnitt, ansicht).stufe(exakt), pixel
+
+    def _bild(self, rgb, pixel, px_breite, px_hoehe):
+        """Setzt die Blockfarben an ihre Pixelposition in ein Bild der Canvas-Größe"""
+        bild = Image.new('RGB', (px_breite, px_hoehe), 'black')
+        x0, y0, x1, y1 = pixel
+        if x1 > x0 and y1 > y0:
+            bild.paste(Image.fromarray(rgb, 'RGB').resize((x1 - x0, y1 - y0), Image.NEAREST), (x0, y0))
+        return bild
+
+    def kultur_bild(self, zustand, palette, px_breite, px_hoehe):
+        """Kulturansicht: Mehrheitskultur je Block (palette aus primaten_bild.kultur_palette)"""
+        teil = self._ausschnitt(zustand, 'kultur', px_breite, px_hoehe)
+        if teil is None:
+            return Image.new('RGB', (px_breite, px_hoehe), 'black')
+        stufe, pixel = teil
+        return self._bild(palette[stufe['wert']], pixel, px_breite, px_hoehe)
+
+    def status_bild(self, zustand, px_breite, px_hoehe):
+        """Statusansicht: häufigster Status je Block, nach Belegung über dem Hintergrund
+        (Ressourcen in Grün, sonst schwarz) abgeblendet – in Stufe 0 wie status_bild()"""
+        teil = self._ausschnitt(zustand, 'status', px_breite, px_hoehe)
+        if teil is None:
+            return Image.new('RGB', (px_breite, px_hoehe), 'black')
+        stufe, pixel = teil
+        farbe = status_palette()[stufe['wert']].astype(np.float64)
+        hintergrund = np.zeros_like(farbe)
+        if 'ressourcen' in stufe:
+            hintergrund[..., 1] = np.floor(stufe['ressourcen'] / 5.0 * 120)
+        belegung = stufe['belegung'][..., None]
+        rgb = (belegung * farbe + (1 - belegung) * hintergrund).astype(np.uint8)
+        return self._bild(rgb, pixel, px_breite, px_hoehe)
+
+    def karten_bild(self, karte, px_breite, px_hoehe):
+        """Wärmebild einer Karte mit Werten von 0 bis 1, Blöcke gemittelt"""
+        teil = self._ausschnitt({'karte': karte}, 'karte', px_breite, px_hoehe)
+        if teil is None:
+            return Image.new('RGB', (px_breite, px_hoehe), 'black')
+        stufe, pixel = teil
+        stufen = (np.clip(stufe['wert'], 0.0, 1.0) * 255).astype(np.uint8)
+        return self._bild(waerme_palette()[stufen], pixel, px_breite, px_hoehe)
@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+Primaten – Arrow-Export (optional)
+Stellt Zustand und Verlauf einer Simulation als Arrow-RecordBatches bereit, die sich die
+Speicherpuffer mit den NumPy-Arrays teilen: Analysewerkzeuge (pandas, Polars, DuckDB)
+lesen die Felder ohne Kopie und ohne Schleife über die Zellen.
+
+Zero-Copy gilt für FeldSimulation (Zustand) und den Verlauf beider Engines; die
+Objekt-Engine muss ihren Zustand für zustand_arrays() erst in Arrays kopieren.
+Benötigt pyarrow; ohne pyarrow ist ARROW_VERFUEGBAR False.
+"""
+
+try:
+    import pyarrow as pa
+    ARROW_VERFUEGBAR = True
+except ImportError:
+    pa = None
+    ARROW_VERFUEGBAR = False
+
+
+def _pruefe_arrow():
+    """Bricht mit einer verständlichen Meldung ab, wenn pyarrow fehlt"""
+    if not ARROW_VERFUEGBAR:
+        raise ImportError("Für den Arrow-Export wird pyarrow benötigt (pip install pyarrow)")
+
+
+def als_arrow(feld):
+    """Eindimensionales Arrow-Array auf demselben Speicher wie das NumPy-Array"""
+    _pruefe_arrow()
+    if not feld.flags.c_contiguous:
+        raise ValueError("Zero-Copy braucht ein zusammenhängendes Array")
+    flach = feld.reshape(-1)
+    typ = pa.from_numpy_dtype(flach.dtype)
+    return pa.Array.from_buffers(typ, len(flach), [None, pa.py_buffer(flach)])
+
+
+def _liste(zeiger, werte):
+    """Listen-Spalte (ein Eintrag je Verlaufszeile) über gemeinsamen Wertepuffern"""
+    return pa.LargeListArray.from_arrays(als_arrow(zeiger), als_arrow(werte))
+
+
+def zustand_batch(simulation):
+    """Zellzustand als RecordBatch, eine Zeile je Zelle (i = y * breite + x).
+    Die Form steht in den Schema-Metadaten."""
+    _pruefe_arrow()
+    zustand = simulation.zustand_arrays()
+    namen = list(zustand)
+    metadaten = {
+        'hoehe': str(simulation.hoehe),
+        'breite': str(simulation.breite),
+        'tick': str(simulation.tick_index),
+        'topologie': simulation.topologie.name,
+    }
+    return pa.RecordBatch.from_arrays([als_arrow(zustand[name]) for name in namen], names=namen,
+                                      metadata=metadaten)
+
+
+def _feste_liste(feld):
+    """Spalte fester Breite (ein Histogramm je Verlaufszeile) auf dem Puffer des 2-D-Arrays"""
+    return pa.FixedSizeListArray.from_arrays(als_arrow(feld), feld.shape[1])
+
+
+def verlauf_batch(simulation):
+    """Verlauf als RecordBatch, eine Zeile je Tick; Kulturen, Zähler, Anteile und
+    Hybridisierungspaare als Listen, die Histogramme als Listen fester Länge"""
+    _pruefe_arrow()
+    spalten = simulation.verlauf_arrays()
+    zeiger = spalten['kultur_zeiger']
+    hybrid = spalten['hybrid_zeiger']
+    return pa.RecordBatch.from_arrays(
+        [als_arrow(spalten['tick']), als_arrow(spalten['population']),
+         _liste(zeiger, spalten['kulturen']), _liste(zeiger, spalten['kultur_counts']),
+         _liste(zeiger, spalten['anteile']),
+         _liste(hybrid, spalten['hybrid_primaer']), _liste(hybrid, spalten['hybrid_sekundaer']),
+         _liste(hybrid, spalten['hybrid_counts']),
+         _feste_liste(spalten['alter_hist']), _feste_liste(spalten['macht_hist']),
+         _feste_liste(spalten['geschlecht_hist'])],
+        names=['tick', 'population', 'kulturen', 'kultur_counts', 'anteile',
+               'hybrid_primaer', 'hybrid_sekundaer', 'hybrid_counts',
+               'alter_hist', 'macht_hist', 'geschlecht_hist'])
+
+
+def schreibe_ipc(simulation, basisname):
+    """Schreibt Zustand und Verlauf als Arrow-IPC-Dateien (basis_zustand.arrow, basis_verlauf.arrow)"""
+    _pruefe_arrow()
+    dateien = []
+    for teil, batch in (('zustand', zustand_batch(simulation)), ('verlauf', verlauf_batch(simulation))):
+        dateiname = f"{basisname}_{teil}.arrow"
+        with pa.OSFile(dateiname, 'wb') as datei:
+            with pa.ipc.new_file(datei, batch.schema) as schreiber:
+                schreiber.write_batch(batch)
+        dateien.append(dateiname)
+    return dateien
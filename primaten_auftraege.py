@@ -0,0 +1,337 @@
+#!/usr/bin/env python3
+"""
+Primaten – Auftragswarteschlange
+Verteilt Simulationsläufe eines Sweeps auf Arbeiter (auch auf mehreren Rechnern) und übersteht
+abstürzende Arbeiter. Ein Koordinator reiht Aufträge (Parameter für fuehre_lauf_aus) ein,
+Arbeiter leihen sich je einen Auftrag für eine begrenzte Zeit, verlängern die Leihe mit
+Herzschlägen und schreiben das Ergebnis zurück. Läuft eine Leihe ab – der Arbeiter ist
+abgestürzt oder hängt –, wird der Auftrag erneut vergeben, höchstens `max_versuche` Mal.
+
+Abschließen ist atomar und nur einmal möglich: ein Lauf, dessen Ergebnis eingetragen ist, geht
+nie verloren, und rechnen zwei Arbeiter denselben Auftrag (der erste war nur zu langsam),
+zählt allein das erste Ergebnis. Läufe mit festem Seed sind deterministisch, beide Ergebnisse
+sind also gleich.
+
+Der Transport ist austauschbar (Klasse Transport); SQLiteTransport ist der lokale Ersatz für
+Tests und kleine Cluster mit gemeinsamem Dateisystem. Leihfristen vergleichen Uhrzeiten
+verschiedener Rechner, deren Uhren sollten daher synchron laufen.
+"""
+
+import argparse
+import json
+import os
+import socket
+import sqlite3
+import threading
+import time
+import traceback
+from datetime import datetime
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS auftraege (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    parameter TEXT NOT NULL,
+    status TEXT NOT NULL DEFAULT 'offen',
+    arbeiter TEXT,
+    leihe_bis REAL,
+    versuche INTEGER NOT NULL DEFAULT 0,
+    ergebnis TEXT,
+    fehler TEXT,
+    eingereicht TEXT NOT NULL,
+    beendet TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_auftraege_status ON auftraege (status, leihe_bis);
+"""
+
+# Zustände eines Auftrags
+OFFEN, VERLIEHEN, FERTIG, FEHLGESCHLAGEN = 'offen', 'verliehen', 'fertig', 'fehlgeschlagen'
+
+
+class Transport:
+    """Schnittstelle zwischen Koordinator, Arbeitern und dem Speicher der Aufträge.
+    Parameter und Ergebnisse sind JSON-fähige Dictionaries."""
+
+    def einreihen(self, parameter_liste):
+        """Legt Aufträge an und gibt ihre IDs zurück"""
+        raise NotImplementedError
+
+    def ausleihen(self, arbeiter, dauer):
+        """Verleiht den nächsten offenen (oder abgelaufenen) Auftrag für `dauer` Sekunden:
+        (id, parameter, versuch) oder None, wenn nichts zu tun ist"""
+        raise NotImplementedError
+
+    def verlaengern(self, auftrag_id, arbeiter, dauer):
+        """Herzschlag: verlängert die Leihe; False, wenn sie dem Arbeiter nicht mehr gehört"""
+        raise NotImplementedError
+
+    def abschliessen(self, auftrag_id, arbeiter, ergebnis):
+        """Trägt das Ergebnis ein; False, wenn der Auftrag schon abgeschlossen war"""
+        raise NotImplementedError
+
+    def fehlschlag(self, auftrag_id, arbeiter, fehler):
+        """Meldet einen Fehler; der Auftrag wird erneut vergeben, solange Versuche übrig sind"""
+        raise NotImplementedError
+
+    def fortschritt(self):
+        """Anzahl der Aufträge je Zustand"""
+        raise NotImplementedError
+
+    def ergebnisse(self):
+        """Liste von (id, parameter, ergebnis) aller abgeschlossenen Aufträge"""
+        raise NotImplementedError
+
+
+class SQLiteTransport(Transport):
+    """Aufträge in einer SQLite-Datei; jede Zustandsänderung ist eine eigene Transaktion.
+    Eine Instanz darf von mehreren Threads benutzt werden (z. B. Arbeit und Herzschlag)."""
+
+    def __init__(self, pfad="primaten_auftraege.sqlite", max_versuche=3, timeout=60.0):
+        self.pfad = pfad
+        self.max_versuche = max_versuche
+        self._sperre = threading.Lock()
+        # isolation_level=None: Transaktionen werden explizit gesteuert
+        self.verbindung = sqlite3.connect(pfad, timeout=timeout, isolation_level=None,
+                                          check_same_thread=False)
+        self.verbindung.execute("PRAGMA journal_mode=WAL")
+        self.verbindung.execute(f"PRAGMA busy_timeout={int(timeout * 1000)}")
+        self.verbindung.executescript(SCHEMA)
+
+    def transaktion(self, arbeit, versuche=20):
+        """Führt `arbeit(cursor)` in einer Schreibtransaktion aus, bei Sperren mit Wiederholung"""
+        with self._sperre:
+            for versuch in range(versuche):
+                try:
+                    cursor = self.verbindung.cursor()
+                    cursor.execute("BEGIN IMMEDIATE")
+                    try:
+                        ergebnis = arbeit(cursor)
+                        cursor.execute("COMMIT")
+                        return ergebnis
+                    except BaseException:
+                        cursor.execute("ROLLBACK")
+                        raise
+                except sqlite3.OperationalError as e:
+                    if 'locked' not in str(e) or versuch == versuche - 1:
+                        raise
+                    time.sleep(0.05 * (versuch + 1))
+
+    def einreihen(self, parameter_liste):
+        jetzt = datetime.now().isoformat(timespec='seconds')
+        zeilen = [(json.dumps(parameter, sort_keys=True), jetzt) for parameter in parameter_liste]
+
+        def arbeit(c):
+            return [c.execute("INSERT INTO auftraege (parameter, eingereicht) VALUES (?, ?)",
+                              zeile).lastrowid for zeile in zeilen]
+        return self.transaktion(arbeit)
+
+    def _abgelaufene(self, c, jetzt):
+        """Abgelaufene Leihen ohne verbleibende Versuche gelten als fehlgeschlagen"""
+        c.execute("UPDATE auftraege SET status=?, fehler='Leihe abgelaufen', arbeiter=NULL "
+                  "WHERE status=? AND leihe_bis < ? AND versuche >= ?",
+                  (FEHLGESCHLAGEN, VERLIEHEN, jetzt, self.max_versuche))
+
+    def ausleihen(self, arbeiter, dauer):
+        def arbeit(c):
+            jetzt = time.time()
+            self._abgelaufene(c, jetzt)
+            zeile = c.execute(
+                "SELECT id, parameter, versuche FROM auftraege "
+                "WHERE status=? OR (status=? AND leihe_bis < ?) ORDER BY id LIMIT 1",
+                (OFFEN, VERLIEHEN, jetzt)).fetchone()
+            if zeile is None:
+                return None
+            auftrag_id, parameter, versuche = zeile
+            c.execute("UPDATE auftraege SET status=?, arbeiter=?, leihe_bis=?, versuche=? WHERE id=?",
+                      (VERLIEHEN, arbeiter, jetzt + dauer, versuche + 1, auftrag_id))
+            return auftrag_id, json.loads(parameter), versuche + 1
+        return self.transaktion(arbeit)
+
+    def verlaengern(self, auftrag_id, arbeiter, dauer):
+        return self.transaktion(lambda c: c.execute(
+            "UPDATE auftraege SET leihe_bis=? WHERE id=? AND arbeiter=? AND status=?",
+            (time.time() + dauer, auftrag_id, arbeiter, VERLIEHEN)).rowcount == 1)
+
+    def abschliessen(self, auftrag_id, arbeiter, ergebnis):
+        zeile = (FERTIG, arbeiter, json.dumps(ergebnis, sort_keys=True),
+                 datetime.now().isoformat(timespec='seconds'), auftrag_id, FERTIG)
+        return self.transaktion(lambda c: c.execute(
+            "UPDATE auftraege SET status=?, arbeiter=?, leihe_bis=NULL, ergebnis=?, fehler=NULL, "
+            "beendet=? WHERE id=? AND status != ?", zeile).rowcount == 1)
+
+    def fehlschlag(self, auftrag_id, arbeiter, fehler):
+        def arbeit(c):
+            c.execute("UPDATE auftraege SET status=CASE WHEN versuche >= ? THEN ? ELSE ? END, "
+                      "arbeiter=NULL, leihe_bis=NULL, fehler=? WHERE id=? AND arbeiter=? AND status=?",
+                      (self.max_versuche, FEHLGESCHLAGEN, OFFEN, fehler, auftrag_id, arbeiter, VERLIEHEN))
+        self.transaktion(arbeit)
+
+    def fortschritt(self):
+        with self._sperre:
+            zeilen = self.verbindung.execute(
+                "SELECT status, COUNT(*) FROM auftraege GROUP BY status").fetchall()
+        fortschritt = {OFFEN: 0, VERLIEHEN: 0, FERTIG: 0, FEHLGESCHLAGEN: 0}
+        fortschritt.update(dict(zeilen))
+        return fortschritt
+
+    def ergebnisse(self):
+        with self._sperre:
+            zeilen = self.verbindung.execute(
+                "SELECT id, parameter, ergebnis FROM auftraege WHERE status=? ORDER BY id",
+                (FERTIG,)).fetchall()
+        return [(auftrag_id, json.loads(parameter), json.loads(ergebnis))
+                for auftrag_id, parameter, ergebnis in zeilen]
+
+    def fehler(self):
+        """Liste von (id, parameter, fehler) der endgültig fehlgeschlagenen Aufträge"""
+        with self._sperre:
+            zeilen = self.verbindung.execute(
+                "SELECT id, parameter, fehler FROM auftraege WHERE status=? ORDER BY id",
+                (FEHLGESCHLAGEN,)).fetchall()
+        return [(auftrag_id, json.loads(parameter), fehler) for auftrag_id, parameter, fehler in zeilen]
+
+    def schliessen(self):
+        self.verbindung.close()
+
+
+class Koordinator:
+    """Reiht die Läufe eines Sweeps ein und sammelt die Ergebnisse"""
+
+    def __init__(self, transport):
+        self.transport = transport
+
+    def einreichen(self, parameter_liste):
+        """Reiht je Parameter-Dictionary einen Lauf ein (Schlüssel wie bei fuehre_lauf_aus)"""
+        for parameter in parameter_liste:
+            if parameter.get('seed') is None:
+                raise ValueError("Verteilte Läufe brauchen einen festen Seed (sonst nicht wiederholbar)")
+        return self.transport.einreihen(parameter_liste)
+
+    def fertig(self):
+        """True, wenn kein Auftrag mehr offen oder verliehen ist"""
+        fortschritt = self.transport.fortschritt()
+        return fortschritt[OFFEN] == 0 and fortschritt[VERLIEHEN] == 0
+
+    def warten(self, intervall=1.0, zeitlimit=None, melden=None):
+        """Wartet, bis alle Aufträge abgeschlossen oder fehlgeschlagen sind; `melden` erhält den
+        Fortschritt nach jeder Abfrage. Gibt die Ergebnisse zurück."""
+        ende = None if zeitlimit is None else time.monotonic() + zeitlimit
+        while True:
+            fortschritt = self.transport.fortschritt()
+            if melden is not None:
+                melden(fortschritt)
+            if fortschritt[OFFEN] == 0 and fortschritt[VERLIEHEN] == 0:
+                return self.transport.ergebnisse()
+            if ende is not None and time.monotonic() > ende:
+                raise TimeoutError(f"Sweep nicht fertig: {fortschritt}")
+            time.sleep(intervall)
+
+
+def lauf_ergebnis(simulation):
+    """Kennzahlen eines Laufs, die in die Warteschlange zurückgeschrieben werden"""
+    letzter = simulation.history[-1]
+    return {
+        'ticks': simulation.tick_index,
+        'population': letzter['population'],
+        'kulturen': letzter['kulturen'].tolist(),
+        'kultur_counts': letzter['kultur_counts'].tolist(),
+    }
+
+
+class Arbeiter:
+    """Holt Aufträge, rechnet sie mit fuehre_lauf_aus und schreibt die Ergebnisse zurück.
+
+    Während eines Laufs verlängert ein Herzschlag-Thread alle `leihe / 3` Sekunden die Leihe.
+    `cache` (Verzeichnis, siehe primaten_cache) legt die vollständigen Endzustände ab; ein
+    nach einem Absturz wiederholter Lauf wird dann, wenn er schon fertig war, nur geladen.
+    """
+
+    def __init__(self, transport, name=None, leihe=60.0, cache=None, auswertung=lauf_ergebnis):
+        self.transport = transport
+        self.name = name or f"{socket.gethostname()}:{os.getpid()}"
+        self.leihe = leihe
+        self.cache = cache
+        self.auswertung = auswertung
+        self.erledigt = 0
+
+    def _herzschlag(self, auftrag_id, stopp):
+        while not stopp.wait(self.leihe / 3):
+            if not self.transport.verlaengern(auftrag_id, self.name, self.leihe):
+                return   # Leihe verloren; das Ergebnis zählt trotzdem, falls es das erste ist
+
+    def bearbeite(self, auftrag_id, parameter):
+        """Rechnet einen Auftrag mit laufendem Herzschlag; True, wenn das Ergebnis zählt"""
+        from primaten_lauf import fuehre_lauf_aus
+        stopp = threading.Event()
+        herzschlag = threading.Thread(target=self._herzschlag, args=(auftrag_id, stopp), daemon=True)
+        herzschlag.start()
+        try:
+            simulation = fuehre_lauf_aus(cache=self.cache, **parameter)
+            ergebnis = self.auswertung(simulation)
+        except Exception:
+            stopp.set()
+            self.transport.fehlschlag(auftrag_id, self.name, traceback.format_exc(limit=5))
+            return False
+        finally:
+            stopp.set()
+            herzschlag.join()
+        return self.transport.abschliessen(auftrag_id, self.name, ergebnis)
+
+    def arbeiten(self, max_auftraege=None, warten=0.0):
+        """Bearbeitet Aufträge, bis keine mehr da sind (mit `warten` > 0 wird so lange weiter
+        nachgesehen, bis der Sweep fertig ist) oder `max_auftraege` erledigt sind"""
+        while max_auftraege is None or self.erledigt < max_auftraege:
+            auftrag = self.transport.ausleihen(self.name, self.leihe)
+            if auftrag is None:
+                fortschritt = self.transport.fortschritt()
+                if warten <= 0 or fortschritt[VERLIEHEN] == 0:
+                    break
+                time.sleep(warten)   # verliehene Aufträge könnten noch ablaufen
+                continue
+            auftrag_id, parameter, _ = auftrag
+            if self.bearbeite(auftrag_id, parameter):
+                self.erledigt += 1
+        return self.erledigt
+
+
+def main():
+    """Kommandozeile: einreichen, arbeiten, status"""
+    parser = argparse.ArgumentParser(description="Verteilte Primaten-Läufe über eine Auftragswarteschlange")
+    parser.add_argument('datenbank', help="SQLite-Datei der Warteschlange")
+    befehle = parser.add_subparsers(dest='befehl', required=True)
+
+    einreichen = befehle.add_parser('einreichen', help="Läufe mit aufeinanderfolgenden Seeds einreihen")
+    einreichen.add_argument('--seed', type=int, default=0)
+    einreichen.add_argument('--laeufe', type=int, default=1)
+    einreichen.add_argument('--parameter', default='{}',
+                            help="Weitere Parameter für fuehre_lauf_aus als JSON, z. B. '{\"ticks\": 500}'")
+
+    arbeiten = befehle.add_parser('arbeiten', help="Aufträge abarbeiten")
+    arbeiten.add_argument('--name', default=None)
+    arbeiten.add_argument('--leihe', type=float, default=60.0, help="Leihfrist in Sekunden")
+    arbeiten.add_argument('--max-auftraege', type=int, default=None)
+    arbeiten.add_argument('--warten', type=float, default=5.0,
+                          help="Abfrageintervall, solange andere Arbeiter noch Aufträge halten (0 = sofort enden)")
+    arbeiten.add_argument('--cache', default=None, help="Verzeichnis des Ergebnis-Caches")
+
+    befehle.add_parser('status', help="Fortschritt und Fehler anzeigen")
+    parser.add_argument('--max-versuche', type=int, default=3)
+    args = parser.parse_args()
+
+    transport = SQLiteTransport(args.datenbank, max_versuche=args.max_versuche)
+    if args.befehl == 'einreichen':
+        basis = json.loads(args.parameter)
+        ids = Koordinator(transport).einreichen(
+            [dict(basis, seed=args.seed + i) for i in range(args.laeufe)])
+        print(f"{len(ids)} Aufträge eingereiht")
+    elif args.befehl == 'arbeiten':
+        arbeiter = Arbeiter(transport, args.name, args.leihe, args.cache)
+        print(f"{arbeiter.name}: {arbeiter.arbeiten(args.max_auftraege, args.warten)} Aufträge erledigt")
+    else:
+        print(", ".join(f"{status} {anzahl}" for status, anzahl in transport.fortschritt().items()))
+        for auftrag_id, parameter, fehler in transport.fehler():
+            print(f"Auftrag {auftrag_id} {parameter}: {fehler.strip().splitlines()[-1]}")
+    transport.schliessen()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,267 @@
+#!/usr/bin/env python3
+"""
+Primaten – Bildexport
+Rendert Status-, Kultur- und Diagrammansicht direkt aus den Zustandsarrays mit PIL
+und nimmt Bildfolgen (animiertes GIF oder PNG-Serie) in einem Hintergrund-Thread auf
+"""
+
+import queue
+import threading
+import numpy as np
+from PIL import Image, ImageDraw
+
+from primaten_kern import anteil_matrix
+
+# Gleiche Farben wie in der Status-Ansicht der GUI
+STATUS_FARBEN = {
+    (1, 1): "#ffb6c1",  # weiblich, jung
+    (1, 2): "#87cefa",  # männlich, jung
+    (2, 1): "#ff69b4",  # weiblich, erwachsen
+    (2, 2): "#1e90ff"   # männlich, erwachsen
+}
+
+
+def hex_to_rgb(hex_color):
+    """Wandelt Hex-Farben in RGB um"""
+    hex_color = hex_color.lstrip('#')
+    return tuple(int(hex_color[i:i+2], 16) for i in (0, 2, 4))
+
+
+def kultur_palette(kultur_farben):
+    """Farbtabelle (Index = Kultur) als uint8-Array, Index 0 schwarz"""
+    palette = np.zeros((len(kultur_farben), 3), dtype=np.uint8)
+    for i, farbe in enumerate(kultur_farben):
+        if farbe:
+            palette[i] = hex_to_rgb(farbe)
+    return palette
+
+
+def status_codes(status, geschlecht):
+    """Kodiert Status und Geschlecht als 0 (leer) bzw. 1-4 wie in STATUS_FARBEN"""
+    lebend = status > 0
+    return np.where(lebend, (status - 1) * 2 + (geschlecht - 1) + 1, 0).clip(0, 4).astype(np.uint8)
+
+
+def status_palette():
+    """Farbtabelle zu status_codes()"""
+    palette = np.zeros((5, 3), dtype=np.uint8)
+    for (status, geschlecht), farbe in STATUS_FARBEN.items():
+        palette[(status - 1) * 2 + (geschlecht - 1) + 1] = hex_to_rgb(farbe)
+    return palette
+
+
+def _skaliert(rgb, zell_groesse):
+    """Vergrößert ein RGB-Array blockweise ohne Interpolation"""
+    bild = Image.fromarray(rgb, 'RGB')
+    if zell_groesse > 1:
+        bild = bild.resize((bild.width * zell_groesse, bild.height * zell_groesse), Image.NEAREST)
+    return bild
+
+
+def status_bild(zustand, zell_groesse=8):
+    """Status-Ansicht; mit Ressourcen im Zustand wird der grüne Hintergrund mitgezeichnet"""
+    codes = status_codes(zustand['status'], zustand['geschlecht'])
+    rgb = status_palette()[codes]
+    if 'ressourcen' in zustand:
+        gruen = (np.asarray(zustand['ressourcen']) / 5.0 * 120).astype(np.uint8)
+        leer = codes == 0
+        rgb[leer, 1] = gruen[leer]
+    return _skaliert(rgb, zell_groesse)
+
+
+def kultur_bild(zustand, kultur_farben, zell_groesse=8):
+    """Kultur-Ansicht"""
+    rgb = kultur_palette(kultur_farben)[zustand['kultur']]
+    return _skaliert(rgb, zell_groesse)
+
+
+def waerme_palette():
+    """Farbskala für Werte von 0 bis 1 (256 Stufen): schwarz – rot – gelb – weiß"""
+    t = np.linspace(0.0, 1.0, 256)
+    rgb = np.stack([np.clip(t * 3, 0, 1), np.clip(t * 3 - 1, 0, 1), np.clip(t * 3 - 2, 0, 1)], axis=1)
+    return (rgb * 255).astype(np.uint8)
+
+
+def karten_bild(karte, zell_groesse=8):
+    """Wärmebild einer Karte mit Werten von 0 bis 1 (z. B. aus primaten_karten)"""
+    stufen = (np.clip(np.asarray(karte), 0.0, 1.0) * 255).astype(np.uint8)
+    return _skaliert(waerme_palette()[stufen], zell_groesse)
+
+
+def diagramm_bild(history, kultur_farben, max_population, breite=800, hoehe=600,
+                  zeige_population=True, fenster=600, max_linien=20):
+    """Zeichnet das Entwicklungsdiagramm wie die GUI, aber als PIL-Bild
+    (höchstens `max_linien` Kulturen, die mit den größten Anteilen im Ausschnitt)"""
+    bild = Image.new('RGB', (breite, hoehe), 'black')
+    draw = ImageDraw.Draw(bild)
+    padding = 40
+
+    daten = history[max(0, len(history) - fenster):]
+    draw.rectangle([padding, padding, breite - padding, hoehe - padding], outline="#666666")
+    for i in range(6):
+        y = padding + i * (hoehe - 2*padding) / 5
+        draw.line([padding, y, breite - padding, y], fill="#333333")
+        draw.text((padding - 30, y - 5), f"{1.0 - i * 0.2:.1f}", fill="white")
+
+    if len(daten) < 2:
+        return bild
+
+    for i in range(0, len(daten), max(1, len(daten)//5)):
+        x = padding + i * (breite - 2*padding) / len(daten)
+        draw.text((x, hoehe - padding + 8), str(daten[i]['tick']), fill="white")
+
+    xs = padding + np.arange(len(daten)) * (breite - 2*padding) / len(daten)
+    kulturen, anteile = anteil_matrix(daten, max_kulturen=max_linien)
+    for spalte, kultur in enumerate(kulturen.tolist()):
+        ys = hoehe - padding - anteile[:, spalte] * (hoehe - 2*padding)
+        draw.line(list(zip(xs, ys)), fill=kultur_farben[kultur], width=2)
+
+    if zeige_population:
+        population = np.array([d['population'] for d in daten], dtype=float)
+        ys = hoehe - padding - population / max_population * (hoehe - 2*padding)
+        draw.line(list(zip(xs, ys)), fill="white", width=1)
+
+    return bild
+
+
+class BildRekorder:
+    """Beobachter, der pro Tick ein Einzelbild aufnimmt und im Hintergrund kodiert.
+
+    Der Simulations-Thread legt nur eine Kopie des Kultur- bzw. Statusarrays in eine
+    begrenzte Warteschlange; ist sie voll, wird das Bild verworfen statt zu blockieren.
+    Bis 255 Kulturen werden Palettenbilder (1 Byte pro Zelle) aufgenommen, darüber
+    Kulturnummern, die erst im Hintergrund in RGB umgesetzt werden (GIF: eigene Palette je Bild).
+
+    Ein GIF kann erst am Ende geschrieben werden, die Einzelbilder bleiben bis dahin im
+    Speicher. Damit eine offene Aufnahme nicht unbegrenzt wächst, werden höchstens
+    `max_gif_bilder` gehalten: ist die Grenze erreicht, wird jedes zweite Bild verworfen und
+    danach nur noch jedes zweite (vierte, ...) aufgenommen – das GIF deckt weiter den ganzen
+    Lauf ab, in gröberen Schritten. PNG-Serien werden sofort geschrieben und sind unbegrenzt.
+    """
+
+    def __init__(self, simulation, dateiname, ansicht='kultur', start_tick=None, end_tick=None,
+                 zell_groesse=4, max_puffer=32, dauer_ms=80, max_gif_bilder=1000):
+        self.simulation = simulation
+        self.dateiname = dateiname
+        self.ansicht = ansicht
+        self.start_tick = start_tick
+        self.end_tick = end_tick
+        self.zell_groesse = zell_groesse
+        self.dauer_ms = dauer_ms
+        self.max_gif_bilder = max(2, max_gif_bilder)
+        self.als_gif = dateiname.lower().endswith('.gif')
+        self.aufgenommen = 0
+        self.verworfen = 0
+        self.fehler = None
+
+        if ansicht == 'status':
+            palette = status_palette()
+        else:
+            palette = kultur_palette(simulation.kultur_farben)
+        # Palettenbild: 1 Byte pro Zelle, passt direkt zum GIF-Format
+        self._palette_rgb = palette
+        self._palette = palette.ravel().tolist() if len(palette) <= 256 else None
+        self._warteschlange = queue.Queue(maxsize=max_puffer)
+        self._gif_bilder = []
+        self._gif_schritt = 1  # nur jedes so vielte Bild ins GIF
+        self._gif_zaehler = 0
+        self._fertig = False
+        self._thread = threading.Thread(target=self._kodieren, daemon=True)
+        self._thread.start()
+
+    def schreibe(self, datenpunkt):
+        """Nimmt nach jedem Tick ein Bild auf, sofern der Tick im Bereich liegt"""
+        tick = datenpunkt['tick']
+        if self._fertig or (self.start_tick is not None and tick < self.start_tick):
+            return
+        if self.end_tick is not None and tick > self.end_tick:
+            self.schliessen(warten=False)
+            return
+
+        zustand = self.simulation.zustand_arrays()
+        if self.ansicht == 'status':
+            feld = status_codes(zustand['status'], zustand['geschlecht'])
+        elif self._palette is not None:
+            feld = np.asarray(zustand['kultur'], dtype=np.uint8)
+        else:
+            feld = np.asarray(zustand['kultur'], dtype=np.uint16)
+        try:
+            self._warteschlange.put_nowait((tick, feld.copy()))
+            self.aufgenommen += 1
+        except queue.Full:
+            self.verworfen += 1
+
+    def ereignis(self, tick, art, kultur):
+        """Ereignisse sind für die Aufnahme ohne Bedeutung"""
+
+    def _kodieren(self):
+        """Hintergrund-Thread: wandelt Arrays in Bilder und schreibt sie"""
+        while True:
+            eintrag = self._warteschlange.get()
+            if eintrag is None:
+                break
+            tick, feld = eintrag
+            try:
+                if self._palette is not None:
+                    bild = Image.fromarray(feld, 'P')
+                    bild.putpalette(self._palette)
+                else:
+                    bild = Image.fromarray(self._palette_rgb[feld], 'RGB')
+                if self.als_gif:
+                    # Unskaliert puffern, vergrößert wird erst beim Speichern
+                    if self._gif_zaehler % self._gif_schritt == 0:
+                        self._gif_bilder.append(bild)
+                        if len(self._gif_bilder) >= self.max_gif_bilder:
+                            self._gif_bilder = self._gif_bilder[::2]
+                            self._gif_schritt *= 2
+                    self._gif_zaehler += 1
+                else:
+                    basis = self.dateiname.rsplit('.', 1)[0]
+                    self._vergroessert(bild).save(f"{basis}_{tick:06d}.png")
+            except Exception as e:
+                self.fehler = e
+
+        if self.als_gif and self._gif_bilder:
+            try:
+                bilder = [self._vergroessert(b) for b in self._gif_bilder]
+                bilder[0].save(self.dateiname, save_all=True, append_images=bilder[1:],
+                               duration=self.dauer_ms, loop=0)
+            except Exception as e:
+                self.fehler = e
+        self._gif_bilder = []
+
+    def _vergroessert(self, bild):
+        """Skaliert ein Bild auf die gewünschte Zellgröße"""
+        if self.zell_groesse > 1:
+            bild = bild.resize((bild.width * self.zell_groesse,
+                                bild.height * self.zell_groesse), Image.NEAREST)
+        return bild
+
+    @property
+    def laeuft(self):
+        """True, solange noch Bilder angenommen werden"""
+        return not self._fertig
+
+    @property
+    def geschrieben(self):
+        """True, sobald der Hintergrund-Thread alle Bilder geschrieben hat"""
+        return not self._thread.is_alive()
+
+    def schliessen(self, warten=True):
+        """Beendet die Aufnahme; wartet optional, bis alle Bilder geschrieben sind"""
+        if not self._fertig:
+            self._fertig = True
+            # Nicht blockieren: ohne Warten ältere Bilder verwerfen, bis das Endezeichen passt
+            while self._thread.is_alive():
+                try:
+                    self._warteschlange.put(None, timeout=0.1 if warten else 0)
+                    break
+                except queue.Full:
+                    if not warten:
+                        try:
+                            self._warteschlange.get_nowait()
+                            self.verworfen += 1
+                        except queue.Empty:
+                            pass
+        if warten:
+            self._thread.join()
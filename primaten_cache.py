@@ -0,0 +1,192 @@
+#!/usr/bin/env python3
+"""
+Primaten – Ergebnis-Cache
+Speichert Endzustand und Verlauf abgeschlossener Läufe auf der Platte, adressiert über einen
+Hash der vollständigen Konfiguration (Gittergröße, Dichte, Regeln, Seed, Ticks, ...) und der
+Engine-Version. Wiederholte Läufe mit derselben Konfiguration werden aus dem Cache geladen
+statt neu gerechnet.
+
+Die Engine-Version ist ein Hash der Quelltexte der Simulationsmodule: jede Änderung an den
+Regeln macht alte Einträge ungültig, ohne dass jemand eine Versionsnummer pflegen muss.
+
+Ein Eintrag ist eine unkomprimierte .npz-Datei (schnell zu laden) mit den Zustandsfeldern
+(zustand_*), den Verlaufsspalten (verlauf_*) und Metadaten als JSON. Der Cache ist in der
+Größe begrenzt; beim Überschreiten werden die am längsten nicht benutzten Einträge gelöscht
+(Zugriffszeit = Änderungszeit der Datei, bei jedem Treffer erneuert).
+"""
+
+import hashlib
+import json
+import os
+import random
+import threading
+import zipfile
+
+import numpy as np
+
+import primaten_jit
+import primaten_kern
+import primaten_muster
+import primaten_topologie
+import primaten_verlauf
+from primaten_verlauf import Verlauf
+
+# Module, deren Quelltext das Ergebnis eines Laufs bestimmt
+ENGINE_MODULE = (primaten_kern, primaten_jit, primaten_muster, primaten_topologie, primaten_verlauf)
+
+_engine_version = None
+
+
+def engine_version():
+    """Hash der Quelltexte aller Simulationsmodule (einmal je Prozess berechnet)"""
+    global _engine_version
+    if _engine_version is None:
+        h = hashlib.sha256()
+        for modul in ENGINE_MODULE:
+            with open(modul.__file__, 'rb') as datei:
+                h.update(datei.read())
+        _engine_version = h.hexdigest()[:16]
+    return _engine_version
+
+
+def datei_hash(dateiname):
+    """Hash des Inhalts einer Datei (für Musterdateien in der Konfiguration)"""
+    h = hashlib.sha256()
+    with open(dateiname, 'rb') as datei:
+        for block in iter(lambda: datei.read(1 << 20), b''):
+            h.update(block)
+    return h.hexdigest()
+
+
+class ErgebnisCache:
+    """Größenbegrenzter Cache für Endzustand und Verlauf von Läufen in einem Verzeichnis"""
+
+    def __init__(self, verzeichnis, max_bytes=1 << 30):
+        self.verzeichnis = verzeichnis
+        self.max_bytes = max_bytes
+        self.treffer = 0
+        self.fehlschlaege = 0
+        os.makedirs(verzeichnis, exist_ok=True)
+
+    def schluessel(self, konfiguration):
+        """Schlüssel einer Konfiguration (Dictionary aus JSON-fähigen Werten)"""
+        text = json.dumps({'engine': engine_version(), 'konfiguration': konfiguration},
+                          sort_keys=True, default=str)
+        return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+    def _pfad(self, schluessel):
+        return os.path.join(self.verzeichnis, f"{schluessel}.npz")
+
+    def lade(self, schluessel):
+        """Eintrag als Dictionary {'zustand', 'verlauf', 'meta'} oder None"""
+        pfad = self._pfad(schluessel)
+        try:
+            with np.load(pfad) as daten:
+                eintrag = {'zustand': {}, 'verlauf': {}, 'meta': json.loads(str(daten['meta']))}
+                for name in daten.files:
+                    teil, _, feld = name.partition('_')
+                    if teil in ('zustand', 'verlauf'):
+                        eintrag[teil][feld] = daten[name]
+            os.utime(pfad)
+        except (zipfile.BadZipFile, EOFError, ValueError, KeyError):
+            # Beschädigter Eintrag (z. B. Absturz beim Schreiben): entfernen, zählt als Fehlschlag
+            self.fehlschlaege += 1
+            try:
+                os.remove(pfad)
+            except OSError:
+                pass
+            return None
+        except OSError:
+            self.fehlschlaege += 1
+            return None
+        self.treffer += 1
+        return eintrag
+
+    def speichere(self, schluessel, simulation, konfiguration=None):
+        """Legt Endzustand, Verlauf und Zufallszustand einer Simulation ab"""
+        meta = {
+            'konfiguration': konfiguration,
+            'engine': engine_version(),
+            'tick': simulation.tick_index,
+            'monokultur_gemeldet': simulation._monokultur_gemeldet,
+            'simulation': type(simulation).__name__,
+        }
+        # Die Feld-Engine zieht aus ihrem eigenen Generator, die Objekt-Engine aus `random`
+        if hasattr(simulation, 'rng'):
+            meta['rng'] = simulation.rng.bit_generator.state
+        else:
+            meta['random'] = _als_json(random.getstate())
+        felder = {'meta': np.array(json.dumps(meta))}
+        felder.update({f"zustand_{name}": feld for name, feld in simulation.zustand_arrays().items()})
+        felder.update({f"verlauf_{name}": feld for name, feld in simulation.verlauf_arrays().items()})
+        pfad = self._pfad(schluessel)
+        temporaer = f"{pfad}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(temporaer, 'wb') as datei:
+            np.savez(datei, **felder)
+        os.replace(temporaer, pfad)
+        self.aufraeumen()
+
+    def wiederherstellen(self, simulation, eintrag):
+        """Versetzt eine mit dem Endzustand als Muster erzeugte Simulation in den Zustand am
+        Ende des Laufs: Tickzähler, Verlauf, Ereigniserkennung und Zufallsgeneratoren"""
+        meta = eintrag['meta']
+        simulation.tick_index = meta['tick']
+        simulation.history = Verlauf.aus_spalten(eintrag['verlauf'])
+        if len(simulation.history):
+            simulation._letzte_kulturen = simulation.history[-1]['kulturen'].copy()
+        simulation._monokultur_gemeldet = meta['monokultur_gemeldet']
+        if 'random' in meta:
+            random.setstate(_als_tupel(meta['random']))
+        if 'rng' in meta and hasattr(simulation, 'rng'):
+            simulation.rng.bit_generator.state = meta['rng']
+        return simulation
+
+    def groesse(self):
+        """Belegter Platz in Bytes"""
+        return sum(groesse for _, groesse, _ in self._eintraege())
+
+    def _eintraege(self):
+        eintraege = []
+        for eintrag in os.scandir(self.verzeichnis):
+            if eintrag.name.endswith('.npz'):
+                try:
+                    info = eintrag.stat()
+                except FileNotFoundError:
+                    continue
+                eintraege.append((info.st_mtime, info.st_size, eintrag.path))
+        return eintraege
+
+    def aufraeumen(self):
+        """Löscht die am längsten nicht benutzten Einträge, bis max_bytes eingehalten ist"""
+        eintraege = sorted(self._eintraege())
+        belegt = sum(groesse for _, groesse, _ in eintraege)
+        for _, groesse, pfad in eintraege:
+            if belegt <= self.max_bytes:
+                break
+            try:
+                os.remove(pfad)
+            except FileNotFoundError:
+                pass
+            belegt -= groesse
+
+    def leeren(self):
+        """Löscht alle Einträge"""
+        for _, _, pfad in self._eintraege():
+            try:
+                os.remove(pfad)
+            except FileNotFoundError:
+                pass
+
+
+def _als_json(wert):
+    """Tupel (wie von random.getstate()) rekursiv als Listen"""
+    if isinstance(wert, tuple):
+        return [_als_json(w) for w in wert]
+    return wert
+
+
+def _als_tupel(wert):
+    """Gegenstück zu _als_json()"""
+    if isinstance(wert, list):
+        return tuple(_als_tupel(w) for w in wert)
+    return wert
@@ -0,0 +1,198 @@
+#!/usr/bin/env python3
+"""
+Primaten – Ensemble-Auswertung
+Fasst die Verläufe vieler Läufe pro Tick zusammen, ohne die einzelnen Verläufe zu behalten:
+Mittelwert und Varianz nach Welford, Minimum/Maximum und Quantile aus Histogrammen mit
+festen Klassen. Der Speicherbedarf wächst nur mit der Zahl der Ticks, nicht der Läufe.
+Die Histogramme belegen je Tick und Spalte `klassen` Zähler; Quantile der Kulturanteile
+werden daher nur bis KULTUR_QUANTILE_GRENZE Kulturen erfasst (sonst nur die der Population).
+Teilergebnisse paralleler Prozesse lassen sich mit vereinige() zusammenführen.
+"""
+
+import csv
+import numpy as np
+
+STATISTIKEN = ('mittel', 'std', 'min', 'max')
+
+# Bis zu so vielen Kulturen werden standardmäßig auch Quantile der Kulturanteile erfasst
+KULTUR_QUANTILE_GRENZE = 32
+
+
+class EnsembleAggregator:
+    """Laufende Statistik je Tick über Population und Kulturanteile.
+
+    Spalte 0 ist die Population, Spalte k die Kultur k (wie in export_csv).
+    `kultur_quantile` schaltet die Quantile der Kulturanteile ein oder aus (Standard: nur bis
+    KULTUR_QUANTILE_GRENZE Kulturen); ohne sie sind die Kulturspalten der Quantile NaN.
+    """
+
+    def __init__(self, max_population, anzahl_kulturen=9, quantile=(0.05, 0.5, 0.95), klassen=100,
+                 kapazitaet=1024, kultur_quantile=None):
+        self.max_population = max_population
+        self.anzahl_kulturen = anzahl_kulturen
+        self.quantile = tuple(quantile or ())
+        self.klassen = klassen
+        if kultur_quantile is None:
+            kultur_quantile = anzahl_kulturen <= KULTUR_QUANTILE_GRENZE
+        self.kultur_quantile = kultur_quantile
+        self.laeufe = 0
+        self.ticks = 0            # höchster gesehener Tick + 1
+        spalten = anzahl_kulturen + 1
+        self._n = np.zeros(kapazitaet, dtype=np.int64)
+        self._mittel = np.zeros((kapazitaet, spalten))
+        self._m2 = np.zeros((kapazitaet, spalten))
+        self._min = np.full((kapazitaet, spalten), np.inf)
+        self._max = np.full((kapazitaet, spalten), -np.inf)
+        # Obergrenze je Spalte für die Histogrammklassen (Anteile liegen in [0, 1])
+        self._obergrenze = np.ones(spalten)
+        self._obergrenze[0] = max_population
+        self._h = spalten if kultur_quantile else 1  # Spalten mit Histogramm
+        self._histogramm = (np.zeros((kapazitaet, self._h, klassen), dtype=np.uint32)
+                            if self.quantile else None)
+        self._spalten_index = np.arange(self._h)
+
+    def _platz_fuer(self, tick):
+        """Vergrößert die Tabellen (Verdopplung), bis `tick` hineinpasst"""
+        kapazitaet = len(self._n)
+        if tick < kapazitaet:
+            return
+        neu = max(tick + 1, 2 * kapazitaet)
+
+        def erweitert(feld, fuellwert):
+            groesser = np.full((neu,) + feld.shape[1:], fuellwert, dtype=feld.dtype)
+            groesser[:kapazitaet] = feld
+            return groesser
+
+        self._n = erweitert(self._n, 0)
+        self._mittel = erweitert(self._mittel, 0.0)
+        self._m2 = erweitert(self._m2, 0.0)
+        self._min = erweitert(self._min, np.inf)
+        self._max = erweitert(self._max, -np.inf)
+        if self._histogramm is not None:
+            self._histogramm = erweitert(self._histogramm, 0)
+
+    def zeile(self, datenpunkt):
+        """Dichte Wertezeile (Population, Anteil Kultur 1..K) aus einem Verlaufseintrag"""
+        werte = np.zeros(self.anzahl_kulturen + 1)
+        werte[0] = datenpunkt['population']
+        werte[datenpunkt['kulturen']] = datenpunkt['anteile']
+        return werte
+
+    def hinzufuegen(self, tick, werte):
+        """Nimmt die Wertezeile eines Laufs für einen Tick auf (Welford-Schritt)"""
+        self._platz_fuer(tick)
+        self._n[tick] += 1
+        n = self._n[tick]
+        mittel = self._mittel[tick]
+        delta = werte - mittel
+        mittel += delta / n
+        self._m2[tick] += delta * (werte - mittel)
+        np.minimum(self._min[tick], werte, out=self._min[tick])
+        np.maximum(self._max[tick], werte, out=self._max[tick])
+        if self._histogramm is not None:
+            h = self._h
+            klasse = (werte[:h] / self._obergrenze[:h] * self.klassen).astype(np.int64)
+            np.clip(klasse, 0, self.klassen - 1, out=klasse)
+            self._histogramm[tick, self._spalten_index, klasse] += 1
+        self.ticks = max(self.ticks, tick + 1)
+
+    def schreibe(self, datenpunkt):
+        """Beobachter-Schnittstelle: nimmt einen Verlaufseintrag auf"""
+        self.hinzufuegen(datenpunkt['tick'], self.zeile(datenpunkt))
+
+    def ereignis(self, tick, art, kultur):
+        """Ereignisse gehen nicht in die Statistik ein"""
+
+    def schliessen(self):
+        """Ein Lauf ist beendet"""
+        self.laeufe += 1
+
+    def verfolge(self, simulation):
+        """Übernimmt den bisherigen Verlauf einer Simulation und meldet sich als Beobachter an"""
+        for datenpunkt in simulation.history:
+            self.schreibe(datenpunkt)
+        simulation.beobachter.append(self)
+        return self
+
+    def vereinige(self, anderer):
+        """Führt die Statistik eines anderen Aggregators (z. B. aus einem Prozess) hinzu"""
+        if (anderer.anzahl_kulturen != self.anzahl_kulturen or anderer.klassen != self.klassen or
+                anderer.quantile != self.quantile or anderer.max_population != self.max_population or
+                anderer.kultur_quantile != self.kultur_quantile):
+            raise ValueError("Aggregatoren mit unterschiedlichen Einstellungen")
+        t = anderer.ticks
+        self._platz_fuer(t - 1)
+        na = self._n[:t, None].astype(float)
+        nb = anderer._n[:t, None].astype(float)
+        n = na + nb
+        teiler = np.where(n > 0, n, 1)
+        delta = anderer._mittel[:t] - self._mittel[:t]
+        self._mittel[:t] += delta * nb / teiler
+        self._m2[:t] += anderer._m2[:t] + delta ** 2 * na * nb / teiler
+        self._n[:t] += anderer._n[:t]
+        np.minimum(self._min[:t], anderer._min[:t], out=self._min[:t])
+        np.maximum(self._max[:t], anderer._max[:t], out=self._max[:t])
+        if self._histogramm is not None:
+            self._histogramm[:t] += anderer._histogramm[:t]
+        self.ticks = max(self.ticks, t)
+        self.laeufe += anderer.laeufe
+        return self
+
+    def quantil(self, q):
+        """Näherung des q-Quantils je Tick und Spalte aus den Histogrammen (lineare Interpolation)"""
+        if self._histogramm is None:
+            raise ValueError("Quantile wurden nicht erfasst")
+        t, h = self.ticks, self._h
+        kumuliert = np.cumsum(self._histogramm[:t], axis=2)
+        ziel = q * self._n[:t, None]
+        klasse = (kumuliert < ziel[:, :, None]).sum(axis=2)
+        klasse = np.minimum(klasse, self.klassen - 1)
+        vorher = np.where(klasse > 0,
+                          np.take_along_axis(kumuliert, np.maximum(klasse - 1, 0)[:, :, None], 2)[:, :, 0], 0)
+        in_klasse = np.take_along_axis(self._histogramm[:t], klasse[:, :, None], 2)[:, :, 0]
+        anteil = np.where(in_klasse > 0, (ziel - vorher) / np.maximum(in_klasse, 1), 0.5)
+        breite = self._obergrenze[:h] / self.klassen
+        wert = (klasse + np.clip(anteil, 0, 1)) * breite
+        # Nicht über die beobachteten Extremwerte hinaus
+        ergebnis = np.full(self._mittel[:t].shape, np.nan)
+        ergebnis[:, :h] = np.clip(wert, self._min[:t, :h], self._max[:t, :h])
+        return ergebnis
+
+    def ergebnis(self):
+        """Zusammenfassung als Spalten: tick, anzahl, mittel, varianz, std, min, max, q.. je Quantil"""
+        t = self.ticks
+        n = self._n[:t]
+        varianz = np.where(n[:, None] > 1, self._m2[:t] / np.maximum(n - 1, 1)[:, None], 0.0)
+        ergebnis = {
+            'tick': np.arange(t),
+            'anzahl': n.copy(),
+            'mittel': self._mittel[:t].copy(),
+            'varianz': varianz,
+            'std': np.sqrt(varianz),
+            'min': self._min[:t].copy(),
+            'max': self._max[:t].copy(),
+        }
+        for q in self.quantile:
+            ergebnis[quantil_name(q)] = self.quantil(q)
+        return ergebnis
+
+    def export_csv(self, basisname):
+        """Schreibt je Statistik eine CSV im Format von export_csv (basis_mittel.csv, ...)"""
+        ergebnis = self.ergebnis()
+        header = ['tick', 'population'] + [f'kultur_{i+1}' for i in range(self.anzahl_kulturen)]
+        dateien = []
+        for name in STATISTIKEN + tuple(quantil_name(q) for q in self.quantile):
+            dateiname = f"{basisname}_{name}.csv"
+            belegt = ergebnis['anzahl'] > 0
+            with open(dateiname, 'w', newline='', encoding='utf-8') as csvfile:
+                writer = csv.writer(csvfile)
+                writer.writerow(header)
+                for tick, werte in zip(ergebnis['tick'][belegt].tolist(), ergebnis[name][belegt].tolist()):
+                    writer.writerow([tick, f"{werte[0]:.5f}"] + [f"{a:.5f}" for a in werte[1:]])
+            dateien.append(dateiname)
+        return dateien
+
+
+def quantil_name(q):
+    """Spalten- bzw. Dateiname eines Quantils, z. B. 0.05 -> 'q05', 0.5 -> 'q50'"""
+    return f"q{round(q * 100):02d}"
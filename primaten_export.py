@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+"""
+Primaten – Streaming-Export
+Schreibt Verlauf und Ereignisse blockweise während der Simulation als CSV und/oder
+spaltenorientierte NumPy-Blöcke (.npz), ohne den gesamten Verlauf im Speicher zu halten.
+Kulturanzahlen werden sparsam als Tripel (tick, kultur, anzahl) abgelegt, nur für
+vorkommende Kulturen.
+"""
+
+import glob
+import numpy as np
+
+# Kodierung der Ereignisarten in den Binärblöcken
+EREIGNIS_ARTEN = ['aussterben', 'wiederkehr', 'monokultur']
+
+
+class StreamExporter:
+    """Beobachter, der Verlaufszeilen puffert und in festen Blöcken auf die Platte schreibt"""
+
+    def __init__(self, basisname, formate=('csv', 'npz'), block_groesse=1024):
+        self.basisname = basisname
+        self.formate = tuple(formate)
+        self.block_groesse = block_groesse
+        self.block_nummer = 0
+        self.zeilen_gesamt = 0
+
+        # Vorab angelegte Blockpuffer – der Speicherbedarf bleibt unabhängig von der Laufzeit
+        self._ticks = np.zeros(block_groesse, dtype=np.int64)
+        self._population = np.zeros(block_groesse, dtype=np.int64)
+        self._kulturen = []   # je Verlaufseintrag (tick, kulturen, anzahlen)
+        self._n = 0
+        self._ereignisse = []
+
+        self._csv = None
+        self._csv_kulturen = None
+        self._csv_ereignisse = None
+        if 'csv' in self.formate:
+            self._csv = open(f"{basisname}.csv", 'w', newline='', encoding='utf-8')
+            self._csv.write('tick,population\n')
+            self._csv_kulturen = open(f"{basisname}_kulturen.csv", 'w', newline='', encoding='utf-8')
+            self._csv_kulturen.write('tick,kultur,anzahl\n')
+            self._csv_ereignisse = open(f"{basisname}_ereignisse.csv", 'w', newline='', encoding='utf-8')
+            self._csv_ereignisse.write('tick,art,kultur\n')
+
+    def schreibe(self, datenpunkt):
+        """Übernimmt einen Verlaufseintrag in den Blockpuffer"""
+        i = self._n
+        self._ticks[i] = datenpunkt['tick']
+        self._population[i] = datenpunkt['population']
+        self._kulturen.append((datenpunkt['tick'], datenpunkt['kulturen'], datenpunkt['kultur_counts']))
+        self._n += 1
+        if self._n == self.block_groesse:
+            self.flush()
+
+    def ereignis(self, tick, art, kultur):
+        """Merkt ein Ereignis (Aussterben, Wiederkehr, Monokultur) für den nächsten Block vor"""
+        self._ereignisse.append((tick, EREIGNIS_ARTEN.index(art), kultur))
+
+    def flush(self):
+        """Schreibt den aktuellen Blockpuffer auf die Platte"""
+        n = self._n
+        if n == 0 and not self._ereignisse:
+            return
+
+        ereignisse = np.array(self._ereignisse, dtype=np.int64).reshape(-1, 3)
+        if self._kulturen:
+            kultur_tick = np.concatenate([np.full(len(k), t, dtype=np.int64) for t, k, _ in self._kulturen])
+            kultur_id = np.concatenate([k for _, k, _ in self._kulturen]).astype(np.int64)
+            kultur_anzahl = np.concatenate([a for _, _, a in self._kulturen]).astype(np.int64)
+        else:
+            kultur_tick = kultur_id = kultur_anzahl = np.zeros(0, dtype=np.int64)
+
+        if self._csv is not None:
+            daten = np.column_stack((self._ticks[:n], self._population[:n]))
+            np.savetxt(self._csv, daten, fmt='%d', delimiter=',')
+            self._csv.flush()
+            np.savetxt(self._csv_kulturen, np.column_stack((kultur_tick, kultur_id, kultur_anzahl)),
+                       fmt='%d', delimiter=',')
+            self._csv_kulturen.flush()
+            for tick, art, kultur in self._ereignisse:
+                self._csv_ereignisse.write(f"{tick},{EREIGNIS_ARTEN[art]},{kultur}\n")
+            self._csv_ereignisse.flush()
+
+        if 'npz' in self.formate:
+            np.savez(f"{self.basisname}_{self.block_nummer:05d}.npz",
+                     tick=self._ticks[:n],
+                     population=self._population[:n],
+                     kultur_tick=kultur_tick,
+                     kultur_id=kultur_id.astype(np.int16),
+                     kultur_anzahl=kultur_anzahl,
+                     ereignis_tick=ereignisse[:, 0],
+                     ereignis_art=ereignisse[:, 1].astype(np.int8),
+                     ereignis_kultur=ereignisse[:, 2].astype(np.int16))
+
+        self.block_nummer += 1
+        self.zeilen_gesamt += n
+        self._n = 0
+        self._kulturen = []
+        self._ereignisse = []
+
+    def schliessen(self):
+        """Schreibt den Rest und schließt alle Dateien"""
+        self.flush()
+        for datei in (self._csv, self._csv_kulturen, self._csv_ereignisse):
+            if datei is not None:
+                datei.close()
+        self._csv = None
+        self._csv_kulturen = None
+        self._csv_ereignisse = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.schliessen()
+
+
+def counts_matrix(ticks, kultur_tick, kultur_id, kultur_anzahl, anzahl_kulturen=None):
+    """Dichte Matrix (Ticks × Kulturen 1..anzahl_kulturen) aus sparsamen Tripeln"""
+    if anzahl_kulturen is None:
+        anzahl_kulturen = int(kultur_id.max()) if len(kultur_id) else 0
+    counts = np.zeros((len(ticks), anzahl_kulturen), dtype=np.int64)
+    if len(kultur_id):
+        counts[np.searchsorted(ticks, kultur_tick), kultur_id - 1] = kultur_anzahl
+    return counts
+
+
+def lade_verlauf(basisname, anzahl_kulturen=None):
+    """Fügt alle .npz-Blöcke eines Streaming-Exports wieder zu Spalten zusammen.
+    'kultur_counts' ist die daraus verdichtete Matrix (Breite: anzahl_kulturen bzw. höchste Kultur)."""
+    dateien = sorted(glob.glob(f"{glob.escape(basisname)}_[0-9][0-9][0-9][0-9][0-9].npz"))
+    if not dateien:
+        raise FileNotFoundError(f"Keine Blöcke gefunden für {basisname}")
+
+    spalten = {}
+    for datei in dateien:
+        with np.load(datei) as block:
+            for name in block.files:
+                spalten.setdefault(name, []).append(block[name])
+
+    verlauf = {name: np.concatenate(teile) for name, teile in spalten.items()}
+    verlauf['kultur_counts'] = counts_matrix(verlauf['tick'], verlauf['kultur_tick'], verlauf['kultur_id'],
+                                             verlauf['kultur_anzahl'], anzahl_kulturen)
+    verlauf['ereignis_art_namen'] = EREIGNIS_ARTEN
+    return verlauf
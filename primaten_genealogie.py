@@ -0,0 +1,179 @@
+#!/usr/bin/env python3
+"""
+Primaten – Genealogie
+Geburtsregister für die Abstammungsanalyse: Jeder Primat erhält eine fortlaufende Kennung
+(ab 1, 0 = keine), jede Entstehung wird als Zeile (kind, mutter, vater, tick, zelle, kultur)
+angehängt. Gründer der Anfangsbelegung und Migranten haben keine Eltern (0).
+
+Die Zeilen werden in Blöcken fester Größe gesammelt und spaltenweise als .npy-Dateien
+abgelegt (basis_geburten_00000.npy, ... mit Form (6, n)); im Speicher bleiben nur der
+laufende Block und die erste Kennung jedes Blocks. Da Kennungen aufsteigend vergeben
+werden, findet searchsorted Einträge ohne Index. `kultur` ist die Kultur bei der Geburt –
+weicht die heutige Kultur eines Primaten davon ab, wurde er umgestimmt.
+"""
+
+import glob
+from collections import OrderedDict
+
+import numpy as np
+
+SPALTEN = ('kind', 'mutter', 'vater', 'tick', 'zelle', 'kultur')
+
+
+class Geburtsregister:
+    """Spaltenorientiertes, nur anhängbares Geburtsprotokoll.
+
+    Ohne `basisname` bleiben abgeschlossene Blöcke im Speicher, sonst werden sie auf die
+    Platte geschrieben und für Abfragen per Memory-Map geöffnet.
+    """
+
+    def __init__(self, basisname=None, block_groesse=65536, offene_bloecke=16):
+        self.basisname = basisname
+        self.block_groesse = block_groesse
+        self.offene_bloecke = offene_bloecke
+        self.zeilen_gesamt = 0
+        self.letzte_kennung = 0
+        self._block = np.zeros((len(SPALTEN), block_groesse), dtype=np.int64)
+        self._n = 0
+        self._bloecke = []          # Dateinamen oder (ohne basisname) die Blöcke selbst
+        self._block_start = []      # erste Kennung je abgeschlossenem Block
+        self._geoeffnet = OrderedDict()
+
+    @classmethod
+    def lade(cls, basisname, offene_bloecke=16):
+        """Öffnet ein geschriebenes Register zur Auswertung"""
+        register = cls(basisname, offene_bloecke=offene_bloecke)
+        for dateiname in sorted(glob.glob(f"{basisname}_geburten_*.npy")):
+            block = np.load(dateiname, mmap_mode='r')
+            if block.shape[1] == 0:
+                continue
+            register._bloecke.append(dateiname)
+            register._block_start.append(int(block[0, 0]))
+            register.zeilen_gesamt += block.shape[1]
+            register.letzte_kennung = int(block[0, -1])
+        return register
+
+    def eintragen(self, kind, mutter, vater, tick, zelle, kultur):
+        """Hängt Zeilen an; alle Argumente sind Arrays gleicher Länge oder Skalare (tick)"""
+        kind = np.asarray(kind, dtype=np.int64)
+        anzahl = len(kind)
+        if anzahl == 0:
+            return
+        spalten = [kind, mutter, vater, np.broadcast_to(tick, anzahl), zelle, kultur]
+        start = 0
+        while start < anzahl:
+            teil = min(anzahl - start, self.block_groesse - self._n)
+            for zeile, werte in enumerate(spalten):
+                self._block[zeile, self._n:self._n + teil] = werte[start:start + teil]
+            self._n += teil
+            start += teil
+            if self._n == self.block_groesse:
+                self.flush()
+        self.zeilen_gesamt += anzahl
+        self.letzte_kennung = int(kind[-1])
+
+    def eintrag(self, kind, mutter, vater, tick, zelle, kultur):
+        """Hängt eine einzelne Zeile an (für die Objekt-Engine)"""
+        i = self._n
+        block = self._block
+        block[0, i] = kind
+        block[1, i] = mutter
+        block[2, i] = vater
+        block[3, i] = tick
+        block[4, i] = zelle
+        block[5, i] = kultur
+        self._n += 1
+        self.zeilen_gesamt += 1
+        self.letzte_kennung = kind
+        if self._n == self.block_groesse:
+            self.flush()
+
+    def flush(self):
+        """Schließt den laufenden Block ab (schreibt ihn ggf. auf die Platte)"""
+        if self._n == 0:
+            return
+        block = self._block[:, :self._n].copy()
+        self._block_start.append(int(block[0, 0]))
+        if self.basisname:
+            dateiname = f"{self.basisname}_geburten_{len(self._bloecke):05d}.npy"
+            np.save(dateiname, block)
+            self._bloecke.append(dateiname)
+        else:
+            self._bloecke.append(block)
+        self._n = 0
+
+    def schliessen(self):
+        """Schreibt den Rest"""
+        self.flush()
+
+    def __len__(self):
+        return self.zeilen_gesamt
+
+    def _lade_block(self, nr):
+        """Abgeschlossener Block nr (Dateien per Memory-Map, die zuletzt benutzten offen)"""
+        block = self._bloecke[nr]
+        if not isinstance(block, str):
+            return block
+        if nr in self._geoeffnet:
+            self._geoeffnet.move_to_end(nr)
+            return self._geoeffnet[nr]
+        geoeffnet = np.load(block, mmap_mode='r')
+        self._geoeffnet[nr] = geoeffnet
+        if len(self._geoeffnet) > self.offene_bloecke:
+            self._geoeffnet.popitem(last=False)
+        return geoeffnet
+
+    def zeilen(self, kennungen):
+        """Registerzeilen (6, n) zu den Kennungen; unbekannte Kennungen ergeben Nullspalten"""
+        kennungen = np.atleast_1d(np.asarray(kennungen, dtype=np.int64))
+        ergebnis = np.zeros((len(SPALTEN), len(kennungen)), dtype=np.int64)
+        # Blocknummer je Kennung; der laufende Block hat die Nummer len(self._bloecke)
+        starts = self._block_start[:len(self._bloecke)]
+        if self._n:
+            starts = starts + [int(self._block[0, 0])]
+        if not starts:
+            return ergebnis
+        nummern = np.searchsorted(starts, kennungen, side='right') - 1
+        for nr in np.unique(nummern[nummern >= 0]).tolist():
+            auswahl = np.flatnonzero(nummern == nr)
+            block = self._lade_block(nr) if nr < len(self._bloecke) else self._block[:, :self._n]
+            pos = np.searchsorted(block[0], kennungen[auswahl])
+            pos = np.minimum(pos, block.shape[1] - 1)
+            gefunden = block[0, pos] == kennungen[auswahl]
+            ergebnis[:, auswahl[gefunden]] = block[:, pos[gefunden]]
+        return ergebnis
+
+    def eltern(self, kennungen):
+        """Mutter- und Vaterkennungen (0 = unbekannt bzw. ohne Eltern)"""
+        zeilen = self.zeilen(kennungen)
+        return zeilen[1], zeilen[2]
+
+    def vorfahren(self, kennung, tiefe=None):
+        """Alle Vorfahren einer oder mehrerer Kennungen (aufsteigend sortiert), Generation für
+        Generation mit einer Registerabfrage je Generation; `tiefe` begrenzt die Generationen"""
+        gesehen = np.zeros(0, dtype=np.int64)
+        front = np.unique(np.atleast_1d(kennung))
+        generation = 0
+        while len(front) and (tiefe is None or generation < tiefe):
+            mutter, vater = self.eltern(front)
+            eltern = np.unique(np.concatenate([mutter, vater]))
+            front = np.setdiff1d(eltern[eltern > 0], gesehen, assume_unique=True)
+            gesehen = np.union1d(gesehen, front)
+            generation += 1
+        return gesehen
+
+    def mutterlinie(self, kennung):
+        """Kennungen der Mutter, Großmutter, ... bis zu einer Gründerin oder Migrantin"""
+        linie = []
+        mutter = self.eltern(kennung)[0][0]
+        while mutter > 0:
+            linie.append(int(mutter))
+            mutter = self.eltern(mutter)[0][0]
+        return linie
+
+    def spalten(self):
+        """Das ganze Register als Spalten-Dictionary (lädt alle Blöcke in den Speicher)"""
+        bloecke = [self._lade_block(nr) for nr in range(len(self._bloecke))]
+        bloecke.append(self._block[:, :self._n])
+        alles = np.concatenate(bloecke, axis=1)
+        return dict(zip(SPALTEN, alles))
@@ -0,0 +1,286 @@
+#!/usr/bin/env python3
+"""
+Primaten – Adaptiver Sweep (Successive Halving)
+Statt jedem Parameterpunkt dieselbe Rechenzeit zu geben, starten alle Konfigurationen mit
+einem kurzen Tickbudget. Nach jeder Runde werden die noch laufenden nach einer Kennzahl
+sortiert; nur das beste 1/eta (und alles, was knapp darunter liegt) wird auf das eta-fache
+Budget verlängert, bis `max_ticks` erreicht ist. Läufe, die ausgestorben sind oder eine
+Monokultur erreicht haben, sind abgeschlossen und werden nicht verlängert.
+
+Verlängerte Läufe setzen fort, statt neu zu beginnen: die Simulationen bleiben zwischen den
+Runden im Speicher (samt Zustand von `random` für die Objekt-Engine) oder werden mit
+`verzeichnis` als Checkpoint im Format des Ergebnis-Caches abgelegt. Mit Checkpoints
+verbraucht eine Runde nur Speicher für einen Lauf, und ein abgebrochener Sweep rechnet beim
+erneuten Start nur, was noch fehlt.
+
+Eine Konfiguration ist ein Dictionary mit den Parametern von erzeuge_simulation (breite,
+hoehe, dichte, seed, variante, engine, topologie, ...) sowie optional 'regeln' (Änderungen an
+der Variante) und 'toleranz' (Toleranztabelle). Ohne Seed bekommt sie ihre Nummer als Seed,
+damit Fortsetzungen reproduzierbar bleiben.
+"""
+
+import argparse
+import json
+import math
+import random
+
+import numpy as np
+
+from primaten_cache import ErgebnisCache
+from primaten_lauf import erzeuge_simulation
+from primaten_zweige import Zweig
+
+# Parameter von erzeuge_simulation, die eine Konfiguration setzen darf
+SIMULATIONS_PARAMETER = ('variante', 'breite', 'hoehe', 'dichte', 'seed', 'engine', 'topologie',
+                         'threads', 'backend', 'anzahl_kulturen')
+
+
+def _fenster(simulation, anteil=0.25):
+    """Die letzten `anteil` der Verlaufseinträge (mindestens einer) als Spalten"""
+    spalten = simulation.verlauf_arrays()
+    laenge = len(spalten['tick'])
+    return spalten, max(0, laenge - max(1, int(laenge * anteil)))
+
+
+def monokultur_tick(simulation):
+    """Erster Tick im Verlauf mit Monokultur (wie monokultur_erkannt), sonst None"""
+    spalten = simulation.verlauf_arrays()
+    zeiger = spalten['kultur_zeiger']
+    if not len(spalten['tick']) or not len(spalten['anteile']):
+        return None
+    belegt = zeiger[1:] > zeiger[:-1]
+    hoechster = np.zeros(len(spalten['tick']))
+    hoechster[belegt] = np.maximum.reduceat(spalten['anteile'], zeiger[:-1][belegt])
+    mono = np.flatnonzero((spalten['population'] >= 10) & (hoechster >= 0.995))
+    return int(spalten['tick'][mono[0]]) if len(mono) else None
+
+
+def zeit_bis_monokultur(simulation):
+    """Ticks bis zur ersten Monokultur; ohne Monokultur der aktuelle Tick (zensiert, wächst
+    mit dem Budget – solche Läufe landen oben und werden verlängert)"""
+    tick = monokultur_tick(simulation)
+    return float(simulation.tick_index if tick is None else tick)
+
+
+def kulturvielfalt(simulation):
+    """Effektive Zahl der Kulturen exp(Shannon-Entropie), gemittelt über das letzte Viertel"""
+    spalten, ab = _fenster(simulation)
+    zeiger, anteile = spalten['kultur_zeiger'], spalten['anteile']
+    werte = []
+    for i in range(ab, len(spalten['tick'])):
+        p = anteile[zeiger[i]:zeiger[i + 1]]
+        p = p[p > 0] / p.sum() if p.sum() > 0 else p[:0]
+        werte.append(math.exp(-(p * np.log(p)).sum()) if len(p) else 0.0)
+    return float(np.mean(werte))
+
+
+def populationsstabilitaet(simulation):
+    """Negativer Variationskoeffizient der Population im letzten Viertel (0 = völlig stabil);
+    ausgestorbene Läufe bekommen -inf"""
+    spalten, ab = _fenster(simulation)
+    population = spalten['population'][ab:].astype(np.float64)
+    if population.mean() == 0:
+        return float('-inf')
+    return float(-population.std() / population.mean())
+
+
+METRIKEN = {
+    'monokultur': zeit_bis_monokultur,
+    'vielfalt': kulturvielfalt,
+    'stabilitaet': populationsstabilitaet,
+}
+
+
+def abschluss(simulation):
+    """Grund, einen Lauf nicht weiter zu verlängern: 'ausgestorben', 'monokultur' oder None"""
+    if simulation.history[-1]['population'] == 0:
+        return 'ausgestorben'
+    if simulation._monokultur_gemeldet:
+        return 'monokultur'
+    return None
+
+
+def budgets(start_ticks, max_ticks, eta):
+    """Tickbudgets der Runden: start_ticks · eta^i, zuletzt genau max_ticks"""
+    if start_ticks < 1 or max_ticks < start_ticks or eta <= 1:
+        raise ValueError("Es muss 1 <= start_ticks <= max_ticks und eta > 1 gelten")
+    stufen = []
+    ticks = start_ticks
+    while ticks < max_ticks:
+        stufen.append(int(ticks))
+        ticks = math.ceil(ticks * eta)
+    stufen.append(max_ticks)
+    return stufen
+
+
+class Lauf:
+    """Stand einer Konfiguration im Sweep"""
+
+    def __init__(self, nummer, konfiguration):
+        self.nummer = nummer
+        self.konfiguration = konfiguration
+        self.ticks = 0
+        self.wert = None
+        self.abschluss = None
+        self.runde = 0
+        self.simulation = None
+        self.zufall = None  # Zustand von random zwischen den Runden (Objekt-Engine)
+
+    def ergebnis(self):
+        return {'nummer': self.nummer, 'konfiguration': self.konfiguration, 'ticks': self.ticks,
+                'wert': self.wert, 'abschluss': self.abschluss, 'runde': self.runde}
+
+
+class Halbierung:
+    """Successive Halving über eine Liste von Konfigurationen.
+
+    `metrik` ist ein Name aus METRIKEN oder eine Funktion(simulation) -> Zahl, größer ist
+    besser. Je Runde wird das beste 1/eta der laufenden Konfigurationen verlängert, dazu alle,
+    deren Wert höchstens `spielraum` unter dem letzten verlängerten liegt (unsichere Fälle).
+    `abbrechen=False` verlängert auch ausgestorbene Läufe und Monokulturen.
+    """
+
+    def __init__(self, konfigurationen, metrik='vielfalt', start_ticks=50, max_ticks=2000, eta=3,
+                 spielraum=0.0, verzeichnis=None, abbrechen=True):
+        self.laeufe = []
+        for nummer, konfiguration in enumerate(konfigurationen):
+            konfiguration = dict(konfiguration)
+            unbekannt = set(konfiguration) - set(SIMULATIONS_PARAMETER) - {'regeln', 'toleranz'}
+            if unbekannt:
+                raise ValueError(f"Unbekannte Parameter: {', '.join(sorted(unbekannt))}")
+            konfiguration.setdefault('seed', nummer)
+            self.laeufe.append(Lauf(nummer, konfiguration))
+        self.metrik = METRIKEN[metrik] if isinstance(metrik, str) else metrik
+        self.budgets = budgets(start_ticks, max_ticks, eta)
+        self.eta = eta
+        self.spielraum = spielraum
+        self.abbrechen = abbrechen
+        self.checkpoints = ErgebnisCache(verzeichnis, max_bytes=1 << 62) if verzeichnis else None
+        self.rechen_ticks = 0   # tatsächlich gerechnete Ticks (ohne geladene Checkpoints)
+        self.protokoll = []     # je Runde: Budget, Zahl gerechneter und verlängerter Läufe
+
+    def _schluessel(self, lauf, ticks):
+        return self.checkpoints.schluessel({'halbierung': lauf.konfiguration, 'ticks': ticks})
+
+    def _erzeugen(self, konfiguration, muster=None):
+        parameter = {name: konfiguration[name] for name in SIMULATIONS_PARAMETER if name in konfiguration}
+        variante = parameter.pop('variante', 'basis')
+        breite = parameter.pop('breite', 60)
+        hoehe = parameter.pop('hoehe', 60)
+        dichte = parameter.pop('dichte', 0.1)
+        if muster is not None:
+            hoehe, breite = muster['status'].shape
+        simulation = erzeuge_simulation(variante, breite, hoehe, dichte, muster=muster,
+                                        regeln=konfiguration.get('regeln'), **parameter)
+        Zweig(toleranz=konfiguration.get('toleranz')).anwenden(simulation)
+        return simulation
+
+    def _laden(self, lauf, ticks):
+        """Simulation aus dem Checkpoint nach `ticks` Ticks oder None"""
+        if self.checkpoints is None:
+            return None
+        eintrag = self.checkpoints.lade(self._schluessel(lauf, ticks))
+        if eintrag is None:
+            return None
+        simulation = self._erzeugen(lauf.konfiguration, eintrag['zustand'])
+        self.checkpoints.wiederherstellen(simulation, eintrag)
+        lauf.zufall = random.getstate()
+        return simulation
+
+    def _fortsetzen(self, lauf, ticks):
+        """Bringt den Lauf auf `ticks` Ticks: Checkpoint laden oder ab dem letzten Stand rechnen"""
+        simulation = self._laden(lauf, ticks)
+        if simulation is None:
+            simulation = lauf.simulation
+            if simulation is None and lauf.ticks:
+                simulation = self._laden(lauf, lauf.ticks)
+            if simulation is None:
+                # Die Objekt-Engine setzt random dabei mit dem Seed
+                simulation = self._erzeugen(lauf.konfiguration)
+                lauf.zufall = random.getstate()
+            random.setstate(lauf.zufall)
+            for _ in range(ticks - simulation.tick_index):
+                simulation.tick()
+                self.rechen_ticks += 1
+            lauf.zufall = random.getstate()
+            if self.checkpoints is not None:
+                self.checkpoints.speichere(self._schluessel(lauf, ticks), simulation, lauf.konfiguration)
+        lauf.ticks = simulation.tick_index
+        lauf.wert = float(self.metrik(simulation))
+        lauf.abschluss = abschluss(simulation) if self.abbrechen else None
+        simulation.schliessen()
+        lauf.simulation = None if self.checkpoints is not None else simulation
+
+    def rechnen(self, melden=None):
+        """Führt alle Runden aus und gibt die Ergebnisse sortiert zurück (beste zuerst).
+        `melden` ist eine Funktion(runde, budget, laufende), die nach jeder Runde aufgerufen wird."""
+        aktiv = list(self.laeufe)
+        for runde, ticks in enumerate(self.budgets):
+            for lauf in aktiv:
+                lauf.runde = runde
+                self._fortsetzen(lauf, ticks)
+            gerechnet = len(aktiv)
+            offen = [lauf for lauf in aktiv if lauf.abschluss is None]
+            aktiv = self.auswahl(offen) if runde + 1 < len(self.budgets) else []
+            for lauf in self.laeufe:
+                if lauf not in aktiv:
+                    lauf.simulation = None
+            self.protokoll.append({'runde': runde, 'ticks': ticks, 'gerechnet': gerechnet,
+                                   'abgeschlossen': gerechnet - len(offen), 'verlaengert': len(aktiv)})
+            if melden is not None:
+                melden(runde, ticks, aktiv)
+            if not aktiv:
+                break
+        return self.ergebnisse()
+
+    def auswahl(self, laeufe):
+        """Die zu verlängernden Läufe: bestes 1/eta und alle im Spielraum darunter"""
+        if not laeufe:
+            return []
+        sortiert = sorted(laeufe, key=lambda lauf: lauf.wert, reverse=True)
+        behalten = max(1, len(sortiert) // self.eta)
+        grenze = sortiert[behalten - 1].wert - self.spielraum
+        return sortiert[:behalten] + [lauf for lauf in sortiert[behalten:] if lauf.wert >= grenze]
+
+    def ergebnisse(self):
+        """Alle Läufe, sortiert nach erreichtem Budget und dann nach Wert (beste zuerst)"""
+        return [lauf.ergebnis() for lauf in sorted(
+            self.laeufe, key=lambda lauf: (lauf.runde, lauf.wert if lauf.wert is not None else -math.inf),
+            reverse=True)]
+
+    def gleiches_budget(self):
+        """Ticks, die ein Sweep mit max_ticks für jede Konfiguration gerechnet hätte"""
+        return len(self.laeufe) * self.budgets[-1]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Adaptiver Sweep mit Successive Halving")
+    parser.add_argument('konfigurationen', help="JSON-Datei mit einer Liste von Konfigurationen")
+    parser.add_argument('--metrik', choices=sorted(METRIKEN), default='vielfalt')
+    parser.add_argument('--start', type=int, default=50, help="Tickbudget der ersten Runde")
+    parser.add_argument('--max', type=int, default=2000, help="Tickbudget der letzten Runde")
+    parser.add_argument('--eta', type=int, default=3, help="Verlängerungsfaktor und Auswahlquote 1/eta")
+    parser.add_argument('--spielraum', type=float, default=0.0,
+                        help="Auch Läufe verlängern, die so viel unter der Auswahlgrenze liegen")
+    parser.add_argument('--verzeichnis', default=None, help="Checkpoints (Fortsetzen nach Abbruch)")
+    parser.add_argument('--beste', type=int, default=10, help="So viele Ergebnisse ausgeben")
+    args = parser.parse_args()
+
+    with open(args.konfigurationen, encoding='utf-8') as datei:
+        konfigurationen = json.load(datei)
+    halbierung = Halbierung(konfigurationen, args.metrik, args.start, args.max, args.eta,
+                            args.spielraum, args.verzeichnis)
+
+    def melden(runde, ticks, aktiv):
+        print(f"Runde {runde}: {ticks} Ticks, {len(aktiv)} Läufe verlängert")
+
+    ergebnisse = halbierung.rechnen(melden)
+    print(f"Gerechnete Ticks: {halbierung.rechen_ticks} (gleiches Budget: {halbierung.gleiches_budget()})")
+    for ergebnis in ergebnisse[:args.beste]:
+        print(f"{ergebnis['wert']:.4f} nach {ergebnis['ticks']} Ticks"
+              f"{' (' + ergebnis['abschluss'] + ')' if ergebnis['abschluss'] else ''}: "
+              f"{json.dumps(ergebnis['konfiguration'], sort_keys=True)}")
+
+
+if __name__ == '__main__':
+    main()
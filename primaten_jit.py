@@ -0,0 +1,226 @@
+#!/usr/bin/env python3
+"""
+Primaten – kompilierter Zellkern (optional)
+Ein fusionierter Kernel, der für jede Zelle alle Stufen so ausführt wie
+PrimatenSimulation.neue_generation: Zelle für Zelle in Leserichtung, Nachbarn aus dem
+Zustand vor dem Tick, Ressourcen direkt während des Durchlaufs aktualisiert.
+
+Mit installiertem Numba wird der Kernel beim ersten Aufruf in Maschinencode übersetzt;
+ohne Numba steht er nicht zur Verfügung und FeldSimulation rechnet mit NumPy weiter.
+Zufallszahlen stammen aus Numbas eigenem Generator (setze_seed), der Ablauf stimmt also
+in den Regeln, nicht in den Zufallszahlen mit der Referenz überein.
+"""
+
+import numpy as np
+
+try:
+    from numba import njit
+    NUMBA_VERFUEGBAR = True
+except ImportError:
+    njit = None
+    NUMBA_VERFUEGBAR = False
+
+# Kodierung der Stufen-Varianten für den Kernel (0 = Stufe abgeschaltet)
+ISOLATION_CODES = {None: 0, 'umzingelung': 1, 'toleranz': 2}
+GEBURT_CODES = {None: 0, 'mutter': 1, 'partnerwahl': 2}
+BEEINFLUSSUNG_CODES = {None: 0, 'direkt': 1, 'puffer': 2}
+
+
+def regel_codes(regeln):
+    """Übersetzt ein Regel-Dictionary in die Zahlenwerte des Kernels"""
+    return (int(bool(regeln['ressourcen'])), int(bool(regeln['altern'])),
+            ISOLATION_CODES[regeln['isolation']], GEBURT_CODES[regeln['geburt']],
+            float(regeln['migration'] or 0.0), BEEINFLUSSUNG_CODES[regeln['beeinflussung']],
+            int(bool(regeln['hybrid'])))
+
+
+def _seed(wert):
+    """Setzt den Zufallsgenerator des Kernels"""
+    np.random.seed(wert)
+
+
+def _naehe(k1, k1b, k2, k2b):
+    """kulturelle_naehe() auf Kulturwerten"""
+    return k1 == k2 or k1 == k2b or k1b == k2 or k1b == k2b
+
+
+def _generation(status, alter, geschlecht, kultur, kultur2, macht, res, index, toleranz,
+                anzahl_kulturen, ressourcen, altern, isolation, geburt, migration, beeinflussung, hybrid,
+                s_neu, a_neu, g_neu, k_neu, k2_neu, m_neu):
+    """Ein Tick für alle N Zellen; schreibt den neuen Zustand in die *_neu-Felder.
+
+    Alle Zustandsfelder haben N+1 Einträge (Index N = dauerhaft leere Zelle), `index` ist die
+    (N, k)-Nachbartabelle der Topologie, `res` die Ressourcen (N+1, wird verändert).
+    """
+    n, kn = index.shape
+    for i in range(n):
+        st = status[i]
+        al = alter[i]
+        ge = geschlecht[i]
+        ku = kultur[i]
+        ku2 = kultur2[i]
+        ma = macht[i]
+        lebt = True
+
+        # Stufe Ressourcen
+        if ressourcen:
+            if st > 0 and res[i] > 0:
+                res[i] -= 1
+            else:
+                res[i] = min(5, res[i] + 1)
+
+        # Stufe Altern
+        if altern and st > 0:
+            if np.random.random() < 0.8:
+                al += 1
+            if al > 19:
+                st = 0
+            elif al >= 3 and st == 1:
+                st = 2
+
+        # Stufe Isolation
+        if st > 0 and isolation == 1:
+            isoliert = True
+            for j in range(kn):
+                if kultur[index[i, j]] == ku:
+                    isoliert = False
+                    break
+            if isoliert:
+                lebt = False
+        elif st > 0 and isolation == 2 and ku > 0:
+            fremde = 0
+            for j in range(kn):
+                nb = index[i, j]
+                if status[nb] > 0 and kultur[nb] > 0:
+                    if not _naehe(ku, ku2, kultur[nb], kultur2[nb]):
+                        fremde += 1
+            if np.random.random() < fremde / kn * (1 - toleranz[ku]):
+                lebt = False
+
+        if lebt and st == 0:
+            besetzt = False
+
+            # Stufe Geburt
+            if geburt:
+                weibchen = 0
+                maennchen = False
+                for j in range(kn):
+                    nb = index[i, j]
+                    if status[nb] == 2:
+                        if geschlecht[nb] == 1:
+                            weibchen += 1
+                        elif geschlecht[nb] == 2:
+                            maennchen = True
+
+                if weibchen > 0 and maennchen and np.random.random() < 0.25:
+                    mutter = -1
+                    vater = -1
+                    if geburt == 1:
+                        wahl = np.random.randint(0, weibchen)
+                        for j in range(kn):
+                            nb = index[i, j]
+                            if status[nb] == 2 and geschlecht[nb] == 1:
+                                if wahl == 0:
+                                    mutter = nb
+                                    break
+                                wahl -= 1
+                    else:
+                        bester_score = -1.0
+                        for jw in range(kn):
+                            w = index[i, jw]
+                            if status[w] != 2 or geschlecht[w] != 1:
+                                continue
+                            for jm in range(kn):
+                                m = index[i, jm]
+                                if status[m] != 2 or geschlecht[m] != 2:
+                                    continue
+                                affinitaet = 1 if _naehe(kultur[w], kultur2[w],
+                                                         kultur[m], kultur2[m]) else 0
+                                score = 0.8 * macht[m] + 0.2 * affinitaet * 9
+                                if score > bester_score:
+                                    bester_score = score
+                                    mutter = w
+                                    vater = m
+
+                    if mutter >= 0:
+                        ge = 1 if np.random.random() < 0.5 else 2
+                        st = 1
+                        al = 0
+                        ku = kultur[mutter]
+                        if vater < 0:
+                            ma = macht[mutter]
+                            ku2 = 0
+                        else:
+                            ma = macht[vater]
+                            ku2 = kultur[vater]
+                        besetzt = True
+
+            # Stufe Migration
+            if not besetzt and migration > 0 and np.random.random() < migration:
+                ge = 1 if np.random.random() < 0.5 else 2
+                ku = np.random.randint(1, anzahl_kulturen + 1)
+                ku2 = np.random.randint(1, anzahl_kulturen + 1) if hybrid else 0
+                ma = float(np.random.randint(1, 10))
+                st = 1
+                al = 0
+                besetzt = True
+
+            # Leer geblieben: verstorbene Primaten behalten ihre Kultur bis zur Neubesiedlung
+            if not besetzt and al == 0:
+                lebt = False
+
+        # Stufe Beeinflussung
+        elif lebt and st == 2 and beeinflussung and (beeinflussung == 1 or ge == 2):
+            bonus = 0.0
+            if beeinflussung == 2:
+                summe = res[i]
+                for j in range(kn):
+                    summe += res[index[i, j]]
+                bonus = min(10, summe // 5) / 10.0
+
+            bester = -1
+            for j in range(kn):
+                nb = index[i, j]
+                if status[nb] == 2 and macht[nb] > ma and (beeinflussung == 1 or geschlecht[nb] == 2):
+                    if bester < 0 or macht[nb] > macht[bester]:
+                        bester = nb
+
+            if beeinflussung == 1:
+                if bester >= 0:
+                    if np.random.random() < 0.3:
+                        ku = kultur[bester]
+                        ma = max(0.0, ma - 1)
+                else:
+                    ma = min(9.0, ma + 0.1)
+            else:
+                if bester >= 0:
+                    if macht[bester] > ma + 3 and np.random.random() < 0.3:
+                        ku = kultur[bester]
+                        ku2 = kultur2[bester]
+                        ma = max(1.0, ma - 1)
+                else:
+                    ma = min(9.0, ma + 0.1 + bonus * 0.2)
+
+        if lebt:
+            s_neu[i] = st
+            a_neu[i] = al
+            g_neu[i] = ge
+            k_neu[i] = ku
+            k2_neu[i] = ku2
+            m_neu[i] = ma
+        else:
+            s_neu[i] = 0
+            a_neu[i] = 0
+            g_neu[i] = 0
+            k_neu[i] = 0
+            k2_neu[i] = 0
+            m_neu[i] = 0.0
+
+
+if NUMBA_VERFUEGBAR:
+    _naehe = njit(cache=True, inline='always')(_naehe)
+    setze_seed = njit(cache=True)(_seed)
+    generation = njit(cache=True)(_generation)
+else:
+    setze_seed = None
+    generation = None
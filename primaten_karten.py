@@ -0,0 +1,183 @@
+#!/usr/bin/env python3
+"""
+Primaten – Zeitgemittelte Karten
+Akkumulatoren, die je Zelle über viele Ticks mitteln: wie oft eine Zelle belegt war, welche
+Kultur dort am häufigsten lebte und wie viele Ressourcen im Mittel vorhanden waren. Die
+Schichten werden als Beobachter jeden bzw. jeden k-ten Tick an Ort und Stelle fortgeschrieben;
+der Speicherbedarf hängt nur von der Gittergröße (und der Zahl der Kulturen) ab, nicht von
+der Laufzeit.
+
+Ohne Halbwertszeit wird über den ganzen Lauf gemittelt, mit `halbwertszeit` (in Ticks)
+exponentiell gewichtet: ein Beitrag zählt nach so vielen Ticks nur noch halb. Statt alle
+Schichten bei jeder Aufnahme mit dem Abklingfaktor zu multiplizieren, wächst das Gewicht
+neuer Beiträge um dessen Kehrwert; nur wenn es zu groß wird, werden alle Schichten einmal
+zurückskaliert. Eine Aufnahme kostet so O(Zellen), unabhängig von der Zahl der Kulturen.
+"""
+
+import numpy as np
+
+from primaten_bild import kultur_bild, karten_bild
+
+# Ab diesem Gewicht werden alle Schichten zurückskaliert (float32 reicht bis etwa 3e38)
+MAX_GEWICHT = 1e30
+
+# Höchster Ressourcenwert einer Zelle
+MAX_RESSOURCEN = 5
+
+
+class KartenAkkumulator:
+    """Beobachter mit zeitgemittelten Schichten einer Simulation.
+
+    `intervall` nimmt nur jeden so vielten Tick auf, `kulturen=False` verzichtet auf die
+    Kulturschicht (Kulturen + 1 Werte je Zelle) bei sehr großen Gittern.
+    """
+
+    def __init__(self, intervall=1, halbwertszeit=None, kulturen=True):
+        self.intervall = intervall
+        self.halbwertszeit = halbwertszeit
+        self.kulturen = kulturen
+        self.abklingen = 1.0 if halbwertszeit is None else 0.5 ** (intervall / halbwertszeit)
+        self.aufnahmen = 0
+        self.form = None
+        self._simulation = None
+
+    def verfolge(self, simulation):
+        """Meldet sich als Beobachter an und legt die Schichten in der Form des Raums an"""
+        self._simulation = simulation
+        self.anlegen(simulation.topologie.form, simulation.anzahl_kulturen)
+        simulation.beobachter.append(self)
+        return self
+
+    def anlegen(self, form, anzahl_kulturen=9):
+        """Legt leere Schichten an (auch zum Zurücksetzen)"""
+        self.form = tuple(form)
+        self.anzahl_kulturen = anzahl_kulturen
+        n = int(np.prod(self.form))
+        self.aufnahmen = 0
+        self._g = 1.0
+        self._gewicht = 0.0
+        self._belegung = np.zeros(n, dtype=np.float64)
+        self._ressourcen = None
+        self._kultur = np.zeros((anzahl_kulturen + 1) * n, dtype=np.float32) if self.kulturen else None
+        self._zellen = np.arange(n)
+
+    def zuruecksetzen(self):
+        """Vergisst alle bisherigen Aufnahmen"""
+        self.anlegen(self.form, self.anzahl_kulturen)
+
+    def aufnehmen(self, zustand):
+        """Rechnet einen Zustand (Felder wie zustand_arrays()) in die Schichten ein"""
+        if self.aufnahmen:
+            self._g /= self.abklingen
+        g = self._g
+        belegt = np.asarray(zustand['status']).reshape(-1) > 0
+        self._gewicht += g
+        self._belegung[belegt] += g
+        if self._kultur is not None:
+            kultur = np.asarray(zustand['kultur']).reshape(-1)[belegt]
+            self._kultur[kultur * len(self._zellen) + self._zellen[belegt]] += g
+        if 'ressourcen' in zustand:
+            if self._ressourcen is None:
+                self._ressourcen = np.zeros(len(self._zellen), dtype=np.float64)
+            self._ressourcen += g * np.asarray(zustand['ressourcen']).reshape(-1)
+        self.aufnahmen += 1
+        if g > MAX_GEWICHT:
+            self._skalieren(1.0 / g)
+
+    def _skalieren(self, faktor):
+        """Skaliert alle Schichten und das Gewicht neuer Beiträge (ändert keine Mittelwerte)"""
+        self._g *= faktor
+        self._gewicht *= faktor
+        self._belegung *= faktor
+        if self._kultur is not None:
+            self._kultur *= np.float32(faktor)
+        if self._ressourcen is not None:
+            self._ressourcen *= faktor
+
+    # --- Beobachter-Schnittstelle ---
+
+    def schreibe(self, datenpunkt):
+        if self._simulation is not None and datenpunkt['tick'] % self.intervall == 0:
+            self.aufnehmen(self._simulation.zustand_arrays())
+
+    def ereignis(self, tick, art, kultur):
+        pass
+
+    def schliessen(self):
+        self._simulation = None
+
+    # --- Schichten ---
+
+    def _mittel(self, summe):
+        if self._gewicht == 0:
+            return np.zeros(self.form)
+        return (summe / self._gewicht).reshape(self.form)
+
+    def belegung(self):
+        """Anteil der Aufnahmen, in denen die Zelle belegt war (0–1)"""
+        return self._mittel(self._belegung)
+
+    def _kultur_matrix(self):
+        if self._kultur is None:
+            raise ValueError("Der Akkumulator führt keine Kulturschicht (kulturen=False)")
+        return self._kultur.reshape(self.anzahl_kulturen + 1, -1)
+
+    def dominante_kultur(self):
+        """Häufigste Kultur je Zelle (0 = nie belegt)"""
+        matrix = self._kultur_matrix()
+        return matrix.argmax(axis=0).reshape(self.form)
+
+    def kultur_anteil(self):
+        """Anteil der Aufnahmen, in denen die dominante Kultur die Zelle hielt (0–1)"""
+        return self._mittel(self._kultur_matrix().max(axis=0))
+
+    def ressourcen(self):
+        """Mittlere Ressourcen je Zelle; None ohne Ressourcenregel"""
+        if self._ressourcen is None:
+            return None
+        return self._mittel(self._ressourcen)
+
+    def erschoepfung(self):
+        """Mittlere Erschöpfung der Ressourcen (0 = immer voll, 1 = immer leer)"""
+        ressourcen = self.ressourcen()
+        if ressourcen is None:
+            return None
+        return 1.0 - ressourcen / MAX_RESSOURCEN
+
+    def karten(self):
+        """Alle vorhandenen Schichten als Dictionary von 2-D-Arrays"""
+        karten = {'belegung': self.belegung()}
+        if self._kultur is not None:
+            karten['dominante_kultur'] = self.dominante_kultur()
+            karten['kultur_anteil'] = self.kultur_anteil()
+        if self._ressourcen is not None:
+            karten['ressourcen'] = self.ressourcen()
+            karten['erschoepfung'] = self.erschoepfung()
+        return karten
+
+    def speichere(self, dateiname):
+        """Speichert die Schichten als .npz"""
+        np.savez_compressed(dateiname, aufnahmen=self.aufnahmen, **self.karten())
+
+    def speichere_bilder(self, basisname, kultur_farben, zell_groesse=4):
+        """Speichert die Schichten als PNG (basis_belegung.png, ...) und gibt die Dateinamen zurück"""
+        dateien = []
+        for name, bild in karten_bilder(self.karten(), kultur_farben, zell_groesse).items():
+            dateiname = f"{basisname}_{name}.png"
+            bild.save(dateiname)
+            dateien.append(dateiname)
+        return dateien
+
+
+def karten_bilder(karten, kultur_farben, zell_groesse=4):
+    """Bilder zu den Schichten aus KartenAkkumulator.karten(): Kulturpalette für die dominante
+    Kultur, sonst Wärmebilder (Ressourcen auf 0–1 normiert)"""
+    bilder = {}
+    for name, karte in karten.items():
+        if name == 'dominante_kultur':
+            bilder[name] = kultur_bild({'kultur': karte}, kultur_farben, zell_groesse)
+        elif name == 'ressourcen':
+            bilder[name] = karten_bild(karte / MAX_RESSOURCEN, zell_groesse)
+        else:
+            bilder[name] = karten_bild(karte, zell_groesse)
+    return bilder
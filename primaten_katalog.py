@@ -0,0 +1,213 @@
+#!/usr/bin/env python3
+"""
+Primaten – Laufkatalog
+Lokale SQLite-Datenbank mit Metadaten, Verlauf und Ereignissen vieler Simulationsläufe.
+WAL-Modus und gebündelte Transaktionen erlauben parallel schreibende Prozesse.
+"""
+
+import json
+import sqlite3
+import time
+from datetime import datetime
+import numpy as np
+
+from primaten_export import counts_matrix
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS laeufe (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    variante TEXT NOT NULL,
+    breite INTEGER NOT NULL,
+    hoehe INTEGER NOT NULL,
+    dichte REAL NOT NULL,
+    seed INTEGER,
+    parameter TEXT,
+    gestartet TEXT NOT NULL,
+    beendet TEXT,
+    status TEXT NOT NULL DEFAULT 'laufend',
+    ticks INTEGER,
+    endpopulation INTEGER,
+    monokultur INTEGER,
+    monokultur_tick INTEGER
+);
+CREATE TABLE IF NOT EXISTS verlauf (
+    lauf_id INTEGER NOT NULL,
+    tick INTEGER NOT NULL,
+    population INTEGER NOT NULL,
+    PRIMARY KEY (lauf_id, tick)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS verlauf_kulturen (
+    lauf_id INTEGER NOT NULL,
+    tick INTEGER NOT NULL,
+    kultur INTEGER NOT NULL,
+    anzahl INTEGER NOT NULL,
+    PRIMARY KEY (lauf_id, tick, kultur)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS ereignisse (
+    lauf_id INTEGER NOT NULL,
+    tick INTEGER NOT NULL,
+    art TEXT NOT NULL,
+    kultur INTEGER
+);
+CREATE INDEX IF NOT EXISTS idx_laeufe_parameter ON laeufe (variante, breite, hoehe, dichte);
+CREATE INDEX IF NOT EXISTS idx_laeufe_seed ON laeufe (seed);
+CREATE INDEX IF NOT EXISTS idx_laeufe_monokultur ON laeufe (monokultur, monokultur_tick);
+CREATE INDEX IF NOT EXISTS idx_laeufe_gestartet ON laeufe (gestartet);
+CREATE INDEX IF NOT EXISTS idx_ereignisse_lauf ON ereignisse (lauf_id, tick);
+CREATE INDEX IF NOT EXISTS idx_ereignisse_art ON ereignisse (art, kultur);
+"""
+
+
+class RunKatalog:
+    """Verbindung zum Laufkatalog – pro Prozess eine eigene Instanz verwenden"""
+
+    def __init__(self, pfad="primaten_katalog.sqlite", timeout=60.0):
+        self.pfad = pfad
+        # isolation_level=None: Transaktionen werden explizit gesteuert
+        self.verbindung = sqlite3.connect(pfad, timeout=timeout, isolation_level=None)
+        self.verbindung.execute("PRAGMA journal_mode=WAL")
+        self.verbindung.execute("PRAGMA synchronous=NORMAL")
+        self.verbindung.execute(f"PRAGMA busy_timeout={int(timeout * 1000)}")
+        self.verbindung.executescript(SCHEMA)
+
+    def transaktion(self, arbeit, versuche=20):
+        """Führt `arbeit(cursor)` in einer Schreibtransaktion aus, bei Sperren mit Wiederholung"""
+        for versuch in range(versuche):
+            try:
+                cursor = self.verbindung.cursor()
+                cursor.execute("BEGIN IMMEDIATE")
+                try:
+                    ergebnis = arbeit(cursor)
+                    cursor.execute("COMMIT")
+                    return ergebnis
+                except BaseException:
+                    cursor.execute("ROLLBACK")
+                    raise
+            except sqlite3.OperationalError as e:
+                if 'locked' not in str(e) or versuch == versuche - 1:
+                    raise
+                time.sleep(0.05 * (versuch + 1))
+
+    def lauf_anlegen(self, variante, breite, hoehe, dichte, seed=None, parameter=None):
+        """Legt einen neuen Lauf an und gibt dessen ID zurück"""
+        zeile = (variante, breite, hoehe, dichte, seed,
+                 json.dumps(parameter or {}, sort_keys=True),
+                 datetime.now().isoformat(timespec='seconds'))
+        return self.transaktion(lambda c: c.execute(
+            "INSERT INTO laeufe (variante, breite, hoehe, dichte, seed, parameter, gestartet) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?)", zeile).lastrowid)
+
+    def lauf_abschliessen(self, lauf_id, ticks, endpopulation, monokultur=None,
+                          monokultur_tick=None, status='fertig'):
+        """Trägt das Ergebnis eines Laufs nach"""
+        zeile = (datetime.now().isoformat(timespec='seconds'), status, ticks, endpopulation,
+                 monokultur, monokultur_tick, lauf_id)
+        self.transaktion(lambda c: c.execute(
+            "UPDATE laeufe SET beendet=?, status=?, ticks=?, endpopulation=?, "
+            "monokultur=?, monokultur_tick=? WHERE id=?", zeile))
+
+    def schreiber(self, lauf_id, batch_groesse=2048):
+        """Erzeugt einen Beobachter, der Verlauf und Ereignisse gebündelt einträgt"""
+        return KatalogSchreiber(self, lauf_id, batch_groesse)
+
+    def suche(self, variante=None, breite=None, hoehe=None, dichte=None, seed=None,
+              monokultur=None, max_monokultur_tick=None, status=None, **parameter):
+        """Sucht Läufe nach Parametern, Seed und Ergebnis; weitere Schlüssel filtern im JSON"""
+        bedingungen = []
+        werte = []
+        for spalte, wert in (('variante', variante), ('breite', breite), ('hoehe', hoehe),
+                             ('dichte', dichte), ('seed', seed), ('monokultur', monokultur),
+                             ('status', status)):
+            if wert is not None:
+                bedingungen.append(f"{spalte} = ?")
+                werte.append(wert)
+        if max_monokultur_tick is not None:
+            bedingungen.append("monokultur_tick <= ?")
+            werte.append(max_monokultur_tick)
+        for schluessel, wert in parameter.items():
+            bedingungen.append("json_extract(parameter, ?) = ?")
+            werte.extend([f"$.{schluessel}", wert])
+
+        sql = "SELECT * FROM laeufe"
+        if bedingungen:
+            sql += " WHERE " + " AND ".join(bedingungen)
+        sql += " ORDER BY id"
+
+        cursor = self.verbindung.execute(sql, werte)
+        spalten = [d[0] for d in cursor.description]
+        return [dict(zip(spalten, zeile)) for zeile in cursor.fetchall()]
+
+    def verlauf(self, lauf_id, anzahl_kulturen=None):
+        """Liest den Verlauf eines Laufs als Spalten (tick, population, kultur_counts).
+        Ohne `anzahl_kulturen` reicht die Matrix bis zur höchsten vorkommenden Kultur."""
+        zeilen = self.verbindung.execute(
+            "SELECT tick, population FROM verlauf WHERE lauf_id = ? ORDER BY tick",
+            (lauf_id,)).fetchall()
+        ticks = np.array([z[0] for z in zeilen], dtype=np.int64)
+        population = np.array([z[1] for z in zeilen], dtype=np.int64)
+        kulturen = self.verbindung.execute(
+            "SELECT tick, kultur, anzahl FROM verlauf_kulturen WHERE lauf_id = ?",
+            (lauf_id,)).fetchall()
+        daten = np.array(kulturen, dtype=np.int64).reshape(-1, 3)
+        counts = counts_matrix(ticks, daten[:, 0], daten[:, 1], daten[:, 2], anzahl_kulturen)
+        return {'tick': ticks, 'population': population, 'kultur_counts': counts}
+
+    def ereignisse(self, lauf_id):
+        """Liest alle Ereignisse eines Laufs"""
+        return self.verbindung.execute(
+            "SELECT tick, art, kultur FROM ereignisse WHERE lauf_id = ? ORDER BY tick",
+            (lauf_id,)).fetchall()
+
+    def schliessen(self):
+        """Schließt die Datenbankverbindung"""
+        self.verbindung.close()
+
+
+class KatalogSchreiber:
+    """Beobachter für PrimatenSimulation, der Zeilen sammelt und blockweise einträgt"""
+
+    def __init__(self, katalog, lauf_id, batch_groesse=2048):
+        self.katalog = katalog
+        self.lauf_id = lauf_id
+        self.batch_groesse = batch_groesse
+        self.monokultur = None
+        self.monokultur_tick = None
+        self._verlauf = []
+        self._kulturen = []
+        self._ereignisse = []
+
+    def schreibe(self, datenpunkt):
+        """Puffert einen Verlaufseintrag; Kulturanzahlen werden nur ungleich null abgelegt"""
+        tick = datenpunkt['tick']
+        self._verlauf.append((self.lauf_id, tick, datenpunkt['population']))
+        for kultur, anzahl in zip(datenpunkt['kulturen'].tolist(), datenpunkt['kultur_counts'].tolist()):
+            self._kulturen.append((self.lauf_id, tick, kultur, anzahl))
+        if len(self._verlauf) >= self.batch_groesse:
+            self.flush()
+
+    def ereignis(self, tick, art, kultur):
+        """Puffert ein Ereignis und merkt sich die erste Monokultur"""
+        self._ereignisse.append((self.lauf_id, tick, art, kultur))
+        if art == 'monokultur' and self.monokultur_tick is None:
+            self.monokultur = kultur
+            self.monokultur_tick = tick
+
+    def flush(self):
+        """Trägt alle gepufferten Zeilen in einer einzigen Transaktion ein"""
+        if not (self._verlauf or self._ereignisse):
+            return
+        verlauf, kulturen, ereignisse = self._verlauf, self._kulturen, self._ereignisse
+
+        def arbeit(c):
+            c.executemany("INSERT OR REPLACE INTO verlauf VALUES (?, ?, ?)", verlauf)
+            c.executemany("INSERT OR REPLACE INTO verlauf_kulturen VALUES (?, ?, ?, ?)", kulturen)
+            c.executemany("INSERT INTO ereignisse VALUES (?, ?, ?, ?)", ereignisse)
+
+        self.katalog.transaktion(arbeit)
+        self._verlauf = []
+        self._kulturen = []
+        self._ereignisse = []
+
+    def schliessen(self):
+        """Schreibt verbleibende Zeilen"""
+        self.flush()
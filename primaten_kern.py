@@ -0,0 +1,1361 @@
+#!/usr/bin/env python3
+"""
+Primaten – Simulationskern
+Gemeinsame Regel-Pipeline für beide Varianten (Basis und Optimiert). Die Regeln sind in
+Stufen gegliedert (Ressourcen, Altern, Isolation, Geburt, Migration, Beeinflussung), die je
+Variante ein- und ausgeschaltet oder ausgetauscht werden können:
+
+- PrimatenSimulation: Referenz mit Primat-Objekten, Zelle für Zelle wie bisher
+- FeldSimulation: schneller Kern auf NumPy-Arrays, alle aktiven Stufen in einem Durchlauf
+"""
+
+import colorsys
+import random
+from concurrent.futures import ThreadPoolExecutor
+from operator import itemgetter
+from datetime import datetime
+import csv
+import sys
+import numpy as np
+import primaten_jit
+from primaten_muster import FELDER, zufallsmuster
+from primaten_topologie import Topologie, TOPOLOGIEN, torus
+from primaten_verlauf import Verlauf, ALTER_KLASSEN, MACHT_KLASSEN, GESCHLECHTER
+
+# Farben und Toleranzen der ersten neun Kulturen (wie in den ursprünglichen Programmen)
+STANDARD_FARBEN = [
+    None, '#e6194B', '#3cb44b', '#ffe119', '#4363d8',
+    '#f58231', '#911eb4', '#46f0f0', '#f032e6', '#bcf60c'
+]
+STANDARD_TOLERANZ = [None, 0.2, 0.8, 0.4, 0.9, 0.5, 0.1, 0.7, 0.3, 0.6]
+
+# Kulturen werden in den Feldern als int16 gespeichert
+MAX_KULTUREN = 32767
+
+# Reihenfolge der Stufen innerhalb eines Zellschritts. Isolation betrifft nur lebende,
+# Geburt und Migration nur leere Zellen – die Reihenfolge der beiden ist daher beliebig.
+STUFEN = ('ressourcen', 'altern', 'isolation', 'geburt', 'migration', 'beeinflussung')
+
+VARIANTEN = {
+    # primaten.py: Kultur von der Mutter, Tod bei vollständiger Umzingelung, ungepufferte Übernahme
+    'basis': {
+        'ressourcen': False,
+        'altern': True,
+        'isolation': 'umzingelung',
+        'geburt': 'mutter',
+        'migration': 0.001,
+        'beeinflussung': 'direkt',
+        'hybrid': False,
+    },
+    # primatenOpt.py: Hybridisierung, Toleranz, Macht-Puffer, Partnerwahl, Ressourcen
+    'opt': {
+        'ressourcen': True,
+        'altern': True,
+        'isolation': 'toleranz',
+        'geburt': 'partnerwahl',
+        'migration': 0.0005,
+        'beeinflussung': 'puffer',
+        'hybrid': True,
+    },
+}
+
+
+def kultur_farben_erzeugen(anzahl_kulturen):
+    """Farbliste (Index = Kultur, Index 0 = None) für beliebig viele Kulturen.
+    Die ersten neun Kulturen behalten ihre Farben, weitere Farbtöne folgen im goldenen Schnitt."""
+    farben = STANDARD_FARBEN[:anzahl_kulturen + 1]
+    farbton = 0.0
+    for kultur in range(len(farben), anzahl_kulturen + 1):
+        farbton = (farbton + 0.618033988749895) % 1.0
+        saettigung = (0.95, 0.75, 0.55)[kultur % 3]
+        helligkeit = (0.95, 0.8, 0.65)[(kultur // 3) % 3]
+        r, g, b = colorsys.hsv_to_rgb(farbton, saettigung, helligkeit)
+        farben.append(f"#{int(r * 255):02x}{int(g * 255):02x}{int(b * 255):02x}")
+    return farben
+
+
+def anteil_matrix(history, schluessel='anteile', max_kulturen=None):
+    """Dichte Matrix (Einträge × Kulturen) aus den sparsamen Verlaufseinträgen.
+
+    Gibt (kulturen, matrix) zurück; die Spalten sind die im Ausschnitt vorkommenden Kulturen.
+    Mit `max_kulturen` bleiben nur die Kulturen mit dem größten Höchstwert übrig.
+    """
+    if not history:
+        return np.zeros(0, dtype=np.int64), np.zeros((0, 0))
+    kulturen = np.unique(np.concatenate([d['kulturen'] for d in history]))
+    matrix = np.zeros((len(history), len(kulturen)))
+    for zeile, datenpunkt in enumerate(history):
+        matrix[zeile, np.searchsorted(kulturen, datenpunkt['kulturen'])] = datenpunkt[schluessel]
+    if max_kulturen is not None and len(kulturen) > max_kulturen:
+        auswahl = np.sort(np.argsort(-matrix.max(axis=0), kind='stable')[:max_kulturen])
+        kulturen, matrix = kulturen[auswahl], matrix[:, auswahl]
+    return kulturen, matrix
+
+
+# Bis zu dieser Zahl möglicher Kulturpaare zählt bincount, darüber np.unique (sparsam)
+MAX_DICHTE_PAARE = 1 << 16
+
+
+def demografie_zaehlung(kultur, kultur2, alter, macht, geschlecht, anzahl_kulturen):
+    """Hybridisierungspaare und Histogramme der lebenden Primaten (je ein bincount-Durchlauf).
+
+    Die Arrays enthalten nur lebende Primaten. Paare (Primär-, Sekundärkultur) sind sparsam:
+    'hybrid_primaer' und 'hybrid_sekundaer' nennen die vorkommenden Paare (Sekundärkultur 0 =
+    keine), 'hybrid_counts' zählt sie. Macht wird abgerundet, Alter ab 20 zusammengefasst.
+    """
+    breite = anzahl_kulturen + 1
+    paare = kultur.astype(np.int64) * breite + kultur2
+    if breite * breite <= MAX_DICHTE_PAARE:
+        zaehler = np.bincount(paare, minlength=breite * breite)
+        paare = np.flatnonzero(zaehler)
+        zaehler = zaehler[paare]
+    else:
+        paare, zaehler = np.unique(paare, return_counts=True)
+    return {
+        'hybrid_primaer': paare // breite,
+        'hybrid_sekundaer': paare % breite,
+        'hybrid_counts': zaehler,
+        'alter_hist': np.bincount(np.minimum(alter, ALTER_KLASSEN - 1), minlength=ALTER_KLASSEN),
+        'macht_hist': np.bincount(np.clip(macht, 0, MACHT_KLASSEN - 1).astype(np.int64),
+                                  minlength=MACHT_KLASSEN),
+        'geschlecht_hist': np.bincount(geschlecht, minlength=GESCHLECHTER + 1)[1:GESCHLECHTER + 1],
+    }
+
+
+def hybrid_matrix(datenpunkt, anzahl_kulturen):
+    """Dichte Matrix (Primär- × Sekundärkultur, Index 0 = keine) eines Verlaufseintrags"""
+    matrix = np.zeros((anzahl_kulturen + 1, anzahl_kulturen + 1), dtype=np.int64)
+    matrix[datenpunkt['hybrid_primaer'], datenpunkt['hybrid_sekundaer']] = datenpunkt['hybrid_counts']
+    return matrix
+
+
+class Primat:
+    """Klasse für einen einzelnen Primaten"""
+    __slots__ = ('status', 'alter', 'geschlecht', 'kultur', 'macht', 'kultur2', 'kennung')
+
+    def __init__(self, status=0, alter=0, geschlecht=0, kultur=0, macht=0, kultur2=0, kennung=0):
+        self.status = status      # 0=kein Primat, 1=jung, 2=erwachsen
+        self.alter = alter        # in Ticks
+        self.geschlecht = geschlecht  # 1=weiblich, 2=männlich
+        self.kultur = kultur      # Primärkultur (1 bis anzahl_kulturen)
+        self.macht = macht        # Sozialer Einfluss (1-9)
+        self.kultur2 = kultur2    # Sekundärkultur (nur Variante 'opt', sonst 0)
+        self.kennung = kennung    # Kennung im Geburtsregister (0 = ohne Genealogie)
+
+    def uebernehme(self, anderer):
+        """Kopiert alle Eigenschaften eines anderen Primaten in diese Instanz"""
+        self.status = anderer.status
+        self.alter = anderer.alter
+        self.geschlecht = anderer.geschlecht
+        self.kultur = anderer.kultur
+        self.macht = anderer.macht
+        self.kultur2 = anderer.kultur2
+        self.kennung = anderer.kennung
+
+
+class _LeererPrimat(Primat):
+    """Unveränderlicher Platzhalter, den sich alle leeren Zellen teilen"""
+    __slots__ = ()
+
+    def __init__(self):
+        for name in Primat.__slots__:
+            object.__setattr__(self, name, 0)
+
+    def __setattr__(self, name, wert):
+        raise AttributeError("LEER ist unveränderlich")
+
+    def __delattr__(self, name):
+        raise AttributeError("LEER ist unveränderlich")
+
+    def __repr__(self):
+        return "LEER"
+
+
+LEER = _LeererPrimat()
+
+
+class SimulationsBasis:
+    """Gemeinsamer Teil beider Engines: Regeln, Statistik, Historie, Ereignisse und Export"""
+
+    def __init__(self, breite=60, hoehe=60, initial_dichte=0.1, variante='basis', regeln=None,
+                 topologie=None, anzahl_kulturen=9, toleranz_beta=(2.0, 2.0), genealogie=None,
+                 muster=None):
+        if not 1 <= anzahl_kulturen <= MAX_KULTUREN:
+            raise ValueError(f"anzahl_kulturen muss zwischen 1 und {MAX_KULTUREN} liegen")
+        # Nachbarschaft als Indextabelle; Standard ist der Torus der Referenz
+        if topologie is None:
+            topologie = torus(breite, hoehe)
+        elif not isinstance(topologie, Topologie):
+            topologie = TOPOLOGIEN[topologie](breite, hoehe)
+        self.topologie = topologie
+        self.hoehe, self.breite = topologie.form
+        self.variante = variante
+        self.regeln = dict(VARIANTEN[variante])
+        if regeln:
+            self.regeln_aendern(regeln)
+        self.tick_index = 0
+        self.history = Verlauf()
+        self.max_history = 5000
+        self.verlauf_intervall = 1  # nur jeden so vielten Tick in den Verlauf (Speicherbudget)
+        self.beobachter = []  # Empfänger für Verlauf und Ereignisse (z. B. StreamExporter)
+        self._letzte_kulturen = None
+        self._monokultur_gemeldet = False
+        self.anzahl_kulturen = anzahl_kulturen
+        self.kultur_farben = kultur_farben_erzeugen(anzahl_kulturen)
+        # Kulturelle Toleranz-Werte (Isolationsregel 'toleranz'); ab Kultur 10 aus Beta(a, b)
+        self.kultur_toleranz = STANDARD_TOLERANZ[:anzahl_kulturen + 1]
+        weitere = anzahl_kulturen + 1 - len(self.kultur_toleranz)
+        if weitere > 0:
+            self.kultur_toleranz += self.ziehe_toleranzen(weitere, *toleranz_beta)
+        self.ressourcen = np.zeros(topologie.form, dtype=int)
+        # Optionales Geburtsregister (primaten_genealogie); Kennungen werden ab 1 vergeben
+        self.genealogie = genealogie
+        self._naechste_kennung = 1
+        # Anfangszustand: Muster (primaten_muster) oder zufällige Belegung mit initial_dichte
+        if muster is not None:
+            self.setze_anfangszustand(muster)
+        else:
+            self.initialisiere_raum(initial_dichte)
+        if self.regeln['ressourcen'] and (muster is None or 'ressourcen' not in muster):
+            self.initialisiere_ressourcen()
+
+    def regeln_aendern(self, regeln):
+        """Ändert einzelne Regeln, auch mitten im Lauf. Regeln immer hierüber ändern, nicht
+        über self.regeln direkt: Engines, die Stufen vorab binden, binden sie hier neu."""
+        unbekannt = set(regeln) - set(self.regeln)
+        if unbekannt:
+            raise ValueError(f"Unbekannte Regeln: {', '.join(sorted(unbekannt))}")
+        self.regeln.update(regeln)
+        self._stufen_binden()
+
+    def _stufen_binden(self):
+        """Ordnet die Stufen den aktuellen Regeln zu (für Engines, die das vorab tun)"""
+
+    def initialisiere_raum(self, dichte=0.1):
+        """Initialisiert den Raum mit zufällig verteilten Primaten"""
+        raise NotImplementedError
+
+    def initialisiere_vektorisiert(self, dichte=0.1, seed=None):
+        """Zufällige Belegung samt Ressourcen in einem Zug aus einem NumPy-Generator.
+        Für die Objekt-Engine viel schneller als initialisiere_raum(), die Zufallszahlen
+        stammen aber nicht aus `random` (Läufe stimmen nur statistisch überein)."""
+        self.setze_anfangszustand(zufallsmuster(self.topologie.form, dichte, self.anzahl_kulturen,
+                                                self.regeln['hybrid'], self.regeln['ressourcen'], seed))
+
+    def setze_anfangszustand(self, muster):
+        """Übernimmt einen Anfangszustand (Dictionary wie von primaten_muster) und setzt den
+        Verlauf zurück. Fehlende Felder sind 0, 'ressourcen' ist optional."""
+        n, form = self.topologie.anzahl, self.topologie.form
+        felder = {}
+        for name in FELDER:
+            if name not in muster:
+                felder[name] = np.zeros(n, dtype=np.int64)
+                continue
+            feld = np.asarray(muster[name])
+            if feld.shape not in (form, (n,)):
+                raise ValueError(f"Muster-Feld '{name}' hat die Form {feld.shape}, erwartet {form}")
+            felder[name] = feld.reshape(n)
+        for name in ('kultur', 'kultur2'):
+            if felder[name].min() < 0 or felder[name].max() > self.anzahl_kulturen:
+                raise ValueError(f"Kulturen im Muster müssen zwischen 0 und {self.anzahl_kulturen} liegen")
+        if 'ressourcen' in muster:
+            self.ressourcen = np.asarray(muster['ressourcen']).reshape(form).astype(int)
+        self._felder_uebernehmen(felder)
+        self._verlauf_zuruecksetzen()
+
+    def _felder_uebernehmen(self, felder):
+        """Setzt den Zustand aus flachen Feldern (je N Einträge) und vergibt Gründerkennungen"""
+        raise NotImplementedError
+
+    def einwanderung(self, kultur, anzahl, seed=None):
+        """Setzt bis zu `anzahl` junge Primaten der Kultur `kultur` in zufällige leere Zellen
+        (z. B. eine eingewanderte Kultur in einem Zweig); gibt die Zellindizes zurück"""
+        if not 1 <= kultur <= self.anzahl_kulturen:
+            raise ValueError(f"Kultur muss zwischen 1 und {self.anzahl_kulturen} liegen")
+        rng = np.random.default_rng(seed)
+        leer = np.flatnonzero(self.zustand_arrays()['status'].reshape(-1) == 0)
+        zellen = np.sort(rng.choice(leer, min(anzahl, len(leer)), replace=False))
+        n = len(zellen)
+        self._zellen_setzen(zellen, {
+            'status': np.ones(n, dtype=np.int64),
+            'alter': np.zeros(n, dtype=np.int64),
+            'geschlecht': rng.integers(1, 3, n),
+            'kultur': np.full(n, kultur),
+            'kultur2': np.zeros(n, dtype=np.int64),
+            'macht': rng.integers(1, 10, n),
+        })
+        return zellen
+
+    def _zellen_setzen(self, zellen, felder):
+        """Belegt einzelne Zellen neu (Felder wie bei _felder_uebernehmen, je Zelle ein Wert)"""
+        raise NotImplementedError
+
+    def neu_saeen(self, seed):
+        """Setzt die Zufallsquelle der Engine neu (die Objekt-Engine nutzt `random`)"""
+        random.seed(seed)
+
+    def nach_verzweigung(self):
+        """Im abgezweigten Prozess: Beobachter und Geburtsregister gehören dem Elternlauf"""
+        self.beobachter = []
+        self.genealogie = None
+
+    def verzweige(self, zweige, ticks, auswertung=None, prozesse=None):
+        """Rechnet Was-wäre-wenn-Zweige ab dem aktuellen Zustand (siehe primaten_zweige)"""
+        from primaten_zweige import verzweige
+        return verzweige(self, zweige, ticks, auswertung, prozesse)
+
+    def initialisiere_ressourcen(self):
+        """Initialisiert die Ressourcen-Ebene"""
+        raise NotImplementedError
+
+    def ziehe_toleranzen(self, anzahl, a, b):
+        """Zieht `anzahl` Toleranzwerte aus einer Beta(a, b)-Verteilung"""
+        return [random.betavariate(a, b) for _ in range(anzahl)]
+
+    def kultur_zaehlung(self):
+        """Gibt (vorkommende Kulturen, Zähler je vorkommender Kultur, Gesamtpopulation) zurück"""
+        raise NotImplementedError
+
+    def demografie(self):
+        """Hybridisierungspaare und Histogramme der lebenden Primaten (siehe demografie_zaehlung)"""
+        raise NotImplementedError
+
+    def _kennungen_vergeben(self, anzahl):
+        """Reserviert `anzahl` fortlaufende Kennungen für neue Primaten; gibt die erste zurück"""
+        erste = self._naechste_kennung
+        self._naechste_kennung += anzahl
+        return erste
+
+    def zustand_arrays(self):
+        """Liefert den Zustand aller Zellen als NumPy-Arrays (für Rendering und Export)"""
+        raise NotImplementedError
+
+    def speicherbedarf(self):
+        """Belegter Speicher je Bestandteil in Bytes: 'raum' (Zustand), 'neuer_raum' (zweiter
+        Zustand, in den ein Tick schreibt), 'ressourcen', 'topologie' (Nachbartabellen),
+        'verlauf' und 'tick' (weitere Zwischenergebnisse eines Ticks, nur während des Ticks
+        belegt). Python-Objekte sind mit ihrer typischen Größe geschätzt."""
+        topologie = sum(feld.nbytes for feld in vars(self.topologie).values() if isinstance(feld, np.ndarray))
+        if self.topologie._csr is not None:
+            topologie += sum(feld.nbytes for feld in self.topologie._csr)
+        bedarf = {
+            'ressourcen': self.ressourcen.nbytes,
+            'topologie': topologie,
+            'verlauf': self.history.speicherbedarf(),
+        }
+        bedarf.update(self._engine_speicherbedarf())
+        return bedarf
+
+    def _engine_speicherbedarf(self):
+        """Anteile der Engine an speicherbedarf(): 'raum', 'neuer_raum', 'tick', ..."""
+        raise NotImplementedError
+
+    def verlauf_arrays(self):
+        """Historie als Spalten ohne Kopie (siehe Verlauf.spalten)"""
+        return self.history.spalten()
+
+    def tick(self):
+        """Führt einen Simulationsschritt durch"""
+        raise NotImplementedError
+
+    def berechne_statistik(self):
+        """Berechnet Statistiken über die aktuelle Population.
+
+        Verlaufseinträge sind sparsam: 'kulturen' nennt die vorkommenden Kulturen,
+        'kultur_counts' und 'anteile' stehen in derselben Reihenfolge. Dazu kommen die
+        Hybridisierungspaare und die Histogramme aus demografie(). Zurückgegeben werden
+        die Anteile als Dictionary {kultur: anteil} und die Gesamtpopulation.
+        """
+        kulturen, kultur_zaehler, gesamt_population = self.kultur_zaehlung()
+
+        # Anteile berechnen; bei Hybridisierung bezogen auf alle gezählten Kulturen
+        # (Primär- und verschiedene Sekundärkultur, Anteile können daher nicht addiert werden)
+        if self.regeln['hybrid']:
+            bezug = int(kultur_zaehler.sum())
+        else:
+            bezug = gesamt_population
+        anteile = kultur_zaehler / bezug if bezug > 0 else np.zeros(len(kultur_zaehler))
+
+        # Zur Historie hinzufügen
+        datenpunkt = {
+            'tick': self.tick_index,
+            'population': gesamt_population,
+            'kulturen': kulturen,
+            'anteile': anteile,
+            'kultur_counts': kultur_zaehler
+        }
+        datenpunkt.update(self.demografie())
+
+        if self.tick_index % self.verlauf_intervall == 0:
+            self.history.append(datenpunkt)
+            if len(self.history) > self.max_history:
+                self.history.entferne_aelteste(len(self.history) - self.max_history)
+
+        anteile = dict(zip(kulturen.tolist(), anteile.tolist()))
+        for beobachter in self.beobachter:
+            beobachter.schreibe(datenpunkt)
+        self.erkenne_ereignisse(kulturen, anteile, gesamt_population)
+
+        return anteile, gesamt_population
+
+    def erkenne_ereignisse(self, kulturen, anteile, population):
+        """Meldet Aussterben, Wiederkehr und Monokultur an alle Beobachter"""
+        if self._letzte_kulturen is not None and self.beobachter:
+            vorher = self._letzte_kulturen
+            for kultur in np.setxor1d(vorher, kulturen).tolist():
+                if kultur in anteile:
+                    self.melde_ereignis('wiederkehr', kultur)
+                else:
+                    self.melde_ereignis('aussterben', kultur)
+        self._letzte_kulturen = kulturen
+
+        mono, kultur = self.monokultur_erkannt(anteile, population)
+        if mono and not self._monokultur_gemeldet:
+            self.melde_ereignis('monokultur', kultur)
+        self._monokultur_gemeldet = mono
+
+    def melde_ereignis(self, art, kultur):
+        """Leitet ein Ereignis an alle Beobachter weiter"""
+        for beobachter in self.beobachter:
+            beobachter.ereignis(self.tick_index, art, kultur)
+
+    def _verlauf_zuruecksetzen(self):
+        """Setzt Tickzähler, Historie und Ereigniserkennung nach einer Neuinitialisierung zurück"""
+        self.tick_index = 0
+        self.history = Verlauf()
+        self._letzte_kulturen = None
+        self._monokultur_gemeldet = False
+        self.berechne_statistik()
+
+    def monokultur_erkannt(self, anteile, population):
+        """Prüft, ob eine Monokultur erreicht wurde (`anteile` wie von tick(): {kultur: anteil})"""
+        if population < 10 or not anteile:
+            return False, None
+
+        dominante_kultur = max(anteile, key=anteile.get)
+        if anteile[dominante_kultur] >= 0.995:
+            return True, dominante_kultur
+
+        return False, None
+
+    def schliessen(self):
+        """Gibt Hilfsmittel der Engine frei (z. B. Thread-Pools) und schreibt das Geburtsregister"""
+        if self.genealogie is not None:
+            self.genealogie.schliessen()
+
+    def export_csv(self, dateiname=None, format='breit'):
+        """Exportiert die Simulationsdaten als CSV.
+
+        'breit': eine Spalte je Kultur 1..anzahl_kulturen; 'lang': eine Zeile je Tick und
+        vorkommender Kultur (tick, population, kultur, anteil) – für viele Kulturen.
+        """
+        if format not in ('breit', 'lang'):
+            raise ValueError(f"Unbekanntes CSV-Format: {format}")
+        if not dateiname:
+            zeitstempel = datetime.now().strftime("%Y%m%d_%H%M%S")
+            dateiname = f"kulturverlauf_{zeitstempel}.csv"
+
+        with open(dateiname, 'w', newline='', encoding='utf-8') as csvfile:
+            writer = csv.writer(csvfile)
+            if format == 'lang':
+                writer.writerow(['tick', 'population', 'kultur', 'anteil'])
+                for eintrag in self.history:
+                    for kultur, anteil in zip(eintrag['kulturen'].tolist(), eintrag['anteile'].tolist()):
+                        writer.writerow([eintrag['tick'], eintrag['population'], kultur, f"{anteil:.5f}"])
+                return dateiname
+
+            # Header schreiben
+            header = ['tick', 'population'] + [f'kultur_{i+1}' for i in range(self.anzahl_kulturen)]
+            writer.writerow(header)
+
+            # Daten schreiben
+            for eintrag in self.history:
+                anteile = np.zeros(self.anzahl_kulturen)
+                anteile[eintrag['kulturen'] - 1] = eintrag['anteile']
+                zeile = [eintrag['tick'], eintrag['population']]
+                zeile.extend([f"{a:.5f}" for a in anteile.tolist()])
+                writer.writerow(zeile)
+
+        return dateiname
+
+
+class PrimatenSimulation(SimulationsBasis):
+    """Referenz-Engine mit Primat-Objekten; jede Stufe ist eine austauschbare Methode.
+
+    Zwei Gitter werden abwechselnd beschrieben: die Instanzen des hinteren Gitters werden
+    im nächsten Tick wiederverwendet, leere Zellen verweisen auf das gemeinsame LEER.
+    Objekte aus `raum` bleiben daher nur bis zum übernächsten Tick gültig.
+    """
+
+    def __init__(self, breite=60, hoehe=60, initial_dichte=0.1, variante='basis', regeln=None,
+                 topologie=None, anzahl_kulturen=9, toleranz_beta=(2.0, 2.0), genealogie=None,
+                 muster=None):
+        self._greifer = None
+        super().__init__(breite, hoehe, initial_dichte, variante, regeln, topologie,
+                         anzahl_kulturen, toleranz_beta, genealogie, muster)
+        self._stufen_binden()
+
+    def _stufen_binden(self):
+        # Stufen der gewählten Regeln zuordnen (None = Stufe abgeschaltet)
+        self._isolation = {
+            None: None,
+            'umzingelung': self.isolation_umzingelung,
+            'toleranz': self.isolation_toleranz,
+        }[self.regeln['isolation']]
+        self._geburt = {
+            None: None,
+            'mutter': self.geburt_mutter,
+            'partnerwahl': self.geburt_partnerwahl,
+        }[self.regeln['geburt']]
+        self._beeinflussung = {
+            None: None,
+            'direkt': self.beeinflussung_direkt,
+            'puffer': self.beeinflussung_puffer,
+        }[self.regeln['beeinflussung']]
+
+    def initialisiere_ressourcen(self):
+        """Initialisiert die Ressourcen-Ebene"""
+        for y in range(self.hoehe):
+            for x in range(self.breite):
+                self.ressourcen[y][x] = random.randint(0, 5)  # 0-5 Ressourcen pro Zelle
+
+    def zufalls_primat(self, ziel=None):
+        """Erzeugt einen jungen Primaten mit zufälligen Eigenschaften (optional in `ziel`)"""
+        geschlecht = 1 if random.random() < 0.5 else 2
+        kultur = random.randint(1, self.anzahl_kulturen)
+        kultur2 = random.randint(1, self.anzahl_kulturen) if self.regeln['hybrid'] else 0
+        macht = random.randint(1, 9)
+        if ziel is None:
+            return Primat(1, 0, geschlecht, kultur, macht, kultur2)
+        ziel.status, ziel.alter, ziel.geschlecht = 1, 0, geschlecht
+        ziel.kultur, ziel.macht, ziel.kultur2 = kultur, macht, kultur2
+        return ziel
+
+    def _bereite_nachbarn_vor(self):
+        """Legt je Zelle einen itemgetter über die Indextabelle an.
+        Er liefert die Nachbarn als Tupel (aus CPythons Tupel-Freiliste, ohne neue Listen)."""
+        zeilen = self.topologie.index.tolist()
+        if self.topologie.k == 1:
+            self._greifer = [lambda zellen, j=zeile[0]: (zellen[j],) for zeile in zeilen]
+        else:
+            self._greifer = [itemgetter(*zeile) for zeile in zeilen]
+
+    def _raum_anlegen(self):
+        """Legt beide Gitter leer an"""
+        form = self.topologie.form
+        self.raum = np.full(form, LEER, dtype=object)
+        self._puffer = np.full(form, LEER, dtype=object)
+        self._frei = []          # wiederverwendbare Instanzen
+        if self._greifer is None:
+            self._bereite_nachbarn_vor()
+
+    def initialisiere_raum(self, dichte=0.1):
+        """Initialisiert den Raum mit zufällig verteilten Primaten (Zelle für Zelle aus `random`,
+        wie die ursprünglichen Programme; schneller: initialisiere_vektorisiert)"""
+        self._raum_anlegen()
+
+        for y in range(self.hoehe):
+            for x in range(self.breite):
+                if random.random() < dichte:
+                    self.raum[y][x] = self.zufalls_primat()
+                else:
+                    self.raum[y][x] = LEER
+
+        if self.genealogie is not None:
+            for i, p in enumerate(self.raum.ravel().tolist()):
+                if p is not LEER:
+                    self._geburt_eintragen(p, None, None, i, 0)
+
+        self._verlauf_zuruecksetzen()
+
+    def _felder_uebernehmen(self, felder):
+        """Erzeugt Primat-Objekte nur für belegte Zellen (auch Verstorbene mit Alter > 0)"""
+        self._raum_anlegen()
+        belegt = np.flatnonzero((felder['status'] > 0) | (felder['alter'] > 0))
+        spalten = [felder[name][belegt].tolist()
+                   for name in ('status', 'alter', 'geschlecht', 'kultur', 'macht', 'kultur2')]
+        primaten = [Primat(*werte) for werte in zip(*spalten)]
+        zellen = self.raum.ravel()
+        zellen[belegt] = primaten
+        if self.genealogie is not None:
+            for i, p in zip(belegt.tolist(), primaten):
+                if p.status > 0:
+                    self._geburt_eintragen(p, None, None, i, 0)
+
+    def _zellen_setzen(self, zellen, felder):
+        """Ersetzt die Zellen durch neue Primat-Objekte (Kennungen wie bei Migranten)"""
+        spalten = [felder[name].tolist()
+                   for name in ('status', 'alter', 'geschlecht', 'kultur', 'macht', 'kultur2')]
+        primaten = [Primat(*werte) for werte in zip(*spalten)]
+        self.raum.ravel()[zellen] = primaten
+        if self.genealogie is not None:
+            for i, p in zip(zellen.tolist(), primaten):
+                self._geburt_eintragen(p, None, None, i, self.tick_index)
+
+    def nachbarn_mit_position(self, x, y):
+        """Gibt die Nachbarn samt Koordinaten zurück (Reihenfolge der Topologie)"""
+        nachbarn_pos = []
+        for j in self.topologie.nachbarn(y * self.breite + x):
+            ny, nx = divmod(int(j), self.breite)
+            nachbarn_pos.append((self.raum[ny][nx], nx, ny))
+        return nachbarn_pos
+
+    def nachbarn(self, x, y):
+        """Gibt die Nachbarn einer Position zurück (beim Torus die 8 umliegenden Zellen)"""
+        return [nb for nb, nx, ny in self.nachbarn_mit_position(x, y)]
+
+    def kulturelle_naehe(self, p1, p2):
+        """Berechnet kulturelle Ähnlichkeit zwischen zwei Primaten"""
+        if (p1.kultur == p2.kultur or p1.kultur == p2.kultur2 or
+            p1.kultur2 == p2.kultur or p1.kultur2 == p2.kultur2):
+            return 1
+        return 0
+
+    def kind_erzeugen(self, mutter, vater=None, ziel=None):
+        """Erzeugt ein Kind: Kultur von der Mutter, mit Vater Sekundärkultur und Macht vom Vater"""
+        geschlecht = 1 if random.random() < 0.5 else 2
+        if vater is None:
+            macht, kultur2 = mutter.macht, 0
+        else:
+            macht, kultur2 = vater.macht, vater.kultur
+        if ziel is None:
+            return Primat(1, 0, geschlecht, mutter.kultur, macht, kultur2)
+        ziel.status, ziel.alter, ziel.geschlecht = 1, 0, geschlecht
+        ziel.kultur, ziel.macht, ziel.kultur2 = mutter.kultur, macht, kultur2
+        return ziel
+
+    def _geburt_eintragen(self, neu, mutter, vater, i, tick):
+        """Gibt einem neuen Primaten die nächste Kennung und trägt ihn ins Geburtsregister ein"""
+        neu.kennung = self._kennungen_vergeben(1)
+        self.genealogie.eintrag(neu.kennung, mutter.kennung if mutter is not None else 0,
+                                vater.kennung if vater is not None else 0, tick, i, neu.kultur)
+
+    def get_nachbar_ressourcen(self, x, y):
+        """Berechnet lokale Ressourcen-Konzentration"""
+        i = y * self.breite + x
+        ressourcen = self.ressourcen.ravel()
+        sum_r = ressourcen[i] + sum(ressourcen[j] for j in self.topologie.nachbarn(i))
+        return min(10, sum_r // 5)  # Normiert auf 0-10
+
+    def _ressourcen_umgebung(self, i):
+        """Wie get_nachbar_ressourcen, aber während des Ticks auf der Ressourcenliste"""
+        res = self._res
+        sum_r = res[i]
+        for j in self._index_zeilen[i]:
+            sum_r += res[j]  # Lücken verweisen auf den Eintrag N (0 Ressourcen)
+        return min(10, sum_r // 5)
+
+    # --- Stufen ---------------------------------------------------------------
+
+    def verbrauche_ressourcen(self, neu, i):
+        """Stufe Ressourcen: Verbrauch durch Bewohner, sonst Regeneration"""
+        res = self._res
+        if neu.status > 0 and res[i] > 0:
+            res[i] -= 1
+        else:
+            res[i] = min(5, res[i] + 1)
+
+    def altern(self, neu):
+        """Stufe Altern: älter werden, erwachsen werden, sterben"""
+        if neu.status > 0:
+            if random.random() < 0.8:
+                neu.alter += 1
+            if neu.alter > 19:
+                neu.status = 0  # Tod
+            elif neu.alter >= 3 and neu.status == 1:
+                neu.status = 2  # Erwachsen werden
+
+    def isolation_umzingelung(self, neu, nachbarn, i):
+        """Isolationstod, wenn alle Nachbarn einer anderen Kultur angehören"""
+        kultur = neu.kultur
+        for p in nachbarn:
+            if p.kultur == kultur:
+                return False
+        return True
+
+    def isolation_toleranz(self, neu, nachbarn, i):
+        """Isolationstod mit Wahrscheinlichkeit Isolationsgrad × (1 - Toleranz)"""
+        if neu.status <= 0 or neu.kultur <= 0:
+            return False
+
+        fremde_nachbarn = 0
+        for nb in nachbarn:
+            if nb.status > 0 and nb.kultur > 0:
+                if not self.kulturelle_naehe(neu, nb):
+                    fremde_nachbarn += 1
+
+        isolationsgrad = fremde_nachbarn / len(nachbarn)
+        toleranz = self.kultur_toleranz[neu.kultur]
+        sterbewahrscheinlichkeit = isolationsgrad * (1 - toleranz)
+
+        return random.random() < sterbewahrscheinlichkeit
+
+    def check_isolation(self, primat, x, y):
+        """Prüft kulturelle Isolation unter Berücksichtigung der Toleranz"""
+        nachbarn = self.nachbarn(x, y)
+        nachbarn += [LEER] * (self.topologie.k - len(nachbarn))
+        return self.isolation_toleranz(primat, nachbarn, y * self.breite + x)
+
+    def geburt_mutter(self, nachbarn):
+        """Geburt: zufällige erwachsene Nachbarin wird Mutter, falls auch ein Männchen da ist.
+        Gibt (Mutter, None) oder None zurück."""
+        anzahl_weibchen = 0
+        maennchen = False
+        for p in nachbarn:
+            if p.status == 2:
+                if p.geschlecht == 1:
+                    anzahl_weibchen += 1
+                elif p.geschlecht == 2:
+                    maennchen = True
+
+        if anzahl_weibchen and maennchen and random.random() < 0.25:
+            # Entspricht random.choice() über die Liste der Weibchen
+            wahl = random.randrange(anzahl_weibchen)
+            for p in nachbarn:
+                if p.status == 2 and p.geschlecht == 1:
+                    if wahl == 0:
+                        return p, None
+                    wahl -= 1
+        return None
+
+    def geburt_partnerwahl(self, nachbarn):
+        """Geburt mit weiblicher Partnerwahl nach Macht und kultureller Nähe.
+        Gibt (Mutter, Vater) oder None zurück."""
+        weibchen = False
+        maennchen = False
+        for p in nachbarn:
+            if p.status == 2:
+                if p.geschlecht == 1:
+                    weibchen = True
+                elif p.geschlecht == 2:
+                    maennchen = True
+
+        if weibchen and maennchen and random.random() < 0.25:
+            # Finde bestes Paar basierend auf Macht und kultureller Nähe
+            beste_mutter = None
+            bester_vater = None
+            bester_score = -1
+
+            for w in nachbarn:
+                if w.status != 2 or w.geschlecht != 1:
+                    continue
+                for m in nachbarn:
+                    if m.status != 2 or m.geschlecht != 2:
+                        continue
+                    affinitaet = self.kulturelle_naehe(w, m)
+                    score = 0.8 * m.macht + 0.2 * affinitaet * 9
+                    if score > bester_score:
+                        bester_score = score
+                        beste_mutter, bester_vater = w, m
+
+            if beste_mutter is not None:
+                return beste_mutter, bester_vater
+        return None
+
+    def _einflussreichster(self, nachbarn, macht, nur_maennchen):
+        """Erster Nachbar mit maximaler Macht unter den erwachsenen Stärkeren (oder None)"""
+        bester = None
+        for p in nachbarn:
+            if p.status == 2 and p.macht > macht and (not nur_maennchen or p.geschlecht == 2):
+                if bester is None or p.macht > bester.macht:
+                    bester = p
+        return bester
+
+    def beeinflussung_direkt(self, neu, nachbarn, i):
+        """Kulturelle Beeinflussung: der mächtigste stärkere Nachbar überträgt seine Kultur"""
+        einflussreichster = self._einflussreichster(nachbarn, neu.macht, False)
+        if einflussreichster is not None:
+            if random.random() < 0.3:
+                neu.kultur = einflussreichster.kultur
+                neu.macht = max(0, neu.macht - 1)
+        else:
+            neu.macht = min(9, neu.macht + 0.1)
+
+    def beeinflussung_puffer(self, neu, nachbarn, i):
+        """Beeinflussung nur unter Männchen, mit Macht-Puffer und Ressourcen-Bonus"""
+        if neu.geschlecht != 2:
+            return
+        res_bonus = self._ressourcen_umgebung(i) / 10.0
+
+        einflussreichster = self._einflussreichster(nachbarn, neu.macht, True)
+
+        if einflussreichster is not None:
+            # Macht-Puffer - nur bei großem Unterschied
+            if einflussreichster.macht > neu.macht + 3 and random.random() < 0.3:
+                neu.kultur = einflussreichster.kultur
+                neu.kultur2 = einflussreichster.kultur2
+                neu.macht = max(1, neu.macht - 1)
+        else:
+            # Machtgewinn durch Ressourcen
+            neu.macht = min(9, neu.macht + 0.1 + res_bonus * 0.2)
+
+    # --------------------------------------------------------------------------
+
+    def _zellschritt(self, neu, nachbarn, i):
+        """Wendet alle aktiven Stufen auf `neu` (Kopie des Zustands von Zelle i) an.
+        Gibt False zurück, wenn die Zelle danach leer ist."""
+        regeln = self.regeln
+        if regeln['ressourcen']:
+            self.verbrauche_ressourcen(neu, i)
+
+        if regeln['altern']:
+            self.altern(neu)
+
+        # Isolationstod
+        if neu.status > 0 and self._isolation and self._isolation(neu, nachbarn, i):
+            return False
+
+        # Geburt neuer Primaten und spontane Entstehung (Migration)
+        if neu.status == 0:
+            if self._geburt:
+                eltern = self._geburt(nachbarn)
+                if eltern is not None:
+                    self.kind_erzeugen(eltern[0], eltern[1], neu)
+                    if self.genealogie is not None:
+                        self._geburt_eintragen(neu, eltern[0], eltern[1], i, self.tick_index + 1)
+                    return True
+
+            migration = regeln['migration']
+            if migration and random.random() < migration:
+                self.zufalls_primat(neu)
+                if self.genealogie is not None:
+                    self._geburt_eintragen(neu, None, None, i, self.tick_index + 1)
+                return True
+
+            # Leer geblieben (verstorbene Primaten behalten ihre Kultur bis zur Neubesiedlung)
+            return neu.alter > 0
+
+        # Kulturelle Beeinflussung
+        if neu.status == 2 and self._beeinflussung:
+            self._beeinflussung(neu, nachbarn, i)
+
+        return True
+
+    def _tick_beginnen(self):
+        """Stellt Zellen- und Ressourcenlisten (je mit leerer Zelle N am Ende) bereit"""
+        zellen = self.raum.ravel().tolist()
+        zellen.append(LEER)
+        self._res = self.ressourcen.ravel().tolist()
+        self._res.append(0)
+        self._index_zeilen = self.topologie.index.tolist() if self.regeln['ressourcen'] else None
+        return zellen
+
+    def _tick_beenden(self):
+        """Überträgt die während des Ticks geänderten Ressourcen zurück"""
+        if self.regeln['ressourcen']:
+            self.ressourcen.ravel()[:] = self._res[:-1]
+        self._res = None
+        self._index_zeilen = None
+
+    def neue_generation(self, x, y):
+        """Berechnet den neuen Zustand für eine Position (neue Instanz oder LEER).
+        Eine Vorschau: Geburten werden nicht ins Geburtsregister eingetragen."""
+        i = y * self.breite + x
+        zellen = self._tick_beginnen()
+        neu = Primat()
+        neu.uebernehme(zellen[i])
+        genealogie, self.genealogie = self.genealogie, None
+        try:
+            lebt = self._zellschritt(neu, self._greifer[i](zellen), i)
+        finally:
+            self.genealogie = genealogie
+        self._tick_beenden()
+        return neu if lebt else LEER
+
+    def tick(self):
+        """Führt einen Simulationsschritt durch; schreibt in das hintere Gitter und tauscht"""
+        zellen = self._tick_beginnen()
+        ziele = self._puffer.ravel().tolist()
+        frei = self._frei
+        greifer = self._greifer
+        schritt = self._zellschritt
+
+        for i in range(len(ziele)):
+            ziel = ziele[i]
+            if ziel is LEER:
+                ziel = frei.pop() if frei else Primat()
+            ziel.uebernehme(zellen[i])
+            if schritt(ziel, greifer[i](zellen), i):
+                ziele[i] = ziel
+            else:
+                frei.append(ziel)
+                ziele[i] = LEER
+
+        self._puffer.ravel()[:] = ziele
+        self._tick_beenden()
+        self.raum, self._puffer = self._puffer, self.raum
+        self.tick_index += 1
+        return self.berechne_statistik()
+
+    def _engine_speicherbedarf(self):
+        n, k = self.topologie.anzahl, self.topologie.k
+        primat = sys.getsizeof(Primat()) + sys.getsizeof(0.5)  # Instanz und ihre Macht als float
+        lebend = sum(1 for p in self.raum.ravel().tolist() if p is not LEER)
+        puffer = sum(1 for p in self._puffer.ravel().tolist() if p is not LEER) + len(self._frei)
+        # Indexlisten: Liste, Zeiger und int-Objekte (> 256, nicht zwischengespeichert) je Nachbar
+        liste = sys.getsizeof([]) + k * (8 + sys.getsizeof(1000))
+        bedarf = {
+            'raum': self.raum.nbytes + lebend * primat,
+            'neuer_raum': self._puffer.nbytes + puffer * primat + sys.getsizeof(self._frei),
+            'nachbarn': sys.getsizeof(self._greifer) + n * (sys.getsizeof(self._greifer[0]) + liste),
+            # Zellen-, Ziel- und Ressourcenliste, bei Ressourcen dazu die Indexlisten
+            'tick': 3 * 8 * (n + 1) + (n * (8 + liste) if self.regeln['ressourcen'] else 0),
+        }
+        return bedarf
+
+    def zustand_arrays(self):
+        """Liefert den Zustand aller Zellen als NumPy-Arrays (für Rendering und Export)"""
+        form = (self.hoehe, self.breite)
+        status = np.zeros(form, dtype=np.int8)
+        alter = np.zeros(form, dtype=np.int16)
+        geschlecht = np.zeros(form, dtype=np.int8)
+        kultur = np.zeros(form, dtype=np.int16)
+        kultur2 = np.zeros(form, dtype=np.int16)
+        macht = np.zeros(form, dtype=np.float64)
+
+        for y, zeile in enumerate(self.raum.tolist()):
+            for x, p in enumerate(zeile):
+                if p is LEER:
+                    continue
+                status[y, x] = p.status
+                alter[y, x] = p.alter
+                geschlecht[y, x] = p.geschlecht
+                kultur[y, x] = p.kultur
+                kultur2[y, x] = p.kultur2
+                macht[y, x] = p.macht
+
+        zustand = {'status': status, 'alter': alter, 'geschlecht': geschlecht,
+                   'kultur': kultur, 'kultur2': kultur2, 'macht': macht}
+        if self.genealogie is not None:
+            zustand['kennung'] = np.array([p.kennung for p in self.raum.ravel().tolist()],
+                                          dtype=np.int64).reshape(form)
+        if self.regeln['ressourcen']:
+            zustand['ressourcen'] = self.ressourcen
+        return zustand
+
+    def kultur_zaehlung(self):
+        """Zählt lebende Primaten je Kultur (bei Hybridisierung auch die Sekundärkultur)"""
+        kultur_zaehler = [0] * (self.anzahl_kulturen + 1)
+        gesamt_population = 0
+        hybrid = self.regeln['hybrid']
+
+        for zeile in self.raum.tolist():
+            for p in zeile:
+                if p.status > 0 and p.kultur > 0:
+                    kultur_zaehler[p.kultur] += 1
+                    gesamt_population += 1
+                    if hybrid and p.kultur2 > 0 and p.kultur2 != p.kultur:
+                        kultur_zaehler[p.kultur2] += 1
+
+        kultur_zaehler = np.array(kultur_zaehler)
+        kulturen = np.flatnonzero(kultur_zaehler)
+        return kulturen, kultur_zaehler[kulturen], gesamt_population
+
+    def demografie(self):
+        """Sammelt die lebenden Primaten in Arrays und zählt sie wie die Feld-Engine"""
+        lebend = [p for zeile in self.raum.tolist() for p in zeile if p.status > 0 and p.kultur > 0]
+        werte = np.array([(p.kultur, p.kultur2, p.alter, p.macht, p.geschlecht) for p in lebend],
+                         dtype=np.float64).reshape(-1, 5)
+        kultur, kultur2, alter, geschlecht = werte[:, [0, 1, 2, 4]].astype(np.int64).T
+        return demografie_zaehlung(kultur, kultur2, alter, werte[:, 3], geschlecht, self.anzahl_kulturen)
+
+
+class FeldSimulation(SimulationsBasis):
+    """Schnelle Engine: Zustand als Arrays, alle aktiven Stufen in einem vektorisierten Durchlauf.
+
+    Die Regeln entsprechen PrimatenSimulation; Zufallszahlen werden jedoch feldweise gezogen,
+    daher stimmen Läufe nur statistisch, nicht Zelle für Zelle mit der Referenz überein.
+    Die Ressourcen-Ebene wird vor den übrigen Stufen für das ganze Feld aktualisiert
+    (die Referenz aktualisiert sie Zelle für Zelle während des Durchlaufs).
+
+    Die Zustandsfelder sind flach und haben N+1 Einträge; der letzte ist die dauerhaft
+    leere Zelle, auf die fehlende Nachbarn der Topologie verweisen.
+
+    Kachelbetrieb (`threads` oder `kachel_groesse` gesetzt): Der Tick wird in zusammenhängende
+    Zellbereiche zerlegt, die Nachbarn (den Halo) aus dem unveränderten Zustand vor dem Tick
+    lesen und nur ihren eigenen Ausschnitt der neuen Felder schreiben. Jede Kachel zieht ihre
+    Zufallszahlen aus einem eigenen Generator zu (Seed, Tick, Kachel); das Ergebnis hängt
+    daher nicht von der Zahl der Threads ab – threads=1 rechnet dieselben Kacheln seriell.
+
+    backend='numba' rechnet den Tick mit dem kompilierten Zellkern aus primaten_jit, der die
+    Regeln exakt wie neue_generation() anwendet (auch die laufende Ressourcen-Aktualisierung).
+    Ohne installiertes Numba bleibt es beim NumPy-Durchlauf; `self.backend` nennt den
+    tatsächlich verwendeten Kern. Der Kernel läuft seriell, Kachelbetrieb entfällt dann.
+    Mit Geburtsregister rechnet die Engine immer mit NumPy, da der Kernel keine Eltern meldet.
+
+    Mit `genealogie` hält `kennung` (ebenfalls N+1 Einträge) die Kennung jedes Primaten.
+    """
+
+    BACKENDS = ('numpy', 'numba')
+
+    # Zellen pro Kachel: Zustand und Nachbarstapel einer Kachel passen in den L2-Cache
+    KACHEL_GROESSE = 16384
+
+    # Zwischenergebnisse eines Ticks je Zelle und Nachbar (Nachbarstapel, Masken, Zufallszahlen;
+    # mit tracemalloc gemessen, Variante 'opt' mit Sekundärkultur)
+    TICK_BYTES_PRO_NACHBAR = 48
+
+    # Datentypen der Zustandsfelder
+    TYPEN = {'status': np.int8, 'alter': np.int16, 'geschlecht': np.int8,
+             'kultur': np.int16, 'kultur2': np.int16, 'macht': np.float64}
+
+    def __init__(self, breite=60, hoehe=60, initial_dichte=0.1, variante='basis', regeln=None,
+                 seed=None, topologie=None, threads=None, kachel_groesse=None, backend='numpy',
+                 anzahl_kulturen=9, toleranz_beta=(2.0, 2.0), genealogie=None, muster=None):
+        if backend not in self.BACKENDS:
+            raise ValueError(f"Unbekanntes Backend: {backend}")
+        kernel = backend == 'numba' and primaten_jit.NUMBA_VERFUEGBAR and genealogie is None
+        self.backend = 'numba' if kernel else 'numpy'
+        self.rng = np.random.default_rng(seed)
+        self._saat = np.random.SeedSequence(seed)
+        self.threads = threads
+        self.kachel_groesse = kachel_groesse
+        self._pool = None
+        super().__init__(breite, hoehe, initial_dichte, variante, regeln, topologie,
+                         anzahl_kulturen, toleranz_beta, genealogie, muster)
+
+    def initialisiere_raum(self, dichte=0.1):
+        """Initialisiert alle Zustandsfelder vektorisiert aus dem Zufallsgenerator"""
+        self.setze_anfangszustand(zufallsmuster(self.topologie.form, dichte, self.anzahl_kulturen,
+                                                self.regeln['hybrid'], seed=self.rng))
+
+    def _felder_uebernehmen(self, felder):
+        """Übernimmt die Felder, dazu die leere Zelle N am Ende"""
+        n = self.topologie.anzahl
+        for name in FELDER:
+            setattr(self, name, np.append(felder[name], 0).astype(self.TYPEN[name]))
+
+        self.kennung = None
+        if self.genealogie is not None:
+            self.kennung = np.zeros(n + 1, dtype=np.int64)
+            gruender = np.flatnonzero(self.status[:n] > 0)
+            keine = np.full(len(gruender), n)
+            self.kennung[gruender] = self._neue_kennungen(gruender, keine, keine, 0)
+
+    def _zellen_setzen(self, zellen, felder):
+        """Schreibt die Zellen in die Zustandsfelder (Kennungen wie bei Migranten)"""
+        for name in FELDER:
+            feld = getattr(self, name).copy()
+            feld[zellen] = felder[name]
+            setattr(self, name, feld)
+        if self.kennung is not None:
+            keine = np.full(len(zellen), self.topologie.anzahl)
+            self.kennung = self.kennung.copy()
+            self.kennung[zellen] = self._neue_kennungen(zellen, keine, keine, self.tick_index)
+
+    def neu_saeen(self, seed):
+        """Neuer Generator und neue Saat für die Kacheln"""
+        self.rng = np.random.default_rng(seed)
+        self._saat = np.random.SeedSequence(seed)
+
+    def nach_verzweigung(self):
+        """Der Thread-Pool des Elternprozesses existiert im Kindprozess nicht"""
+        super().nach_verzweigung()
+        self.kennung = None
+        self._pool = None
+
+    def initialisiere_ressourcen(self):
+        """Initialisiert die Ressourcen-Ebene"""
+        self.ressourcen = self.rng.integers(0, 6, self.topologie.form)
+
+    def ziehe_toleranzen(self, anzahl, a, b):
+        """Zieht `anzahl` Toleranzwerte aus einer Beta(a, b)-Verteilung"""
+        return self.rng.beta(a, b, anzahl).tolist()
+
+    def _zufalls_felder(self, maske, rng):
+        """Zufällige Eigenschaften für neue Primaten an allen Stellen der Maske"""
+        n = int(maske.sum())
+        geschlecht = np.where(rng.random(n) < 0.5, 1, 2)
+        kultur = rng.integers(1, self.anzahl_kulturen + 1, n)
+        kultur2 = rng.integers(1, self.anzahl_kulturen + 1, n) if self.regeln['hybrid'] else 0
+        macht = rng.integers(1, 10, n)
+        return geschlecht, kultur, kultur2, macht
+
+    def _engine_speicherbedarf(self):
+        zustand = sum(getattr(self, name).nbytes for name in FELDER)
+        if self.kennung is not None:
+            zustand += self.kennung.nbytes
+        tick = 0
+        if self.backend != 'numba':
+            kacheln = self.kacheln()
+            groesste = max(b - a for a, b in kacheln)
+            gleichzeitig = min(len(kacheln), self.threads or 1)
+            tick = gleichzeitig * groesste * self.topologie.k * self.TICK_BYTES_PRO_NACHBAR
+        # Der neue Zustand wird je Tick angelegt, der alte danach freigegeben
+        return {'raum': zustand, 'neuer_raum': zustand, 'tick': tick}
+
+    def kacheln(self):
+        """Zellbereiche (a, b) des Kachelbetriebs (ohne Kachelbetrieb: das ganze Feld)"""
+        n = self.topologie.anzahl
+        if self.threads is None and self.kachel_groesse is None:
+            return [(0, n)]
+        groesse = self.kachel_groesse or self.KACHEL_GROESSE
+        return [(a, min(a + groesse, n)) for a in range(0, n, groesse)]
+
+    def _kachel_rngs(self, anzahl):
+        """Unabhängige Generatoren je Kachel, abgeleitet aus (Seed, Tick, Kachel)"""
+        if self.threads is None and self.kachel_groesse is None:
+            return [self.rng]
+        return [np.random.default_rng(np.random.SeedSequence(
+                    self._saat.entropy, spawn_key=(self.tick_index, nr)))
+                for nr in range(anzahl)]
+
+    def _verteile(self, arbeit, auftraege):
+        """Führt arbeit(*auftrag) für alle Kacheln aus – seriell oder im Thread-Pool.
+        Gibt die Ergebnisse in der Reihenfolge der Kacheln zurück."""
+        if not self.threads or self.threads <= 1 or len(auftraege) == 1:
+            return [arbeit(*auftrag) for auftrag in auftraege]
+        if self._pool is None:
+            self._pool = ThreadPoolExecutor(self.threads, thread_name_prefix='primaten-kachel')
+        # list() wartet auf alle Kacheln und reicht Ausnahmen weiter
+        return list(self._pool.map(lambda auftrag: arbeit(*auftrag), auftraege))
+
+    def schliessen(self):
+        """Beendet den Thread-Pool des Kachelbetriebs (wird bei Bedarf neu gestartet)"""
+        super().schliessen()
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+
+    def tick(self):
+        """Führt einen Simulationsschritt für das ganze Feld durch"""
+        if self.backend == 'numba':
+            return self._tick_kernel()
+        n = self.topologie.anzahl
+        alt = (self.status, self.alter, self.geschlecht, self.kultur, self.kultur2, self.macht)
+        neu = tuple(np.empty_like(feld) for feld in alt)
+        for feld in neu:
+            feld[n] = 0  # die leere Zelle bleibt leer
+        kacheln = self.kacheln()
+
+        # Stufe Ressourcen zuerst für alle Kacheln: der Macht-Bonus liest die neuen Werte der Nachbarn
+        res = None
+        if self.regeln['ressourcen']:
+            res = np.zeros(n + 1, dtype=self.ressourcen.dtype)
+            alt_res = self.ressourcen.ravel()
+            self._verteile(lambda a, b: self._ressourcen_schritt(a, b, alt_res, res), kacheln)
+            self.ressourcen = res[:n].reshape(self.topologie.form)
+        elif self.regeln['beeinflussung'] == 'puffer':
+            res = np.append(self.ressourcen.ravel(), 0)
+
+        rngs = self._kachel_rngs(len(kacheln))
+        neue = self._verteile(lambda a, b, rng: self._kachel_schritt(a, b, rng, alt, neu, res),
+                              [(a, b, rng) for (a, b), rng in zip(kacheln, rngs)])
+
+        self.status, self.alter, self.geschlecht, self.kultur, self.kultur2, self.macht = neu
+        self.tick_index += 1
+        if self.genealogie is not None:
+            self._kennungen_fortschreiben(neue)
+        return self.berechne_statistik()
+
+    def _neue_kennungen(self, zellen, mutter, vater, tick):
+        """Vergibt Kennungen an die neuen Primaten in `zellen` (aufsteigend) und trägt sie ein;
+        `mutter` und `vater` sind Zellindizes der Eltern im Zustand vor dem Tick (N = keine)"""
+        erste = self._kennungen_vergeben(len(zellen))
+        kennungen = np.arange(erste, erste + len(zellen), dtype=np.int64)
+        eltern = self.kennung
+        self.genealogie.eintragen(kennungen, eltern[mutter], eltern[vater], tick, zellen,
+                                  self.kultur[zellen])
+        return kennungen
+
+    def _kennungen_fortschreiben(self, neue):
+        """Überträgt die Kennungen auf den neuen Zustand: von der Isolation geleerte Zellen
+        verlieren ihre Kennung, Geburten und Migranten der Kacheln erhalten neue"""
+        kennung = np.where((self.status == 0) & (self.alter == 0), 0, self.kennung)
+        zellen, mutter, vater = (np.concatenate(teile) for teile in zip(*neue))
+        kennung[zellen] = self._neue_kennungen(zellen, mutter, vater, self.tick_index)
+        self.kennung = kennung
+
+    def _tick_kernel(self):
+        """Simulationsschritt mit dem kompilierten Zellkern (Zelle für Zelle wie die Referenz)"""
+        n = self.topologie.anzahl
+        alt = (self.status, self.alter, self.geschlecht, self.kultur, self.kultur2, self.macht)
+        neu = tuple(np.empty_like(feld) for feld in alt)
+        for feld in neu:
+            feld[n] = 0
+        res = np.append(self.ressourcen.ravel(), 0).astype(np.int64)
+        toleranz = np.array([1.0] + self.kultur_toleranz[1:])
+
+        # Pro Tick aus dem eigenen Generator neu gesetzt: reproduzierbar auch bei mehreren Simulationen
+        primaten_jit.setze_seed(int(self.rng.integers(2**31)))
+        primaten_jit.generation(*alt, res, self.topologie.index, toleranz, self.anzahl_kulturen,
+                                *primaten_jit.regel_codes(self.regeln), *neu)
+
+        if self.regeln['ressourcen']:
+            self.ressourcen = res[:n].reshape(self.topologie.form)
+        self.status, self.alter, self.geschlecht, self.kultur, self.kultur2, self.macht = neu
+        self.tick_index += 1
+        return self.berechne_statistik()
+
+    def _ressourcen_schritt(self, a, b, alt_res, res):
+        """Stufe Ressourcen für die Zellen a..b-1: Verbrauch durch Bewohner, sonst Regeneration"""
+        r = alt_res[a:b]
+        res[a:b] = np.where((self.status[a:b] > 0) & (r > 0), r - 1, np.minimum(5, r + 1))
+
+    def _kachel_schritt(self, a, b, rng, alt, neu, res):
+        """Alle übrigen Stufen für die Zellen a..b-1; liest `alt` (samt Halo), schreibt nur neu[a:b]"""
+        r = self.regeln
+        n, kn = b - a, self.topologie.k
+        index_t = self.topologie.index_t[:, a:b]
+        status, alter, geschlecht, kultur, kultur2, macht = alt
+
+        # Nachbarwerte aus dem Zustand vor dem Tick (einmal für alle Stufen)
+        ns = status[index_t]
+        ng = geschlecht[index_t]
+        nk = kultur[index_t]
+        nm = macht[index_t]
+        braucht_k2 = (r['hybrid'] or r['isolation'] == 'toleranz' or
+                      r['geburt'] == 'partnerwahl' or r['beeinflussung'] == 'puffer')
+        nk2 = kultur2[index_t] if braucht_k2 else None
+
+        s, a_alt, g, k, k2, m = (feld[a:b] for feld in alt)
+        s_neu, a_neu, g_neu, k_neu, k2_neu, m_neu = (feld[a:b] for feld in neu)
+        for ziel, quelle in zip((s_neu, a_neu, g_neu, k_neu, k2_neu, m_neu), (s, a_alt, g, k, k2, m)):
+            ziel[:] = quelle
+
+        # Stufe Altern
+        if r['altern']:
+            lebend = s > 0
+            a_neu += (lebend & (rng.random(n) < 0.8))
+            tot = lebend & (a_neu > 19)
+            s_neu[tot] = 0
+            s_neu[lebend & ~tot & (a_neu >= 3) & (s == 1)] = 2
+
+        # Stufe Isolation
+        if r['isolation'] == 'umzingelung':
+            isoliert = (s_neu > 0) & (nk != k).all(axis=0)
+        elif r['isolation'] == 'toleranz':
+            gueltig = (ns > 0) & (nk > 0)
+            naehe = (nk == k) | (nk == k2) | (nk2 == k) | (nk2 == k2)
+            fremde = (gueltig & ~naehe).sum(axis=0)
+            toleranz = np.array([1.0] + self.kultur_toleranz[1:])
+            p_tod = fremde / kn * (1 - toleranz[k])
+            isoliert = (s_neu > 0) & (k > 0) & (rng.random(n) < p_tod)
+        else:
+            isoliert = np.zeros(n, dtype=bool)
+        if isoliert.any():
+            for feld in (s_neu, a_neu, g_neu, k_neu, k2_neu, m_neu):
+                feld[isoliert] = 0
+
+        # Stufe Geburt; am Isolationstod gestorbene Zellen bleiben in diesem Tick leer
+        leer = (s_neu == 0) & ~isoliert
+        geboren = np.zeros(n, dtype=bool)
+        if r['geburt']:
+            erwachsen = ns == 2
+            weib = erwachsen & (ng == 1)
+            maen = erwachsen & (ng == 2)
+            geboren = leer & weib.any(axis=0) & maen.any(axis=0) & (rng.random(n) < 0.25)
+            zellen = np.flatnonzero(geboren)
+            if len(zellen):
+                w = weib[:, zellen]
+                if r['geburt'] == 'mutter':
+                    # Zufällige Mutter unter den erwachsenen Nachbarinnen
+                    mutter = np.argmax(np.where(w, rng.random(w.shape), -1.0), axis=0)
+                    vater = None
+                else:
+                    # Bestes Paar (erstes Maximum in Reihenfolge Weibchen, dann Männchen)
+                    mm = maen[:, zellen]
+                    zk = nk[:, zellen]
+                    zk2 = nk2[:, zellen]
+                    zm = nm[:, zellen]
+                    affinitaet = ((zk[:, None] == zk[None, :]) | (zk[:, None] == zk2[None, :]) |
+                                  (zk2[:, None] == zk[None, :]) | (zk2[:, None] == zk2[None, :]))
+                    score = 0.8 * zm[None, :] + 0.2 * affinitaet * 9
+                    score = np.where(w[:, None] & mm[None, :], score, -np.inf)
+                    paar = np.argmax(score.reshape(kn * kn, -1), axis=0)
+                    mutter, vater = paar // kn, paar % kn
+                if self.genealogie is not None:
+                    eltern_zellen = index_t[mutter, zellen]
+                    vater_zellen = (np.full(len(zellen), self.topologie.anzahl) if vater is None
+                                    else index_t[vater, zellen])
+                g_neu[zellen] = np.where(rng.random(len(zellen)) < 0.5, 1, 2)
+                s_neu[zellen] = 1
+                a_neu[zellen] = 0
+                k_neu[zellen] = nk[mutter, zellen]
+                if vater is None:
+                    m_neu[zellen] = nm[mutter, zellen]
+                    k2_neu[zellen] = 0
+                else:
+                    m_neu[zellen] = nm[vater, zellen]
+                    k2_neu[zellen] = nk[vater, zellen]
+
+        # Stufe Migration
+        if r['migration']:
+            migriert = leer & ~geboren & (rng.random(n) < r['migration'])
+            if migriert.any():
+                neu_g, neu_k, neu_k2, neu_m = self._zufalls_felder(migriert, rng)
+                s_neu[migriert] = 1
+                a_neu[migriert] = 0
+                g_neu[migriert] = neu_g
+                k_neu[migriert] = neu_k
+                k2_neu[migriert] = neu_k2
+                m_neu[migriert] = neu_m
+
+        # Stufe Beeinflussung (Nachbarn und eigene Macht aus dem Zustand vor dem Tick)
+        if r['beeinflussung']:
+            aktiv = (s_neu == 2) & ~isoliert
+            staerker = (ns == 2) & (nm > m)
+            if r['beeinflussung'] == 'puffer':
+                aktiv &= g == 2
+                staerker &= ng == 2
+            hat_staerkere = staerker.any(axis=0)
+            idx = np.argmax(np.where(staerker, nm, -np.inf), axis=0)
+            spalten = np.arange(n)
+            st_m = nm[idx, spalten]
+            wurf = rng.random(n) < 0.3
+
+            if r['beeinflussung'] == 'puffer':
+                uebernahme = aktiv & hat_staerkere & (st_m > m + 3) & wurf
+                k2_neu[uebernahme] = nk2[idx, spalten][uebernahme]
+                m_neu[uebernahme] = np.maximum(1, m[uebernahme] - 1)
+                summe = res[a:b] + res[index_t].sum(axis=0)
+                bonus = np.minimum(10, summe // 5) / 10.0
+                wachstum = aktiv & ~hat_staerkere
+                m_neu[wachstum] = np.minimum(9, m[wachstum] + 0.1 + bonus[wachstum] * 0.2)
+            else:
+                uebernahme = aktiv & hat_staerkere & wurf
+                m_neu[uebernahme] = np.maximum(0, m[uebernahme] - 1)
+                wachstum = aktiv & ~hat_staerkere
+                m_neu[wachstum] = np.minimum(9, m[wachstum] + 0.1)
+            k_neu[uebernahme] = nk[idx, spalten][uebernahme]
+
+        if self.genealogie is not None:
+            # Neue Primaten der Kachel als (Zelle, Mutterzelle, Vaterzelle), nach Zellen sortiert
+            leer_n = self.topologie.anzahl
+            geboren_zellen = np.flatnonzero(geboren)
+            migriert_zellen = np.flatnonzero(migriert) if r['migration'] else geboren_zellen[:0]
+            keine = np.full(len(migriert_zellen), leer_n)
+            if not len(geboren_zellen):
+                eltern_zellen = vater_zellen = geboren_zellen
+            zellen = np.concatenate([geboren_zellen, migriert_zellen])
+            reihenfolge = np.argsort(zellen, kind='stable')
+            return (zellen[reihenfolge] + a, np.concatenate([eltern_zellen, keine])[reihenfolge],
+                    np.concatenate([vater_zellen, keine])[reihenfolge])
+
+    def zustand_arrays(self):
+        """Liefert die Zustandsfelder als Ansichten in der Form der Topologie (ohne Kopie)"""
+        n, form = self.topologie.anzahl, self.topologie.form
+        zustand = {name: getattr(self, name)[:n].reshape(form)
+                   for name in ('status', 'alter', 'geschlecht', 'kultur', 'kultur2', 'macht')}
+        if self.genealogie is not None:
+            zustand['kennung'] = self.kennung[:n].reshape(form)
+        if self.regeln['ressourcen']:
+            zustand['ressourcen'] = self.ressourcen
+        return zustand
+
+    def kultur_zaehlung(self):
+        """Zählt lebende Primaten je Kultur mit einem bincount-Durchlauf"""
+        lebend = (self.status > 0) & (self.kultur > 0)   # die leere Zelle N zählt nie mit
+        kulturen = self.kultur[lebend]
+        zaehler = np.bincount(kulturen, minlength=self.anzahl_kulturen + 1)
+        if self.regeln['hybrid']:
+            k2 = self.kultur2[lebend]
+            zaehler += np.bincount(k2[(k2 > 0) & (k2 != kulturen)], minlength=self.anzahl_kulturen + 1)
+        vorhanden = np.flatnonzero(zaehler)
+        return vorhanden, zaehler[vorhanden], int(lebend.sum())
+
+    def demografie(self):
+        """Hybridisierungspaare und Histogramme mit je einem bincount-Durchlauf"""
+        lebend = np.flatnonzero((self.status > 0) & (self.kultur > 0))
+        return demografie_zaehlung(self.kultur[lebend], self.kultur2[lebend], self.alter[lebend],
+                                   self.macht[lebend], self.geschlecht[lebend], self.anzahl_kulturen)
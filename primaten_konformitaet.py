@@ -0,0 +1,413 @@
+#!/usr/bin/env python3
+"""
+Primaten – Statistische Konformität der Engines
+Schnellere Engines ziehen ihre Zufallszahlen anders als die Referenz (Objekt-Engine mit
+`random`, Zelle für Zelle), gleiche Läufe lassen sich daher nicht erwarten. Geprüft wird
+stattdessen, ob das Modellverhalten gleich verteilt ist: Referenz und Kandidat rechnen viele
+Läufe aus denselben Anfangszuständen (je Seed ein Zufallsmuster, dieselbe Toleranztabelle),
+verglichen werden die Verteilungen über die Läufe mit Zwei-Stichproben-Tests:
+
+- Populationskurve an Stützstellen und mittlere Population (Kolmogorov-Smirnov),
+- Kulturanteile: Anteil der dominanten Kultur und Zahl der Kulturen an den Stützstellen,
+  Endanteil jeder Kultur (KS bzw. Mann-Whitney für Zählwerte),
+- Zeit bis zur Monokultur, zensiert am Laufende (Log-Rank-Test),
+- Raten der Ereignisse Aussterben, Wiederkehr und Monokultur je Tick (bedingter
+  Poisson-Test).
+
+Seltene Abweichungen einzelner Stufen gehen in ganzen Läufen leicht unter. Dazu kommen daher
+Prüfungen einzelner Stufen auf gebauten Nachbarschaften (STUFEN_SZENARIEN): ein Tick je Seed,
+verglichen wird, wie oft die Mittelzelle danach belegt ist und welche Kultur sie trägt
+(Test auf gleiche Anteile).
+
+Die p-Werte werden nach Holm für die Zahl der Tests korrigiert; die Prüfung gilt als
+bestanden, wenn kein korrigierter p-Wert unter `alpha` liegt. Alle Tests sind ohne SciPy
+implementiert (asymptotische p-Werte, ab etwa 20 Läufen je Engine brauchbar).
+"""
+
+import argparse
+import math
+import sys
+from multiprocessing import Pool
+
+import numpy as np
+
+from primaten_kern import STANDARD_TOLERANZ, VARIANTEN
+from primaten_lauf import erzeuge_simulation
+from primaten_muster import FELDER, zufallsmuster
+from primaten_topologie import MOORE_VERSATZ
+
+EREIGNISSE = ('aussterben', 'wiederkehr', 'monokultur')
+
+# Parameter von erzeuge_simulation, die eine Engine-Beschreibung setzen darf
+ENGINE_PARAMETER = ('engine', 'threads', 'backend')
+
+
+# --- Zwei-Stichproben-Tests ---
+
+def _kolmogorov_q(x):
+    """Q_KS(x) = 2 Σ (-1)^(j-1) exp(-2 j² x²)"""
+    if x < 0.2:
+        return 1.0
+    summe = 0.0
+    for j in range(1, 101):
+        glied = 2 * (-1) ** (j - 1) * math.exp(-2 * j * j * x * x)
+        summe += glied
+        if abs(glied) < 1e-12:
+            break
+    return min(1.0, max(0.0, summe))
+
+
+def ks_test(a, b):
+    """Kolmogorov-Smirnov: (D, p) mit asymptotischem p-Wert (Stephens-Korrektur)"""
+    a, b = np.sort(np.asarray(a, dtype=np.float64)), np.sort(np.asarray(b, dtype=np.float64))
+    n, m = len(a), len(b)
+    werte = np.concatenate([a, b])
+    d = float(np.max(np.abs(np.searchsorted(a, werte, side='right') / n -
+                            np.searchsorted(b, werte, side='right') / m)))
+    en = math.sqrt(n * m / (n + m))
+    return d, _kolmogorov_q((en + 0.12 + 0.11 / en) * d)
+
+
+def _raenge(werte):
+    """Ränge ab 1, Bindungen erhalten den mittleren Rang"""
+    ordnung = np.argsort(werte, kind='stable')
+    sortiert = werte[ordnung]
+    grenzen = np.flatnonzero(np.diff(sortiert)) + 1
+    anfaenge = np.concatenate([[0], grenzen])
+    enden = np.concatenate([grenzen, [len(werte)]])
+    raenge = np.empty(len(werte))
+    raenge[ordnung] = np.repeat((anfaenge + enden + 1) / 2, enden - anfaenge)
+    return raenge, enden - anfaenge
+
+
+def mann_whitney(a, b):
+    """Mann-Whitney-U mit Bindungskorrektur: (U, p) zweiseitig, Normalapproximation"""
+    a, b = np.asarray(a, dtype=np.float64), np.asarray(b, dtype=np.float64)
+    n, m = len(a), len(b)
+    raenge, bindungen = _raenge(np.concatenate([a, b]))
+    u = raenge[:n].sum() - n * (n + 1) / 2
+    varianz = n * m / 12 * ((n + m + 1) - (bindungen ** 3 - bindungen).sum() / ((n + m) * (n + m - 1)))
+    if varianz <= 0:
+        return float(u), 1.0
+    z = (abs(u - n * m / 2) - 0.5) / math.sqrt(varianz)
+    return float(u), math.erfc(max(z, 0.0) / math.sqrt(2))
+
+
+def logrank(zeiten_a, ereignis_a, zeiten_b, ereignis_b):
+    """Log-Rank-Test für zensierte Zeiten: (Chi², p) mit einem Freiheitsgrad"""
+    zeiten = np.concatenate([zeiten_a, zeiten_b]).astype(np.float64)
+    ereignis = np.concatenate([ereignis_a, ereignis_b]).astype(bool)
+    gruppe_a = np.arange(len(zeiten)) < len(zeiten_a)
+    beobachtet = erwartet = varianz = 0.0
+    for t in np.unique(zeiten[ereignis]):
+        risiko = zeiten >= t
+        n, n_a = risiko.sum(), (risiko & gruppe_a).sum()
+        d = (ereignis & (zeiten == t)).sum()
+        d_a = (ereignis & (zeiten == t) & gruppe_a).sum()
+        beobachtet += d_a
+        erwartet += d * n_a / n
+        if n > 1:
+            varianz += d * (n_a / n) * (1 - n_a / n) * (n - d) / (n - 1)
+    if varianz <= 0:
+        return 0.0, 1.0
+    chi2 = (beobachtet - erwartet) ** 2 / varianz
+    return float(chi2), math.erfc(math.sqrt(chi2 / 2))
+
+
+def poisson_test(anzahl_a, zeit_a, anzahl_b, zeit_b):
+    """Gleiche Ereignisrate? Bedingt auf die Summe ist anzahl_a binomial; (Ratenverhältnis, p)
+    zweiseitig mit Normalapproximation und Stetigkeitskorrektur"""
+    gesamt = anzahl_a + anzahl_b
+    if gesamt == 0:
+        return float('nan'), 1.0
+    q = zeit_a / (zeit_a + zeit_b)
+    varianz = gesamt * q * (1 - q)
+    z = (abs(anzahl_a - gesamt * q) - 0.5) / math.sqrt(varianz)
+    verhaeltnis = (anzahl_a / zeit_a) / (anzahl_b / zeit_b) if anzahl_b else float('inf')
+    return verhaeltnis, math.erfc(max(z, 0.0) / math.sqrt(2))
+
+
+def holm(p_werte):
+    """Holm-Bonferroni-korrigierte p-Werte (gleiche Reihenfolge)"""
+    p = np.asarray(p_werte, dtype=np.float64)
+    ordnung = np.argsort(p, kind='stable')
+    korrigiert = np.minimum(1.0, np.maximum.accumulate(p[ordnung] * (len(p) - np.arange(len(p)))))
+    ergebnis = np.empty(len(p))
+    ergebnis[ordnung] = korrigiert
+    return ergebnis
+
+
+# --- Läufe ---
+
+class _Ereigniszaehler:
+    """Beobachter: zählt Ereignisse und merkt sich den Tick der ersten Monokultur"""
+
+    def __init__(self):
+        self.anzahl = dict.fromkeys(EREIGNISSE, 0)
+        self.monokultur = None
+
+    def schreibe(self, datenpunkt):
+        pass
+
+    def ereignis(self, tick, art, kultur):
+        self.anzahl[art] = self.anzahl.get(art, 0) + 1
+        if art == 'monokultur' and self.monokultur is None:
+            self.monokultur = tick
+
+    def schliessen(self):
+        pass
+
+
+def toleranz_tabelle(anzahl_kulturen, seed, toleranz_beta=(2.0, 2.0)):
+    """Toleranztabelle wie in der Engine, ab Kultur 10 aus Beta(a, b) mit eigenem Seed –
+    beide Engines bekommen dieselbe"""
+    tabelle = STANDARD_TOLERANZ[:anzahl_kulturen + 1]
+    weitere = anzahl_kulturen + 1 - len(tabelle)
+    if weitere > 0:
+        tabelle = tabelle + np.random.default_rng(seed).beta(*toleranz_beta, weitere).tolist()
+    return tabelle
+
+
+def _anteile_dicht(simulation, anzahl_kulturen):
+    """Kulturanteile aller Verlaufseinträge als Matrix (Einträge × Kulturen + 1)"""
+    spalten = simulation.verlauf_arrays()
+    zeilen = np.repeat(np.arange(len(spalten['tick'])), np.diff(spalten['kultur_zeiger']))
+    matrix = np.zeros((len(spalten['tick']), anzahl_kulturen + 1))
+    matrix[zeilen, spalten['kulturen']] = spalten['anteile']
+    return matrix
+
+
+def lauf(engine, variante, breite, hoehe, dichte, ticks, seed, anzahl_kulturen=9, topologie='torus'):
+    """Ein Lauf der Engine-Beschreibung `engine` (Parameter von erzeuge_simulation, dazu
+    optional 'regeln') aus dem Zufallsmuster des Seeds; Kurven und Ereignisse"""
+    regeln = dict(VARIANTEN[variante])
+    regeln.update(engine.get('regeln') or {})
+    muster = zufallsmuster((hoehe, breite), dichte, anzahl_kulturen, regeln['hybrid'], regeln['ressourcen'],
+                           seed)
+    parameter = {name: engine[name] for name in ENGINE_PARAMETER if name in engine}
+    simulation = erzeuge_simulation(variante, breite, hoehe, dichte, seed, topologie=topologie,
+                                    anzahl_kulturen=anzahl_kulturen, muster=muster,
+                                    regeln=engine.get('regeln'), **parameter)
+    simulation.kultur_toleranz = toleranz_tabelle(anzahl_kulturen, seed)
+    simulation.max_history = max(simulation.max_history, ticks + 1)
+    zaehler = _Ereigniszaehler()
+    simulation.beobachter.append(zaehler)
+    for _ in range(ticks):
+        simulation.tick()
+    simulation.schliessen()
+    return {
+        'population': np.array(simulation.verlauf_arrays()['population'], dtype=np.float64),
+        'anteile': _anteile_dicht(simulation, anzahl_kulturen),
+        'ereignisse': zaehler.anzahl,
+        'monokultur': zaehler.monokultur,
+    }
+
+
+def _lauf_auftrag(auftrag):
+    return lauf(**auftrag)
+
+
+def laeufe(engine, seeds, prozesse=1, **parameter):
+    """Läufe einer Engine für alle Seeds (Parameter wie bei lauf())"""
+    auftraege = [dict(parameter, engine=engine, seed=seed) for seed in seeds]
+    if prozesse > 1:
+        with Pool(prozesse) as pool:
+            return pool.map(_lauf_auftrag, auftraege)
+    return [_lauf_auftrag(auftrag) for auftrag in auftraege]
+
+
+# --- Einzelne Stufen auf gebauten Nachbarschaften ---
+
+def nachbarschaft(mitte=None, ring=None, groesse=5):
+    """Muster (groesse × groesse) mit belegter Mitte und Moore-Ring um sie; sonst leer.
+    `mitte` und `ring` sind Dictionaries {Feld: Wert}, für den Ring auch eine Folge von acht
+    Werten in der Reihenfolge von MOORE_VERSATZ; None lässt Mitte bzw. Ring leer."""
+    muster = {name: np.zeros((groesse, groesse), dtype=np.int64) for name in FELDER}
+    c = groesse // 2
+    for name, wert in (mitte or {}).items():
+        muster[name][c, c] = wert
+    for name, werte in (ring or {}).items():
+        werte = np.broadcast_to(werte, len(MOORE_VERSATZ))
+        for (dy, dx), wert in zip(MOORE_VERSATZ, werte):
+            muster[name][c + dy, c + dx] = wert
+    return muster
+
+
+# Erwachsene beider Geschlechter der Kultur 2 (Zweitkultur ebenfalls 2) im Ring, Alter 5
+# (kein Alterstod im ersten Tick)
+FREMDER_RING = {'status': 2, 'alter': 5, 'geschlecht': [1, 2] * 4, 'kultur': 2, 'kultur2': 2, 'macht': 5}
+
+
+def mitte_nach_tick(engine, muster, seed, variante='basis', regeln=None):
+    """Zustand der Mittelzelle nach einem Tick: (status, kultur)"""
+    regeln = dict(regeln or {}, **(engine.get('regeln') or {}))
+    parameter = {name: engine[name] for name in ENGINE_PARAMETER if name in engine}
+    groesse = muster['status'].shape[0]
+    simulation = erzeuge_simulation(variante, groesse, groesse, 0.0, seed, muster=muster,
+                                    regeln=regeln or None, **parameter)
+    simulation.tick()
+    zustand = simulation.zustand_arrays()
+    c = groesse // 2
+    return int(zustand['status'][c, c]), int(zustand['kultur'][c, c])
+
+
+def anteil_test(treffer_a, n_a, treffer_b, n_b):
+    """Gleiche Trefferwahrscheinlichkeit? (Differenz der Anteile, p) zweiseitig, z-Test mit
+    gepooltem Anteil"""
+    gesamt = (treffer_a + treffer_b) / (n_a + n_b)
+    differenz = treffer_a / n_a - treffer_b / n_b
+    if gesamt in (0.0, 1.0):
+        return differenz, 1.0
+    z = abs(differenz) / math.sqrt(gesamt * (1 - gesamt) * (1 / n_a + 1 / n_b))
+    return differenz, math.erfc(z / math.sqrt(2))
+
+
+# Name: (Mitte, Ring, Regeländerungen); gemessen wird die Mittelzelle nach einem Tick
+STUFEN_SZENARIEN = {
+    # Isolationstod der Mitte, die Zelle muss danach leer bleiben
+    'isolation': ({'status': 2, 'alter': 5, 'geschlecht': 1, 'kultur': 1, 'kultur2': 1, 'macht': 5},
+                  FREMDER_RING, {}),
+    # Geburt in eine leere Zelle zwischen Erwachsenen beider Geschlechter
+    'geburt': (None, FREMDER_RING, {'migration': 0}),
+    # Alterstod der Mitte (gleiche Kultur wie der Ring), danach Geburt im selben Tick möglich
+    'alterstod_geburt': ({'status': 2, 'alter': 19, 'geschlecht': 1, 'kultur': 2, 'macht': 5},
+                         FREMDER_RING, {'migration': 0}),
+    # Migration in eine leere Zelle ohne Nachbarn
+    'migration': (None, None, {'migration': 0.3}),
+}
+
+
+def stufen_stichprobe(engine, szenario, seeds, variante='basis'):
+    """Zustände der Mittelzelle (status, kultur) nach einem Tick für alle Seeds"""
+    mitte, ring, regeln = STUFEN_SZENARIEN[szenario]
+    muster = nachbarschaft(mitte, ring)
+    return np.array([mitte_nach_tick(engine, muster, seed, variante, regeln) for seed in seeds])
+
+
+def stufen_vergleich(referenz, kandidat, seeds=range(400), variante='basis'):
+    """Tests aller STUFEN_SZENARIEN: Anteil belegter Mittelzellen und Anteil der Kultur 2
+    (Tests wie in vergleiche(), noch ohne Holm-Korrektur)"""
+    seeds = list(seeds)
+    tests = []
+    for szenario in STUFEN_SZENARIEN:
+        a = stufen_stichprobe(referenz, szenario, seeds, variante)
+        b = stufen_stichprobe(kandidat, szenario, seeds, variante)
+        for merkmal, treffer in (('belegt', lambda x: x[:, 0] > 0),
+                                 ('kultur_2', lambda x: (x[:, 0] > 0) & (x[:, 1] == 2))):
+            differenz, p = anteil_test(treffer(a).sum(), len(a), treffer(b).sum(), len(b))
+            tests.append({'name': f"stufe_{szenario}_{merkmal}", 'test': 'anteile',
+                          'statistik': float(differenz), 'p': float(p)})
+    return tests
+
+
+def pruefe_isolierte_zelle(engine, seeds=range(200)):
+    """Regressionsprüfung: ein erwachsener Primat der Kultur 1, umzingelt von Erwachsenen
+    der Kultur 2, stirbt in 'basis' am Isolationstod, und die Zelle bleibt in diesem Tick leer
+    (keine Geburt, keine Migration in die eben geleerte Zelle). Gibt die Seeds zurück, in denen
+    die Mitte danach belegt war – bei jeder Engine muss die Liste leer sein."""
+    muster = nachbarschaft({'status': 2, 'alter': 5, 'geschlecht': 1, 'kultur': 1, 'macht': 5}, FREMDER_RING)
+    return [seed for seed in seeds if mitte_nach_tick(engine, muster, seed)[0] > 0]
+
+
+# --- Vergleich ---
+
+def vergleiche(referenz, kandidat, ticks, stuetzstellen=10, alpha=0.01, weitere_tests=None):
+    """Vergleicht zwei Listen von Läufen (wie von laeufe()); gibt {'tests': [...],
+    'bestanden': bool, 'alpha'} zurück. Jeder Test ist ein Dictionary mit 'name', 'test',
+    'statistik', 'p' und dem Holm-korrigierten 'p_holm'. `weitere_tests` (z. B. aus
+    stufen_vergleich()) gehen mit in die Holm-Korrektur ein."""
+    tests = list(weitere_tests or [])
+
+    def pruefe(name, test, statistik, p):
+        tests.append({'name': name, 'test': test, 'statistik': float(statistik), 'p': float(p)})
+
+    def spalte(laeufe_, funktion):
+        return np.array([funktion(lauf_) for lauf_ in laeufe_], dtype=np.float64)
+
+    def stichproben(funktion):
+        return spalte(referenz, funktion), spalte(kandidat, funktion)
+
+    punkte = np.unique(np.linspace(0, ticks, stuetzstellen + 1)[1:].round().astype(int))
+    for t in punkte:
+        pruefe(f"population@{t}", 'ks', *ks_test(*stichproben(lambda l: l['population'][t])))
+        pruefe(f"dominanz@{t}", 'ks', *ks_test(*stichproben(lambda l: l['anteile'][t].max())))
+        pruefe(f"kulturen@{t}", 'mann-whitney', *mann_whitney(*stichproben(lambda l: (l['anteile'][t] > 0).sum())))
+    pruefe("population_mittel", 'ks', *ks_test(*stichproben(lambda l: l['population'].mean())))
+    kulturen = referenz[0]['anteile'].shape[1]
+    for kultur in range(1, kulturen):
+        pruefe(f"anteil_kultur_{kultur}@{ticks}", 'ks',
+               *ks_test(*stichproben(lambda l: l['anteile'][ticks, kultur])))
+
+    def zeiten(laeufe_):
+        return (np.array([ticks if l['monokultur'] is None else l['monokultur'] for l in laeufe_]),
+                np.array([l['monokultur'] is not None for l in laeufe_]))
+
+    pruefe("zeit_bis_monokultur", 'log-rank', *logrank(*zeiten(referenz), *zeiten(kandidat)))
+    for art in EREIGNISSE:
+        anzahl_r = sum(l['ereignisse'][art] for l in referenz)
+        anzahl_k = sum(l['ereignisse'][art] for l in kandidat)
+        pruefe(f"rate_{art}", 'poisson', *poisson_test(anzahl_r, ticks * len(referenz), anzahl_k,
+                                                       ticks * len(kandidat)))
+
+    for test, p_holm in zip(tests, holm([test['p'] for test in tests])):
+        test['p_holm'] = float(p_holm)
+    return {'tests': tests, 'bestanden': all(test['p_holm'] >= alpha for test in tests), 'alpha': alpha}
+
+
+def pruefe_konformitaet(kandidat, referenz=None, seeds=range(30), variante='basis', breite=30, hoehe=30,
+                        dichte=0.1, ticks=200, anzahl_kulturen=9, topologie='torus', stuetzstellen=10,
+                        alpha=0.01, prozesse=1, stufen_seeds=range(400)):
+    """Rechnet Referenz (Standard: Objekt-Engine) und Kandidat auf allen Seeds und vergleicht
+    sie (siehe vergleiche()), dazu die einzelnen Stufen auf `stufen_seeds` (siehe
+    stufen_vergleich(); leer = ohne). Engines sind Dictionaries wie {'engine': 'feld',
+    'backend': 'numba'}; 'regeln' ändert Regeln (z. B. als Gegenprobe, die durchfallen muss)."""
+    referenz = referenz or {'engine': 'objekt'}
+    parameter = {'variante': variante, 'breite': breite, 'hoehe': hoehe, 'dichte': dichte, 'ticks': ticks,
+                 'anzahl_kulturen': anzahl_kulturen, 'topologie': topologie}
+    seeds = list(seeds)
+    laeufe_referenz = laeufe(referenz, seeds, prozesse, **parameter)
+    laeufe_kandidat = laeufe(kandidat, seeds, prozesse, **parameter)
+    stufen = stufen_vergleich(referenz, kandidat, stufen_seeds, variante) if stufen_seeds else []
+    return vergleiche(laeufe_referenz, laeufe_kandidat, ticks, stuetzstellen, alpha, stufen)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Statistischer Vergleich einer Engine mit der Referenz")
+    parser.add_argument('--engine', choices=['feld', 'objekt'], default='feld')
+    parser.add_argument('--backend', default='numpy')
+    parser.add_argument('--threads', type=int, default=None)
+    parser.add_argument('--referenz', choices=['feld', 'objekt'], default='objekt')
+    parser.add_argument('--variante', choices=sorted(VARIANTEN), default='basis')
+    parser.add_argument('--laeufe', type=int, default=30, help="Seeds je Engine")
+    parser.add_argument('--breite', type=int, default=30)
+    parser.add_argument('--hoehe', type=int, default=30)
+    parser.add_argument('--dichte', type=float, default=0.1)
+    parser.add_argument('--ticks', type=int, default=200)
+    parser.add_argument('--kulturen', type=int, default=9)
+    parser.add_argument('--alpha', type=float, default=0.01)
+    parser.add_argument('--prozesse', type=int, default=1)
+    parser.add_argument('--stufen-seeds', type=int, default=400,
+                        help="Seeds je Stufenprüfung auf gebauten Nachbarschaften (0 = ohne)")
+    parser.add_argument('--alle', action='store_true', help="Alle Tests ausgeben, nicht nur die auffälligsten")
+    args = parser.parse_args()
+
+    kandidat = {'engine': args.engine, 'backend': args.backend, 'threads': args.threads}
+    belegt = pruefe_isolierte_zelle(kandidat)
+    if belegt:
+        print(f"Isolierte Zelle im selben Tick neu belegt (Seeds {belegt[:5]}...)")
+        sys.exit(1)
+    ergebnis = pruefe_konformitaet(kandidat, {'engine': args.referenz}, range(args.laeufe), args.variante,
+                                   args.breite, args.hoehe, args.dichte, args.ticks, args.kulturen,
+                                   alpha=args.alpha, prozesse=args.prozesse,
+                                   stufen_seeds=range(args.stufen_seeds))
+    tests = sorted(ergebnis['tests'], key=lambda test: test['p'])
+    for test in tests if args.alle else tests[:10]:
+        print(f"{test['name']:30s} {test['test']:13s} {test['statistik']:10.4f} "
+              f"p={test['p']:.4f} p_holm={test['p_holm']:.4f}")
+    print(f"{len(tests)} Tests, {'bestanden' if ergebnis['bestanden'] else 'NICHT bestanden'} "
+          f"(alpha={ergebnis['alpha']})")
+    sys.exit(0 if ergebnis['bestanden'] else 1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,287 @@
+#!/usr/bin/env python3
+"""
+Primaten – Headless-Läufe
+Führt Simulationen ohne GUI aus, optional mehrere Seeds parallel, und protokolliert
+die Ergebnisse im Laufkatalog und/oder als Streaming-Export
+"""
+
+import argparse
+import random
+from multiprocessing import Pool
+
+from primaten_cache import ErgebnisCache, datei_hash
+from primaten_ensemble import EnsembleAggregator
+from primaten_export import StreamExporter
+from primaten_genealogie import Geburtsregister
+from primaten_katalog import RunKatalog
+from primaten_kern import PrimatenSimulation, FeldSimulation, VARIANTEN
+from primaten_muster import lade as lade_muster, muster_form
+from primaten_telemetrie import TelemetrieServer
+from primaten_karten import KartenAkkumulator
+from primaten_speicher import SpeicherBudgetFehler, SpeicherMessung, budget_anwenden, bericht_text
+from primaten_topologie import TOPOLOGIEN
+
+ENGINES = ['feld', 'objekt']
+
+
+def erzeuge_simulation(variante, breite, hoehe, dichte, seed=None, engine='feld', topologie='torus',
+                       threads=None, backend='numpy', anzahl_kulturen=9, genealogie=None, muster=None,
+                       regeln=None):
+    """Erzeugt die Simulation der gewünschten Variante, Engine und Topologie.
+    `threads` schaltet bei der Feld-Engine den Kachelbetrieb ein, `backend` wählt deren Kern,
+    `genealogie` ist ein Geburtsregister, `muster` ein Anfangszustand aus primaten_muster,
+    `regeln` ändert einzelne Regeln der Variante."""
+    if engine == 'objekt':
+        if seed is not None:
+            random.seed(seed)
+        return PrimatenSimulation(breite, hoehe, dichte, variante=variante, regeln=regeln,
+                                  topologie=topologie, anzahl_kulturen=anzahl_kulturen,
+                                  genealogie=genealogie, muster=muster)
+    return FeldSimulation(breite, hoehe, dichte, variante=variante, regeln=regeln, seed=seed,
+                          topologie=topologie, threads=threads, backend=backend,
+                          anzahl_kulturen=anzahl_kulturen, genealogie=genealogie, muster=muster)
+
+
+def fuehre_lauf_aus(breite=60, hoehe=60, dichte=0.1, ticks=1000, seed=None, variante='basis',
+                    engine='feld', katalog=None, export=None, stopp_bei_monokultur=False,
+                    topologie='torus', threads=None, backend='numpy', anzahl_kulturen=9,
+                    ensemble=None, telemetrie=None, genealogie=None, muster=None, karten=None,
+                    karten_intervall=1, karten_halbwertszeit=None, cache=None, speicher_budget=None,
+                    speicher_messung=None):
+    """Führt einen Lauf aus und gibt die Simulation zurück.
+    `ensemble` (EnsembleAggregator) nimmt den Verlauf des Laufs in die Ensemble-Statistik auf,
+    `telemetrie` (gestarteter TelemetrieServer) sendet ihn live an seine Abonnenten,
+    `genealogie` ist der Basisname für das Geburtsregister, `muster` eine Musterdatei (Bild,
+    .npy oder .npz) für den Anfangszustand; sie legt auch Breite und Höhe fest.
+    `karten` ist der Basisname für zeitgemittelte Karten (alle `karten_intervall` Ticks
+    aufgenommen, mit `karten_halbwertszeit` exponentiell gewichtet), gespeichert am Ende
+    als .npz und PNG.
+    `cache` (ErgebnisCache oder Verzeichnis) liefert Läufe mit bekannter Konfiguration aus dem
+    Cache; nur Läufe mit festem Seed und ohne Katalog, Export, Telemetrie, Genealogie und
+    Karten werden zwischengespeichert, da diese Nebenwirkungen während des Laufs haben.
+    `speicher_budget` (Bytes) lässt den Lauf mit SpeicherBudgetFehler gar nicht erst starten,
+    wenn er nicht hineinpasst, oder dünnt den Verlauf aus; `speicher_messung`
+    (SpeicherMessung) misst die Allokationen einzelner Ticks."""
+    if isinstance(cache, str):
+        cache = ErgebnisCache(cache)
+    if cache is not None and (seed is None or katalog or export or telemetrie is not None or
+                              genealogie or karten):
+        cache = None
+    if cache is not None:
+        konfiguration = {
+            'variante': variante, 'regeln': VARIANTEN[variante], 'breite': breite, 'hoehe': hoehe,
+            'dichte': dichte, 'ticks': ticks, 'seed': seed, 'engine': engine, 'topologie': topologie,
+            'threads': threads, 'backend': backend, 'anzahl_kulturen': anzahl_kulturen,
+            'muster': datei_hash(muster) if muster else None,
+            'stopp_bei_monokultur': stopp_bei_monokultur,
+            'speicher_budget': speicher_budget,
+        }
+        schluessel = cache.schluessel(konfiguration)
+        eintrag = cache.lade(schluessel)
+        if eintrag is not None:
+            hoehe, breite = eintrag['zustand']['status'].shape
+            sim = erzeuge_simulation(variante, breite, hoehe, dichte, seed, engine, topologie, threads,
+                                     backend, anzahl_kulturen, muster=eintrag['zustand'])
+            cache.wiederherstellen(sim, eintrag)
+            if ensemble is not None:
+                ensemble.verfolge(sim)
+                ensemble.schliessen()
+            sim.schliessen()
+            return sim
+
+    register = Geburtsregister(genealogie) if genealogie else None
+    anfang = None
+    if muster:
+        regeln = VARIANTEN[variante]
+        anfang = lade_muster(muster, anzahl_kulturen, regeln['hybrid'], regeln['ressourcen'], seed=seed)
+        hoehe, breite = anfang['status'].shape
+    sim = erzeuge_simulation(variante, breite, hoehe, dichte, seed, engine, topologie, threads,
+                             backend, anzahl_kulturen, register, anfang)
+    if speicher_budget is not None:
+        try:
+            budget_anwenden(sim, ticks, speicher_budget)
+        except MemoryError:
+            sim.schliessen()
+            raise
+
+    kat = None
+    schreiber = None
+    if katalog:
+        kat = RunKatalog(katalog)
+        lauf_id = kat.lauf_anlegen(variante, breite, hoehe, dichte, seed,
+                                   {'ticks': ticks, 'engine': engine, 'topologie': sim.topologie.name,
+                                    'backend': getattr(sim, 'backend', None),
+                                    'anzahl_kulturen': anzahl_kulturen,
+                                    'stopp_bei_monokultur': stopp_bei_monokultur})
+        schreiber = kat.schreiber(lauf_id)
+        sim.beobachter.append(schreiber)
+    exporter = None
+    if export:
+        exporter = StreamExporter(export)
+        sim.beobachter.append(exporter)
+    if ensemble is not None:
+        ensemble.verfolge(sim)
+    if telemetrie is not None:
+        telemetrie.verfolge(sim)
+    akkumulator = None
+    if karten:
+        akkumulator = KartenAkkumulator(karten_intervall, karten_halbwertszeit).verfolge(sim)
+
+    status = 'fertig'
+    try:
+        for _ in range(ticks):
+            anteile, population = sim.tick() if speicher_messung is None else speicher_messung.tick(sim)
+            if stopp_bei_monokultur and sim.monokultur_erkannt(anteile, population)[0]:
+                status = 'monokultur'
+                break
+    except BaseException:
+        status = 'abgebrochen'
+        raise
+    finally:
+        for beobachter in sim.beobachter:
+            beobachter.schliessen()
+        sim.schliessen()
+        if akkumulator is not None and akkumulator.aufnahmen:
+            akkumulator.speichere(f"{karten}_karten.npz")
+            akkumulator.speichere_bilder(karten, sim.kultur_farben)
+        if cache is not None and status != 'abgebrochen':
+            cache.speichere(schluessel, sim, konfiguration)
+        if kat is not None:
+            kat.lauf_abschliessen(lauf_id, sim.tick_index, sim.history[-1]['population'],
+                                  schreiber.monokultur, schreiber.monokultur_tick, status)
+            kat.schliessen()
+
+    return sim
+
+
+def _lauf_mit_seed(argumente):
+    """Hilfsfunktion für den Prozess-Pool; mit ensemble=True kommt die Statistik des Laufs zurück"""
+    seed, parameter = argumente
+    parameter = dict(parameter)
+    ensemble = None
+    if parameter.pop('ensemble', False):
+        ensemble = EnsembleAggregator(parameter['breite'] * parameter['hoehe'],
+                                      parameter.get('anzahl_kulturen', 9))
+    intervall = parameter.pop('speicher_messung', None)
+    messung = SpeicherMessung(intervall) if intervall else None
+    sim = fuehre_lauf_aus(seed=seed, ensemble=ensemble, speicher_messung=messung, **parameter)
+    if messung is not None:
+        print('\n'.join([f"Seed {seed}: Speicher"] + bericht_text(sim, messung)))
+    return seed, sim.tick_index, sim.history[-1]['population'], ensemble
+
+
+def main():
+    """Kommandozeilen-Einstieg"""
+    parser = argparse.ArgumentParser(description="Primaten-Simulation ohne GUI ausführen")
+    parser.add_argument('--breite', type=int, default=60)
+    parser.add_argument('--hoehe', type=int, default=60)
+    parser.add_argument('--dichte', type=float, default=0.1)
+    parser.add_argument('--ticks', type=int, default=1000)
+    parser.add_argument('--seed', type=int, default=None)
+    parser.add_argument('--variante', choices=sorted(VARIANTEN), default='basis')
+    parser.add_argument('--engine', choices=ENGINES, default='feld')
+    parser.add_argument('--topologie', choices=sorted(TOPOLOGIEN), default='torus')
+    parser.add_argument('--backend', choices=FeldSimulation.BACKENDS, default='numpy',
+                        help="Kern der Feld-Engine ('numba' nur mit installiertem Numba)")
+    parser.add_argument('--kulturen', type=int, default=9, help="Anzahl der Kulturen")
+    parser.add_argument('--laeufe', type=int, default=1, help="Anzahl Läufe mit aufeinanderfolgenden Seeds")
+    parser.add_argument('--prozesse', type=int, default=1)
+    parser.add_argument('--threads', type=int, default=None,
+                        help="Kachelbetrieb der Feld-Engine mit so vielen Threads pro Lauf")
+    parser.add_argument('--katalog', default=None, help="Pfad zur SQLite-Katalogdatei")
+    parser.add_argument('--export', default=None, help="Basisname für den Streaming-Export")
+    parser.add_argument('--muster', default=None,
+                        help="Anfangszustand aus Bild (Kultur je Farbe), .npy (Kultur je Zelle) oder .npz")
+    parser.add_argument('--genealogie', default=None,
+                        help="Basisname für das Geburtsregister (Abstammung aller Primaten)")
+    parser.add_argument('--cache', default=None, metavar='VERZEICHNIS',
+                        help="Ergebnis-Cache: bekannte Konfigurationen (fester Seed) nicht neu rechnen")
+    parser.add_argument('--cache-groesse', type=int, default=1024, metavar='MB',
+                        help="Höchstgröße des Caches, älteste Einträge werden verdrängt")
+    parser.add_argument('--karten', default=None,
+                        help="Basisname für zeitgemittelte Karten (Belegung, Kultur, Ressourcen)")
+    parser.add_argument('--karten-intervall', type=int, default=1, metavar='TICKS',
+                        help="Karten nur alle so viele Ticks fortschreiben")
+    parser.add_argument('--karten-halbwertszeit', type=float, default=None, metavar='TICKS',
+                        help="Exponentiell abklingendes Mittel statt Mittel über den ganzen Lauf")
+    parser.add_argument('--ensemble', default=None,
+                        help="Basisname für die Ensemble-Statistik über alle Läufe (CSV je Kennwert)")
+    parser.add_argument('--telemetrie', type=int, default=None, metavar='PORT',
+                        help="Verlauf live über einen lokalen TCP-Port senden (nur mit --prozesse 1)")
+    parser.add_argument('--telemetrie-bilder', type=int, default=0, metavar='TICKS',
+                        help="Alle so viele Ticks ein verkleinertes Kulturbild mitsenden")
+    parser.add_argument('--speicher-budget', type=int, default=None, metavar='MB',
+                        help="Höchstbedarf je Lauf: sonst nicht starten bzw. Verlauf ausdünnen")
+    parser.add_argument('--speicher-messung', type=int, default=None, metavar='TICKS',
+                        help="Speicherbericht am Ende, Allokationen jedes so vielten Ticks (tracemalloc)")
+    parser.add_argument('--stopp-bei-monokultur', action='store_true')
+    args = parser.parse_args()
+    if args.telemetrie is not None and args.prozesse > 1:
+        parser.error("--telemetrie ist nur mit --prozesse 1 möglich")
+    if args.muster:
+        args.hoehe, args.breite = muster_form(args.muster)
+
+    parameter = {
+        'breite': args.breite, 'hoehe': args.hoehe, 'dichte': args.dichte,
+        'ticks': args.ticks, 'variante': args.variante, 'engine': args.engine,
+        'topologie': args.topologie, 'threads': args.threads, 'backend': args.backend,
+        'anzahl_kulturen': args.kulturen,
+        'katalog': args.katalog,
+        'muster': args.muster,
+        'cache': ErgebnisCache(args.cache, args.cache_groesse << 20) if args.cache else None,
+        'karten_intervall': args.karten_intervall,
+        'karten_halbwertszeit': args.karten_halbwertszeit,
+        'stopp_bei_monokultur': args.stopp_bei_monokultur,
+        'ensemble': bool(args.ensemble),
+        'speicher_budget': args.speicher_budget << 20 if args.speicher_budget else None,
+        'speicher_messung': args.speicher_messung,
+    }
+    telemetrie = None
+    if args.telemetrie is not None:
+        telemetrie = TelemetrieServer(port=args.telemetrie, bild_intervall=args.telemetrie_bilder).starten()
+        parameter['telemetrie'] = telemetrie
+        print(f"Telemetrie auf {telemetrie.adresse[0]}:{telemetrie.adresse[1]}")
+    start_seed = args.seed if args.seed is not None else random.randrange(2**31)
+    auftraege = []
+    for i in range(args.laeufe):
+        einzel = dict(parameter)
+        if args.export:
+            einzel['export'] = args.export if args.laeufe == 1 else f"{args.export}_{start_seed + i}"
+        if args.karten:
+            einzel['karten'] = args.karten if args.laeufe == 1 else f"{args.karten}_{start_seed + i}"
+        if args.genealogie:
+            einzel['genealogie'] = (args.genealogie if args.laeufe == 1
+                                    else f"{args.genealogie}_{start_seed + i}")
+        auftraege.append((start_seed + i, einzel))
+
+    gesamt = None
+    if args.ensemble:
+        gesamt = EnsembleAggregator(args.breite * args.hoehe, args.kulturen)
+
+    def auswerten(ergebnisse):
+        # Ergebnisse einzeln abholen: die Statistik jedes Laufs wird sofort eingerechnet
+        for seed, ticks, population, ensemble in ergebnisse:
+            print(f"Seed {seed}: {ticks} Ticks, Population {population}")
+            if gesamt is not None:
+                gesamt.vereinige(ensemble)
+
+    try:
+        if args.prozesse > 1:
+            with Pool(args.prozesse) as pool:
+                auswerten(pool.imap(_lauf_mit_seed, auftraege))
+        else:
+            try:
+                auswerten(_lauf_mit_seed(a) for a in auftraege)
+            finally:
+                if telemetrie is not None:
+                    telemetrie.beenden()
+    except SpeicherBudgetFehler as fehler:
+        parser.exit(1, f"{fehler}\n")
+
+    if gesamt is not None:
+        for dateiname in gesamt.export_csv(args.ensemble):
+            print(f"Ensemble-Statistik: {dateiname}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,430 @@
+#!/usr/bin/env python3
+"""
+Primaten – Mittelfeld-Ersatzmodell
+Grobes, sehr schnelles Ersatzmodell für die Vorauswahl von Parametern (Regeln, Migrationsrate,
+Toleranztabelle, Dichte): statt einzelner Primaten werden nur Dichten fortgeschrieben, und
+jede Zelle sieht als Nachbarn unabhängige Stichproben des ganzen Gitters (Mittelfeld). Ein
+Schritt ist die Erwartung eines Ticks von FeldSimulation unter dieser Annahme, in derselben
+Reihenfolge der Stufen:
+
+- Altern: Altersverteilung je Geschlecht (0–19), Übergang mit Wahrscheinlichkeit 0.8,
+  erwachsen ab 3, Tod über 19 (die Toten behalten ihre Kultur in der Zelle).
+- Isolation 'umzingelung': Tod, wenn keiner der k Nachbarn die eigene Kultur trägt,
+  also mit (1 - q)^k (q = Dichte der Zellen mit dieser Kultur, Tote eingeschlossen).
+  'toleranz': Tod mit (Dichte fremder Nachbarn) · (1 - Toleranz); Nähe wie in der Engine
+  über Primär- und Sekundärkultur, daher wird die Verteilung der Kulturpaare geführt.
+- Geburt: leere Zelle mit mindestens einer erwachsenen Nachbarin und einem erwachsenen
+  Nachbarn, dann 0.25. Kultur der Mutter, bei 'partnerwahl' Sekundärkultur vom Vater
+  (Mutter und Vater unabhängig aus den Erwachsenen gezogen, ohne Bevorzugung naher Paare).
+- Migration: gleichverteilte Kultur(en) in leere Zellen ohne Geburt.
+
+Die Stufe Beeinflussung fällt im Mittelfeld heraus: wer von einem zufälligen Nachbarn
+übernimmt, zieht aus derselben Verteilung, die er verlässt – die Anteile ändern sich im
+Mittel nicht. Macht und Ressourcen werden deshalb nicht geführt.
+
+Räumliche Effekte fehlen im reinen Mittelfeld, vor allem die Klumpenbildung: Kinder entstehen
+neben ihrer Mutter, Nachbarn teilen daher viel öfter die Kultur, als die Dichten vermuten
+lassen. Die Basisvariante stürzt im ersten Tick auf etwa 1 % und erholt sich im vollen Lauf
+aus den überlebenden Klumpen, im reinen Mittelfeld stirbt sie aus. Ein grober Klumpenansatz
+gleicht das aus: Die geklumpte Population (alle außer zufällig Platzierten – Anfangszustand,
+Migranten –, solange sie noch keinen Nachbarn ihrer Kultur nachweisen mussten) lebt auf
+einer Teilfläche mit der Dichte `klumpendichte`; Nachbarschaften, Geburten und Isolation
+werden dort gerechnet. `entmischung` (0 = zufällig, 1 = jeder Nachbar teilt die Kultur)
+verschiebt die Nachbarschaft in der Isolationsstufe zur eigenen Kultur, `geburt_faktor`
+skaliert die Geburtswahrscheinlichkeit. Mit den Standardwerten (1, 0, 0) ist es das reine
+Mittelfeld. kalibriere() wählt die drei Kennzahlen anhand voller Läufe und misst die
+verbleibende Abweichung.
+
+Alle Parametersätze einer Liste werden gemeinsam als Stapel gerechnet; ein Schritt kostet
+O(Sätze · Kulturpaare²), unabhängig von der Gittergröße.
+"""
+
+import argparse
+import json
+import time
+
+import numpy as np
+
+from primaten_kern import FeldSimulation, STANDARD_TOLERANZ, VARIANTEN
+from primaten_topologie import TOPOLOGIEN
+
+# Konstanten der Regeln wie in FeldSimulation._zellschritt
+ALTERUNG = 0.8
+HOECHSTALTER = 19
+REIFE = 3
+GEBURT = 0.25
+
+ALTERSKLASSEN = HOECHSTALTER + 1
+
+
+def nachbarzahl(topologie='torus'):
+    """Zahl der Nachbarn je Zelle einer Topologie (Name aus TOPOLOGIEN oder Topologie-Objekt)"""
+    if isinstance(topologie, str):
+        topologie = TOPOLOGIEN[topologie](4, 4)
+    return topologie.k
+
+
+def _regeln(parameter):
+    regeln = dict(VARIANTEN[parameter.get('variante', 'basis')])
+    zusatz = parameter.get('regeln') or {}
+    unbekannt = set(zusatz) - set(regeln)
+    if unbekannt:
+        raise ValueError(f"Unbekannte Regeln: {', '.join(sorted(unbekannt))}")
+    regeln.update(zusatz)
+    return regeln
+
+
+def _toleranz(parameter, anzahl_kulturen):
+    toleranz = parameter.get('toleranz')
+    if toleranz is None:
+        if anzahl_kulturen + 1 > len(STANDARD_TOLERANZ):
+            raise ValueError("Ab 10 Kulturen braucht jeder Parametersatz eine Toleranztabelle")
+        toleranz = STANDARD_TOLERANZ[:anzahl_kulturen + 1]
+    if len(toleranz) != anzahl_kulturen + 1:
+        raise ValueError(f"Die Toleranztabelle braucht {anzahl_kulturen + 1} Einträge")
+    return [1.0] + [float(t) for t in toleranz[1:]]
+
+
+class MittelfeldModell:
+    """Stapel von Mittelfeld-Läufen, einer je Parametersatz.
+
+    Ein Parametersatz ist ein Dictionary mit 'variante' (Standard 'basis'), 'regeln'
+    (Änderungen an der Variante), 'dichte' (Anfangsdichte, Standard 0.1) und 'toleranz'
+    (Tabelle mit anzahl_kulturen + 1 Einträgen, Index = Kultur). `geburt_faktor`,
+    `entmischung` und `klumpendichte` stammen aus kalibriere(), je ein Wert oder einer je Satz.
+    """
+
+    def __init__(self, parameter, anzahl_kulturen=9, topologie='torus', geburt_faktor=1.0, entmischung=0.0,
+                 klumpendichte=0.0):
+        self.parameter = [dict(p) for p in parameter]
+        self.anzahl_kulturen = anzahl_kulturen
+        self.k = nachbarzahl(topologie)
+        b = len(self.parameter)
+        self.geburt_faktor = np.broadcast_to(np.asarray(geburt_faktor, dtype=np.float64), (b,))
+        self.entmischung = np.broadcast_to(np.asarray(entmischung, dtype=np.float64), (b,))
+        self.klumpendichte = np.broadcast_to(np.asarray(klumpendichte, dtype=np.float64), (b,))
+        regeln = [_regeln(p) for p in self.parameter]
+        kp = anzahl_kulturen + 1
+        self._altern = np.array([r['altern'] for r in regeln])
+        self._umzingelung = np.array([r['isolation'] == 'umzingelung' for r in regeln])
+        self._toleranz_regel = np.array([r['isolation'] == 'toleranz' for r in regeln])
+        self._geburt = np.array([bool(r['geburt']) for r in regeln])
+        self._partnerwahl = np.array([r['geburt'] == 'partnerwahl' for r in regeln])
+        self._hybrid = np.array([r['hybrid'] for r in regeln])
+        self._migration = np.array([float(r['migration'] or 0) for r in regeln])
+        self._dichte = np.array([float(p.get('dichte', 0.1)) for p in self.parameter])
+        # Toleranz je Kulturpaar (maßgeblich ist die Primärkultur)
+        toleranz = np.array([_toleranz(p, anzahl_kulturen) for p in self.parameter])
+        self._toleranz = np.repeat(toleranz, kp, axis=1)
+        # Kulturpaare (Primär, Sekundär) flach als Index primaer * kp + sekundaer
+        primaer, sekundaer = np.divmod(np.arange(kp * kp), kp)
+        self._primaer = primaer
+        self._naehe = ((primaer[:, None] == primaer[None, :]) | (primaer[:, None] == sekundaer[None, :]) |
+                       (sekundaer[:, None] == primaer[None, :]) | (sekundaer[:, None] == sekundaer[None, :]))
+        self._naehe = self._naehe.astype(np.float64)
+        # Verteilung der Neuankömmlinge: gleichverteilte Kultur, Sekundärkultur nur mit Hybrid
+        gleich = np.zeros(kp)
+        gleich[1:] = 1.0 / anzahl_kulturen
+        ohne = np.zeros(kp)
+        ohne[0] = 1.0
+        self._zufall = np.where(self._hybrid[:, None], np.outer(gleich, gleich).reshape(-1),
+                                np.outer(gleich, ohne).reshape(-1))
+        self._ohne_sekundaer = ohne
+        self.zuruecksetzen()
+
+    def zuruecksetzen(self):
+        """Anfangszustand wie zufallsmuster(): junge Primaten (Alter 0) mit Dichte `dichte`"""
+        b = len(self.parameter)
+        self.tick_index = 0
+        # Dichte je Geschlecht und Alter (Summe = Population / Zellen)
+        self.alter = np.zeros((b, 2, ALTERSKLASSEN))
+        self.alter[:, :, 0] = self._dichte[:, None] / 2
+        # Kulturpaare der Jungen und der Erwachsenen, Kultur der Toten in sonst leeren Zellen
+        self.jung = self._dichte[:, None] * self._zufall
+        self.erwachsen = np.zeros_like(self.jung)
+        self.tote = np.zeros((b, self.anzahl_kulturen + 1))
+        # Dichte der zufällig Platzierten (Anfangszustand, Migranten) – sie bilden keine Klumpen
+        self.zufaellig = self._dichte.copy()
+
+    def _kulturen(self, paare):
+        """Summe über die Sekundärkultur: Dichte je Primärkultur"""
+        return paare.reshape(len(paare), self.anzahl_kulturen + 1, -1).sum(axis=2)
+
+    def _klumpen(self):
+        """Fläche der Klumpen (Anteil am Gitter) und Entmischung bei der aktuellen Klumpung"""
+        lebend = self.jung.sum(axis=1) + self.erwachsen.sum(axis=1)
+        klumpung = np.divide(lebend - self.zufaellig, lebend, out=np.zeros_like(lebend), where=lebend > 0)
+        klumpung = np.clip(klumpung, 0, 1)
+        lokal = lebend + klumpung * np.maximum(self.klumpendichte - lebend, 0)
+        flaeche = np.divide(lebend, lokal, out=np.ones_like(lebend), where=lokal > 0)
+        return flaeche, klumpung * self.entmischung
+
+    def schritt(self):
+        """Ein Tick in Erwartung"""
+        k = self.k
+        kp = self.anzahl_kulturen + 1
+        jung, erwachsen, alter = self.jung, self.erwachsen, self.alter
+        # Nachbarschaft aus dem Zustand vor dem Tick, innerhalb der Klumpen
+        flaeche, entmischung = self._klumpen()
+        lebend = jung + erwachsen
+        lebend_summe = lebend.sum(axis=1)
+        q = np.clip((self._kulturen(lebend) + self.tote) / flaeche[:, None], 0, 1)
+        erwachsen_summe = alter[:, :, REIFE:].sum(axis=2)
+        weiblich = np.clip(erwachsen_summe[:, 0] / flaeche, 0, 1)
+        maennlich = np.clip(erwachsen_summe[:, 1] / flaeche, 0, 1)
+        mutter = self._kulturen(erwachsen)
+        mutter_summe = mutter.sum(axis=1, keepdims=True)
+        mutter = np.divide(mutter, mutter_summe, out=np.zeros_like(mutter), where=mutter_summe > 0)
+
+        # Stufe Altern
+        tote = self.tote.copy()
+        if self._altern.any():
+            gealtert = alter.copy()
+            gealtert[:, :, 1:] = (1 - ALTERUNG) * alter[:, :, 1:] + ALTERUNG * alter[:, :, :-1]
+            gealtert[:, :, 0] = (1 - ALTERUNG) * alter[:, :, 0]
+            reif = ALTERUNG * alter[:, :, REIFE - 1].sum(axis=1)
+            gestorben = ALTERUNG * alter[:, :, -1].sum(axis=1)
+            jung_summe = alter[:, :, :REIFE].sum(axis=(1, 2))
+            alt_summe = alter[:, :, REIFE:].sum(axis=(1, 2))
+            f_reif = np.divide(reif, jung_summe, out=np.zeros_like(reif), where=jung_summe > 0)
+            f_tod = np.divide(gestorben, alt_summe, out=np.zeros_like(gestorben), where=alt_summe > 0)
+            f_reif = np.where(self._altern, f_reif, 0)[:, None]
+            f_tod = np.where(self._altern, f_tod, 0)[:, None]
+            tote += self._kulturen(erwachsen * f_tod)
+            jung, erwachsen = jung * (1 - f_reif), erwachsen * (1 - f_tod) + jung * f_reif
+            alter = np.where(self._altern[:, None, None], gealtert, alter)
+
+        # Stufe Isolation (Wahrscheinlichkeit je Kulturpaar)
+        p_tod = np.zeros_like(jung)
+        if self._umzingelung.any():
+            eigen = entmischung[:, None] + (1 - entmischung[:, None]) * q
+            umzingelt = np.repeat((1 - eigen) ** k, kp, axis=1)
+            p_tod = np.where(self._umzingelung[:, None], umzingelt, p_tod)
+        if self._toleranz_regel.any():
+            gueltig = lebend.reshape(len(lebend), kp, kp).copy()
+            gueltig[:, 0, :] = 0
+            gueltig = gueltig.reshape(len(lebend), -1)
+            fremd = (gueltig.sum(axis=1, keepdims=True) - gueltig @ self._naehe) / flaeche[:, None]
+            p_toleranz = np.clip((1 - entmischung[:, None]) * fremd, 0, 1) * (1 - self._toleranz)
+            p_tod = np.where(self._toleranz_regel[:, None], p_toleranz, p_tod)
+        summe_jung, summe_alt = jung.sum(axis=1), erwachsen.sum(axis=1)
+        jung, erwachsen = jung * (1 - p_tod), erwachsen * (1 - p_tod)
+        rest_jung = np.divide(jung.sum(axis=1), summe_jung, out=np.ones_like(summe_jung), where=summe_jung > 0)
+        rest_alt = np.divide(erwachsen.sum(axis=1), summe_alt, out=np.ones_like(summe_alt), where=summe_alt > 0)
+        alter = alter.copy()
+        alter[:, :, :REIFE] *= rest_jung[:, None, None]
+        alter[:, :, REIFE:] *= rest_alt[:, None, None]
+        ueberlebt = jung.sum(axis=1) + erwachsen.sum(axis=1)
+        # Wer die Umzingelung überlebt, hat einen Nachbarn seiner Kultur: er zählt zu einem Klumpen
+        zufaellig = np.where(self._umzingelung, 0.0, self.zufaellig * np.divide(
+            ueberlebt, lebend_summe, out=np.zeros_like(ueberlebt), where=lebend_summe > 0))
+
+        # Stufe Geburt in leere Zellen der Klumpen (auch die eben frei gewordenen)
+        leer = 1 - ueberlebt
+        paarung = (1 - (1 - weiblich) ** k - (1 - maennlich) ** k
+                   + np.clip(1 - weiblich - maennlich, 0, 1) ** k)
+        p_geburt = np.where(self._geburt, np.clip(GEBURT * self.geburt_faktor * paarung, 0, 1), 0)
+        geburten = p_geburt * np.clip(flaeche - ueberlebt, 0, leer)
+        sekundaer = np.where(self._partnerwahl[:, None], mutter, self._ohne_sekundaer)
+        kinder = (mutter[:, :, None] * sekundaer[:, None, :]).reshape(len(mutter), -1)
+
+        # Stufe Migration in leere Zellen ohne Geburt
+        zuwanderer = self._migration * (leer - geburten)
+        jung = jung + geburten[:, None] * kinder + zuwanderer[:, None] * self._zufall
+        alter[:, :, 0] += (geburten + zuwanderer)[:, None] / 2
+        besetzt = np.divide(geburten + zuwanderer, leer, out=np.zeros_like(leer), where=leer > 0)
+        tote *= (1 - besetzt)[:, None]
+
+        self.jung, self.erwachsen, self.alter, self.tote = jung, erwachsen, alter, tote
+        self.zufaellig = zufaellig + zuwanderer
+        self.tick_index += 1
+
+    def population(self):
+        """Dichte der Lebenden je Parametersatz"""
+        return self.jung.sum(axis=1) + self.erwachsen.sum(axis=1)
+
+    def anteile(self):
+        """Anteil jeder Primärkultur an den Lebenden (Spalte = Kultur, Spalte 0 bleibt 0)"""
+        kulturen = self._kulturen(self.jung + self.erwachsen)
+        summe = kulturen.sum(axis=1, keepdims=True)
+        return np.divide(kulturen, summe, out=np.zeros_like(kulturen), where=summe > 0)
+
+    def lauf(self, ticks):
+        """Rechnet `ticks` Schritte; Verlauf als {'population': Sätze × (ticks + 1) Dichten,
+        'anteile': Sätze × (ticks + 1) × (Kulturen + 1)}, Zeile 0 ist der Zustand davor"""
+        population = np.zeros((len(self.parameter), ticks + 1))
+        anteile = np.zeros((len(self.parameter), ticks + 1, self.anzahl_kulturen + 1))
+        population[:, 0], anteile[:, 0] = self.population(), self.anteile()
+        for t in range(1, ticks + 1):
+            self.schritt()
+            population[:, t], anteile[:, t] = self.population(), self.anteile()
+        return {'population': population, 'anteile': anteile}
+
+
+def mittelfeld(parameter, ticks, anzahl_kulturen=9, topologie='torus', geburt_faktor=1.0, entmischung=0.0,
+               klumpendichte=0.0):
+    """Mittelfeld-Verlauf aller Parametersätze (siehe MittelfeldModell.lauf())"""
+    return MittelfeldModell(parameter, anzahl_kulturen, topologie, geburt_faktor, entmischung,
+                            klumpendichte).lauf(ticks)
+
+
+def voller_lauf(parameter, ticks, breite=60, hoehe=60, seed=None, anzahl_kulturen=9, topologie='torus'):
+    """Derselbe Parametersatz mit FeldSimulation; Verlauf in der Form von lauf() (ein Satz)"""
+    simulation = FeldSimulation(breite, hoehe, parameter.get('dichte', 0.1), parameter.get('variante', 'basis'),
+                                parameter.get('regeln'), seed=seed, topologie=topologie,
+                                anzahl_kulturen=anzahl_kulturen)
+    if parameter.get('toleranz') is not None:
+        simulation.kultur_toleranz = list(parameter['toleranz'])
+    n = simulation.topologie.anzahl
+    population = np.zeros(ticks + 1)
+    anteile = np.zeros((ticks + 1, anzahl_kulturen + 1))
+
+    def aufnehmen(t):
+        kultur = simulation.kultur[:n][simulation.status[:n] > 0]
+        population[t] = len(kultur) / n
+        if len(kultur):
+            anteile[t] = np.bincount(kultur, minlength=anzahl_kulturen + 1) / len(kultur)
+
+    aufnehmen(0)
+    for t in range(1, ticks + 1):
+        simulation.tick()
+        aufnehmen(t)
+    simulation.schliessen()
+    return {'population': population, 'anteile': anteile}
+
+
+def abweichung(ersatz, voll):
+    """Fehlermaße zwischen zwei Verläufen eines Satzes: RMS der Populationsdichte, mittlere und
+    End-Totalvariation der Kulturanteile (0 = gleich, 1 = disjunkt)"""
+    tv = 0.5 * np.abs(ersatz['anteile'] - voll['anteile']).sum(axis=-1)
+    return {
+        'population_rmse': float(np.sqrt(np.mean((ersatz['population'] - voll['population']) ** 2))),
+        'population_ende': float(ersatz['population'][-1] - voll['population'][-1]),
+        'anteile_tv': float(tv.mean()),
+        'anteile_tv_ende': float(tv[-1]),
+    }
+
+
+def _rang(werte):
+    rang = np.empty(len(werte))
+    rang[np.argsort(werte, kind='stable')] = np.arange(len(werte))
+    return rang
+
+
+def rang_korrelation(a, b):
+    """Spearman-Korrelation (ohne Bindungskorrektur); nan bei weniger als zwei Werten"""
+    if len(a) < 2:
+        return float('nan')
+    ra, rb = _rang(np.asarray(a)), _rang(np.asarray(b))
+    if ra.std() == 0 or rb.std() == 0:
+        return float('nan')
+    return float(np.corrcoef(ra, rb)[0, 1])
+
+
+def kalibriere(parameter, ticks, breite=60, hoehe=60, seeds=(0, 1, 2), anzahl_kulturen=9,
+               topologie='torus', faktoren=(0.5, 0.75, 1.0, 1.25, 1.5), entmischungen=(0.0, 0.2, 0.4, 0.6, 0.8),
+               klumpendichten=(0.0, 0.3, 0.5, 0.7, 0.9)):
+    """Vergleicht das Ersatzmodell mit vollen Läufen derselben Parametersätze.
+
+    Je Satz wird über die Seeds gemittelt. Die Kennzahlen werden aus dem Gitter `faktoren` ×
+    `entmischungen` × `klumpendichten` so gewählt, dass RMS-Fehler der Populationsdichte plus
+    mittlere Totalvariation der Kulturanteile über alle Sätze minimal sind (das ganze Gitter
+    läuft als ein Stapel). Gibt die Kennzahlen (als 'kennzahlen' direkt für mittelfeld() und
+    vorauswahl()), die Fehlermaße je Satz (reines Mittelfeld und angepasst), die
+    Rangkorrelation der Endpopulation und der Endanteile sowie die Rechenzeiten zurück.
+    """
+    parameter = [dict(p) for p in parameter]
+    beginn = time.perf_counter()
+    voll = []
+    for p in parameter:
+        laeufe = [voller_lauf(p, ticks, breite, hoehe, seed, anzahl_kulturen, topologie) for seed in seeds]
+        voll.append({name: np.mean([lauf[name] for lauf in laeufe], axis=0) for name in ('population', 'anteile')})
+    zeit_voll = time.perf_counter() - beginn
+
+    beginn = time.perf_counter()
+    roh = mittelfeld(parameter, ticks, anzahl_kulturen, topologie)
+    zeit_ersatz = time.perf_counter() - beginn
+    # Das ganze Gitter als ein Stapel: Zeile g * Sätze + i für Gitterpunkt g
+    gitter = [g.reshape(-1) for g in np.meshgrid(np.asarray(faktoren, dtype=np.float64),
+                                                 np.asarray(entmischungen, dtype=np.float64),
+                                                 np.asarray(klumpendichten, dtype=np.float64), indexing='ij')]
+    punkte = len(gitter[0])
+    stapel = mittelfeld(parameter * punkte, ticks, anzahl_kulturen, topologie,
+                        *(np.repeat(g, len(parameter)) for g in gitter))
+    ziel_population = np.array([v['population'] for v in voll])
+    ziel_anteile = np.array([v['anteile'] for v in voll])
+    population = stapel['population'].reshape(punkte, len(parameter), -1)
+    anteile = stapel['anteile'].reshape((punkte, len(parameter)) + ziel_anteile.shape[1:])
+    fehler = (np.sqrt(np.mean((population - ziel_population) ** 2, axis=2)).mean(axis=1) +
+              0.5 * np.abs(anteile - ziel_anteile).sum(axis=3).mean(axis=(1, 2)))
+    bester = int(np.argmin(fehler))
+    angepasst = {'population': population[bester], 'anteile': anteile[bester]}
+
+    def satz(verlauf, i):
+        return {name: verlauf[name][i] for name in ('population', 'anteile')}
+
+    saetze = []
+    for i, p in enumerate(parameter):
+        saetze.append({
+            'parameter': p,
+            'roh': abweichung(satz(roh, i), voll[i]),
+            'angepasst': abweichung(satz(angepasst, i), voll[i]),
+        })
+    return {
+        'kennzahlen': {name: float(g[bester]) for name, g in
+                       zip(('geburt_faktor', 'entmischung', 'klumpendichte'), gitter)},
+        'saetze': saetze,
+        'rang_population': rang_korrelation(angepasst['population'][:, -1], ziel_population[:, -1]),
+        'rang_anteile': rang_korrelation(angepasst['anteile'][:, -1].reshape(-1), ziel_anteile[:, -1].reshape(-1)),
+        'zeit_voll': zeit_voll,
+        'zeit_ersatz': zeit_ersatz,
+    }
+
+
+def vorauswahl(parameter, ticks, bewertung=None, anteil=0.1, anzahl_kulturen=9, topologie='torus',
+               geburt_faktor=1.0, entmischung=0.0, klumpendichte=0.0):
+    """Bewertet alle Parametersätze mit dem Ersatzmodell und behält den besten `anteil`.
+
+    `bewertung` ist eine Funktion(population, anteile) auf dem Verlauf eines Satzes, größer
+    ist besser (Standard: Populationsdichte am Ende). Gibt [(wert, parameter), ...] absteigend
+    sortiert zurück, mindestens einen Satz. Die Kennzahlen kommen aus kalibriere()['kennzahlen'].
+    """
+    parameter = [dict(p) for p in parameter]
+    if not parameter:
+        return []
+    bewertung = bewertung or (lambda population, anteile: population[-1])
+    verlauf = mittelfeld(parameter, ticks, anzahl_kulturen, topologie, geburt_faktor, entmischung, klumpendichte)
+    werte = [float(bewertung(verlauf['population'][i], verlauf['anteile'][i])) for i in range(len(parameter))]
+    reihenfolge = sorted(range(len(parameter)), key=lambda i: werte[i], reverse=True)
+    behalten = max(1, int(round(anteil * len(parameter))))
+    return [(werte[i], parameter[i]) for i in reihenfolge[:behalten]]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Mittelfeld-Ersatzmodell: Kalibrierung gegen volle Läufe")
+    parser.add_argument('parameter', help="JSON-Datei mit einer Liste von Parametersätzen")
+    parser.add_argument('--ticks', type=int, default=500)
+    parser.add_argument('--breite', type=int, default=60)
+    parser.add_argument('--hoehe', type=int, default=60)
+    parser.add_argument('--seeds', type=int, default=3, help="Volle Läufe je Parametersatz")
+    parser.add_argument('--kulturen', type=int, default=9)
+    parser.add_argument('--topologie', default='torus', choices=sorted(TOPOLOGIEN))
+    args = parser.parse_args()
+
+    with open(args.parameter, encoding='utf-8') as datei:
+        parameter = json.load(datei)
+    ergebnis = kalibriere(parameter, args.ticks, args.breite, args.hoehe, range(args.seeds),
+                          args.kulturen, args.topologie)
+    print(', '.join(f"{name}: {wert:.2f}" for name, wert in ergebnis['kennzahlen'].items()))
+    for satz in ergebnis['saetze']:
+        roh, angepasst = satz['roh'], satz['angepasst']
+        print(f"{json.dumps(satz['parameter'], sort_keys=True)}: "
+              f"Population RMSE {roh['population_rmse']:.4f} -> {angepasst['population_rmse']:.4f}, "
+              f"Anteile TV {roh['anteile_tv']:.3f} -> {angepasst['anteile_tv']:.3f}")
+    print(f"Rangkorrelation Endpopulation: {ergebnis['rang_population']:.3f}, "
+          f"Endanteile: {ergebnis['rang_anteile']:.3f}")
+    print(f"Rechenzeit voll: {ergebnis['zeit_voll']:.2f} s, Ersatzmodell: {ergebnis['zeit_ersatz']:.4f} s")
+
+
+if __name__ == '__main__':
+    main()
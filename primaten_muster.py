@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+"""
+Primaten – Anfangsmuster
+Erzeugt Anfangszustände in einem Zug mit NumPy statt Zelle für Zelle: zufällige Belegungen
+aus einem Generator mit Seed sowie strukturierte Szenarien aus Bildern (eine Kultur je Farbe)
+oder .npy-Arrays (Kultur je Zelle, 0 = leer). Eine .npz-Datei mit den Feldern von
+zustand_arrays() (z. B. von speichere()) stellt einen vollständigen Zustand wieder her.
+
+Ein Muster ist ein Dictionary mit den Feldern aus FELDER (2-D in der Form des Raums) und
+optional 'ressourcen'; SimulationsBasis.setze_anfangszustand() übernimmt es.
+"""
+
+import os
+
+import numpy as np
+from PIL import Image
+
+FELDER = ('status', 'alter', 'geschlecht', 'kultur', 'kultur2', 'macht')
+
+# Unterschiedliche Farben, die je Block dem Palettenvergleich unterzogen werden
+FARB_BLOCK = 4096
+
+
+def _generator(seed):
+    """Akzeptiert einen Seed oder einen vorhandenen Generator"""
+    return seed if isinstance(seed, np.random.Generator) else np.random.default_rng(seed)
+
+
+def zufallsmuster(form, dichte=0.1, anzahl_kulturen=9, hybrid=False, ressourcen=False, seed=None):
+    """Zufällige Belegung wie bei der Initialisierung: junge Primaten mit zufälligem Geschlecht,
+    zufälliger Kultur (bei Hybridisierung auch Sekundärkultur) und Macht 1–9"""
+    rng = _generator(seed)
+    n = int(np.prod(form))
+    belegt = rng.random(n) < dichte
+    geschlecht = np.where(rng.random(n) < 0.5, 1, 2)
+    kultur = rng.integers(1, anzahl_kulturen + 1, n)
+    kultur2 = rng.integers(1, anzahl_kulturen + 1, n) if hybrid else 0
+    macht = rng.integers(1, 10, n)
+    muster = {
+        'status': np.where(belegt, 1, 0),
+        'alter': np.zeros(n, dtype=np.int16),
+        'geschlecht': np.where(belegt, geschlecht, 0),
+        'kultur': np.where(belegt, kultur, 0),
+        'kultur2': np.where(belegt, kultur2, 0),
+        'macht': np.where(belegt, macht, 0),
+    }
+    muster = {name: feld.reshape(form) for name, feld in muster.items()}
+    if ressourcen:
+        muster['ressourcen'] = rng.integers(0, 6, form)
+    return muster
+
+
+def kulturmuster(kultur, anzahl_kulturen=9, hybrid=False, ressourcen=False, seed=None):
+    """Belegung aus einem Kulturfeld (0 = leer): jede Zelle mit Kultur erhält einen jungen
+    Primaten dieser Kultur, die übrigen Eigenschaften werden wie bei zufallsmuster() gezogen"""
+    rng = _generator(seed)
+    kultur = np.asarray(kultur)
+    if kultur.ndim != 2:
+        raise ValueError("Das Kulturfeld muss zweidimensional sein")
+    if kultur.min() < 0 or kultur.max() > anzahl_kulturen:
+        raise ValueError(f"Kulturen im Muster müssen zwischen 0 und {anzahl_kulturen} liegen")
+    belegt = kultur > 0
+    muster = {
+        'status': belegt.astype(np.int8),
+        'alter': np.zeros(kultur.shape, dtype=np.int16),
+        'geschlecht': np.where(belegt, np.where(rng.random(kultur.shape) < 0.5, 1, 2), 0),
+        'kultur': kultur.astype(np.int16),
+        'kultur2': (np.where(belegt, rng.integers(1, anzahl_kulturen + 1, kultur.shape), 0)
+                    if hybrid else np.zeros(kultur.shape, dtype=np.int16)),
+        'macht': np.where(belegt, rng.integers(1, 10, kultur.shape), 0),
+    }
+    if ressourcen:
+        muster['ressourcen'] = rng.integers(0, 6, kultur.shape)
+    return muster
+
+
+def _rgb(farbe):
+    """'#rrggbb' oder (r, g, b) als Tupel"""
+    if isinstance(farbe, str):
+        return tuple(int(farbe[i:i + 2], 16) for i in (1, 3, 5))
+    return tuple(farbe)
+
+
+def aus_bild(dateiname, farben=None, hintergrund='#ffffff'):
+    """Kulturfeld aus einem Bild (ein Pixel je Zelle); Hintergrund und transparente Pixel bleiben leer.
+
+    Mit `farben` (Liste wie kultur_farben, Index = Kultur) erhält jedes Pixel die Kultur der
+    nächstgelegenen Farbe, der Hintergrund zählt dabei mit. Ohne `farben` werden die Farben
+    nach Häufigkeit nummeriert (häufigste = Kultur 1), nur exakt die Hintergrundfarbe ist leer.
+    """
+    rgba = np.asarray(Image.open(dateiname).convert('RGBA'))
+    hoehe, breite = rgba.shape[:2]
+    rgb = rgba[..., :3].reshape(-1, 3).astype(np.uint32)
+    schluessel = (rgb[:, 0] << 16) | (rgb[:, 1] << 8) | rgb[:, 2]
+    farbwerte, inverse, anzahl = np.unique(schluessel, return_inverse=True, return_counts=True)
+    tabelle = np.stack([farbwerte >> 16, (farbwerte >> 8) & 255, farbwerte & 255], axis=1).astype(np.int64)
+    hg = np.array(_rgb(hintergrund))
+
+    if farben is None:
+        ist_hg = (tabelle == hg).all(axis=1)
+        reihenfolge = np.argsort(-np.where(ist_hg, -1, anzahl), kind='stable')
+        kultur_je_farbe = np.zeros(len(tabelle), dtype=np.int64)
+        kultur_je_farbe[reihenfolge] = np.arange(1, len(tabelle) + 1)
+        kultur_je_farbe[ist_hg] = 0
+    else:
+        palette = np.array([_rgb(hg)] + [_rgb(f) for f in farben[1:]], dtype=np.int64)
+        kultur_je_farbe = np.empty(len(tabelle), dtype=np.int64)
+        for a in range(0, len(tabelle), FARB_BLOCK):
+            block = tabelle[a:a + FARB_BLOCK]
+            abstand = ((block[:, None, :] - palette[None, :, :]) ** 2).sum(axis=2)
+            kultur_je_farbe[a:a + FARB_BLOCK] = abstand.argmin(axis=1)
+
+    kultur = kultur_je_farbe[inverse.reshape(-1)].reshape(hoehe, breite)
+    kultur[rgba[..., 3] < 128] = 0
+    return kultur
+
+
+def lade(dateiname, anzahl_kulturen=9, hybrid=False, ressourcen=False, farben=None, seed=None):
+    """Muster aus einer Datei: .npz (vollständiger Zustand), .npy (Kulturfeld) oder Bild"""
+    endung = os.path.splitext(dateiname)[1].lower()
+    if endung == '.npz':
+        with np.load(dateiname) as daten:
+            muster = {name: daten[name] for name in daten.files}
+        if 'status' not in muster or 'kultur' not in muster:
+            raise ValueError(f"{dateiname} enthält keinen Zustand (status und kultur fehlen)")
+        if ressourcen and 'ressourcen' not in muster:
+            muster['ressourcen'] = _generator(seed).integers(0, 6, muster['status'].shape)
+        return muster
+    if endung == '.npy':
+        kultur = np.load(dateiname)
+    else:
+        kultur = aus_bild(dateiname, farben)
+    if kultur.max() > anzahl_kulturen:
+        raise ValueError(f"{dateiname} enthält {int(kultur.max())} Kulturen, erlaubt sind {anzahl_kulturen}")
+    return kulturmuster(kultur, anzahl_kulturen, hybrid, ressourcen, seed)
+
+
+def muster_form(dateiname):
+    """(hoehe, breite) eines Musters, ohne die Datei vollständig zu lesen"""
+    endung = os.path.splitext(dateiname)[1].lower()
+    if endung == '.npz':
+        with np.load(dateiname) as daten:
+            return daten['status'].shape
+    if endung == '.npy':
+        return np.load(dateiname, mmap_mode='r').shape
+    with Image.open(dateiname) as bild:
+        return bild.height, bild.width
+
+
+def speichere(simulation, dateiname):
+    """Speichert den aktuellen Zustand als .npz, das lade() als Muster wieder einliest"""
+    np.savez_compressed(dateiname, **simulation.zustand_arrays())
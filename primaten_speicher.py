@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+"""
+Primaten – Speicherbedarf
+Wie viel Speicher belegt ein Lauf, und wie viel kommt noch? bericht() zerlegt den belegten
+Speicher einer Simulation in Bestandteile (Zustand, zweiter Zustand des Ticks, Ressourcen,
+Nachbartabellen, Verlauf, Zwischenergebnisse eines Ticks) in Bytes und Bytes je Zelle;
+schaetzung() rechnet das Wachstum des Verlaufs für die restlichen Ticks hinzu.
+
+Mit einem Speicherbudget (budget_anwenden()) startet ein Lauf gar nicht erst, wenn schon
+Zustand und Tick nicht hineinpassen (SpeicherBudgetFehler), und nimmt nur jeden k-ten Tick in
+den Verlauf auf, wenn sonst der Verlauf das Budget sprengen würde – statt mitten im Lauf vom
+Betriebssystem beendet zu werden.
+
+SpeicherMessung misst die tatsächlichen Allokationen einzelner Ticks mit tracemalloc; damit
+die Messung den Lauf nicht bremst, nur jeden `intervall`-ten Tick.
+"""
+
+import math
+import tracemalloc
+
+import numpy as np
+
+# Der Verlauf wächst durch Verdoppeln und kopiert beim Umzug: kurzzeitig alter und neuer Puffer
+VERLAUF_SPITZE = 3
+
+# Ein Budget muss mindestens so viele Verlaufseinträge erlauben
+MIN_VERLAUF = 16
+
+
+class SpeicherBudgetFehler(MemoryError):
+    """Der Lauf passt nicht in das Speicherbudget"""
+
+
+def bericht(simulation):
+    """Belegter Speicher je Bestandteil: {name: {'bytes', 'pro_zelle'}}, dazu 'gesamt'
+    (einschließlich der nur während eines Ticks belegten Teile)"""
+    zellen = simulation.topologie.anzahl
+    bedarf = simulation.speicherbedarf()
+    bedarf['gesamt'] = sum(bedarf.values())
+    return {name: {'bytes': int(groesse), 'pro_zelle': groesse / zellen} for name, groesse in bedarf.items()}
+
+
+def verlauf_bytes_pro_eintrag(simulation):
+    """Vorsichtige Schätzung eines künftigen Verlaufseintrags: doppelt so viele Werte je
+    Gruppe wie bisher im Mittel, für die Kulturen mindestens anzahl_kulturen"""
+    werte = {zeiger: 2 * anzahl for zeiger, anzahl in simulation.history.werte_je_eintrag().items()}
+    werte['kultur_zeiger'] = max(werte.get('kultur_zeiger', 0), simulation.anzahl_kulturen)
+    return simulation.history.bytes_pro_eintrag(werte)
+
+
+def schaetzung(simulation, ticks):
+    """Voraussichtlicher Höchstbedarf in Bytes, wenn die Simulation noch `ticks` Ticks läuft:
+    {'fest' (ohne Verlauf), 'verlauf' (Höchststand samt Umzug), 'eintraege', 'gesamt'}"""
+    bedarf = simulation.speicherbedarf()
+    fest = sum(groesse for name, groesse in bedarf.items() if name != 'verlauf')
+    eintraege = min(len(simulation.history) + ticks // simulation.verlauf_intervall, simulation.max_history)
+    verlauf = VERLAUF_SPITZE * eintraege * verlauf_bytes_pro_eintrag(simulation)
+    return {'fest': int(fest), 'verlauf': int(verlauf), 'eintraege': eintraege, 'gesamt': int(fest + verlauf)}
+
+
+def budget_anwenden(simulation, ticks, budget):
+    """Richtet die Simulation für `ticks` weitere Ticks auf höchstens `budget` Bytes ein.
+
+    Passen Zustand und Tick samt MIN_VERLAUF Verlaufseinträgen nicht hinein, gibt es einen
+    SpeicherBudgetFehler. Sonst werden verlauf_intervall und max_history so gesetzt, dass der
+    Verlauf in den Rest passt (der Verlauf verliert dann an zeitlicher Auflösung, nicht an
+    Länge). Gibt die Schätzung nach der Anpassung zurück.
+    """
+    vorher = schaetzung(simulation, ticks)
+    if vorher['gesamt'] <= budget:
+        return vorher
+    je_eintrag = VERLAUF_SPITZE * verlauf_bytes_pro_eintrag(simulation)
+    platz = int((budget - vorher['fest']) // je_eintrag)
+    if platz < MIN_VERLAUF:
+        raise SpeicherBudgetFehler(
+            f"Der Lauf braucht mindestens {(vorher['fest'] + MIN_VERLAUF * je_eintrag) / 2**20:.1f} MB, "
+            f"das Budget beträgt {budget / 2**20:.1f} MB")
+    neu = max(1, platz - len(simulation.history))
+    simulation.verlauf_intervall = max(simulation.verlauf_intervall, math.ceil(ticks / neu))
+    simulation.max_history = min(simulation.max_history, platz)
+    return schaetzung(simulation, ticks)
+
+
+class SpeicherMessung:
+    """Misst die Allokationen jedes `intervall`-ten Ticks mit tracemalloc.
+
+    Statt simulation.tick() wird messung.tick(simulation) aufgerufen. Je gemessenem Tick
+    werden festgehalten: 'spitze' (höchster zusätzlicher Speicher während des Ticks),
+    'netto' (danach verbliebener Zuwachs), 'bloecke' (neu belegte, noch lebende Blöcke),
+    'numpy' (Nettozuwachs der NumPy-Puffer) und die `orte` größten Allokationsstellen.
+    Läuft tracemalloc nicht schon, wird es nur für die gemessenen Ticks eingeschaltet.
+    """
+
+    def __init__(self, intervall=100, orte=5):
+        self.intervall = intervall
+        self.orte = orte
+        self.messungen = []
+
+    def tick(self, simulation):
+        if simulation.tick_index % self.intervall:
+            return simulation.tick()
+        eigenes = not tracemalloc.is_tracing()
+        if eigenes:
+            tracemalloc.start()
+        try:
+            vorher = tracemalloc.take_snapshot()
+            tracemalloc.reset_peak()
+            start, _ = tracemalloc.get_traced_memory()
+            ergebnis = simulation.tick()
+            ende, spitze = tracemalloc.get_traced_memory()
+            nachher = tracemalloc.take_snapshot()
+        finally:
+            if eigenes:
+                tracemalloc.stop()
+        unterschiede = nachher.compare_to(vorher, 'lineno')
+        numpy_filter = [tracemalloc.DomainFilter(True, np.lib.tracemalloc_domain)]
+        numpy = sum(s.size_diff for s in nachher.filter_traces(numpy_filter).compare_to(
+            vorher.filter_traces(numpy_filter), 'filename'))
+        self.messungen.append({
+            'tick': simulation.tick_index,
+            'spitze': spitze - start,
+            'netto': ende - start,
+            'bloecke': sum(max(0, s.count_diff) for s in unterschiede),
+            'numpy': numpy,
+            'orte': [(str(s.traceback), s.size_diff, s.count_diff)
+                     for s in sorted(unterschiede, key=lambda s: -abs(s.size_diff))[:self.orte]],
+        })
+        return ergebnis
+
+    def zusammenfassung(self, zellen=None):
+        """Mittel und Maximum von Spitze, Nettozuwachs und Blöcken über alle Messungen;
+        mit `zellen` zusätzlich die Spitze je Zelle"""
+        if not self.messungen:
+            return {}
+        ergebnis = {'messungen': len(self.messungen)}
+        for name in ('spitze', 'netto', 'bloecke', 'numpy'):
+            werte = [messung[name] for messung in self.messungen]
+            ergebnis[f"{name}_mittel"] = float(np.mean(werte))
+            ergebnis[f"{name}_max"] = int(max(werte))
+        if zellen:
+            ergebnis['spitze_pro_zelle'] = ergebnis['spitze_max'] / zellen
+        return ergebnis
+
+
+def bericht_text(simulation, messung=None):
+    """Bericht als Textzeilen (für die Kommandozeile)"""
+    zeilen = []
+    for name, werte in bericht(simulation).items():
+        zeilen.append(f"{name:12s} {werte['bytes'] / 2**20:10.2f} MB {werte['pro_zelle']:10.1f} B/Zelle")
+    if messung is not None and messung.messungen:
+        z = messung.zusammenfassung(simulation.topologie.anzahl)
+        zeilen.append(f"Tick (tracemalloc, {z['messungen']} Messungen): Spitze {z['spitze_max'] / 2**20:.2f} MB "
+                      f"({z['spitze_pro_zelle']:.1f} B/Zelle), netto {z['netto_mittel'] / 1024:.1f} KB, "
+                      f"{z['bloecke_mittel']:.0f} Blöcke")
+    return zeilen
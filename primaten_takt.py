@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+Primaten – Taktsteuerung
+Misst die Kosten von Tick und Neuzeichnen und plant daraus, wie viele Ticks pro
+angezeigtem Bild gerechnet werden, um eine Ziel-Tickrate bzw. maximale Geschwindigkeit zu erreichen
+"""
+
+import math
+
+# Auswahl für die Geschwindigkeits-Combobox (Ticks pro Sekunde)
+GESCHWINDIGKEITEN = ["1", "2", "5", "10", "20", "50", "100", "200", "Max"]
+
+
+class TaktSteuerung:
+    """Plant Ticks pro Bild und Wartezeit bis zum nächsten Bild"""
+
+    def __init__(self, ziel_tps=10, ziel_fps=25, glaettung=0.3):
+        self.ziel_tps = ziel_tps      # None = so schnell wie möglich
+        self.ziel_fps = ziel_fps
+        self.glaettung = glaettung
+        self.tick_kosten = None       # Sekunden pro Tick (gleitender Mittelwert)
+        self.render_kosten = None     # Sekunden pro Bild
+        self.gemessene_tps = 0.0
+        self._ticks_pro_bild = 1
+        self._letztes_bild = None
+
+    def setze_geschwindigkeit(self, wert):
+        """Übernimmt einen Combobox-Wert ("Max" oder Ticks pro Sekunde)"""
+        self.ziel_tps = None if str(wert).lower() == "max" else float(wert)
+
+    def _glaetten(self, alt, neu):
+        """Exponentiell geglätteter Mittelwert"""
+        return neu if alt is None else alt + self.glaettung * (neu - alt)
+
+    def miss_ticks(self, anzahl, dauer):
+        """Meldet die Rechenzeit für `anzahl` Ticks"""
+        if anzahl > 0:
+            self.tick_kosten = self._glaetten(self.tick_kosten, dauer / anzahl)
+
+    def miss_render(self, dauer):
+        """Meldet die Zeit für das Neuzeichnen eines Bildes"""
+        self.render_kosten = self._glaetten(self.render_kosten, dauer)
+
+    def ticks_pro_bild(self):
+        """Anzahl Ticks, die vor dem nächsten Neuzeichnen gerechnet werden"""
+        if self.tick_kosten is None or self.render_kosten is None:
+            self._ticks_pro_bild = 1
+            return 1
+
+        bild_dauer = 1.0 / self.ziel_fps
+        # Rechenbudget pro Bild; mindestens die Hälfte der Bilddauer bleibt für Ticks,
+        # damit langsames Zeichnen die Simulation nicht vollständig ausbremst
+        budget = max(bild_dauer - self.render_kosten, bild_dauer / 2)
+        moeglich = max(1, int(budget / max(self.tick_kosten, 1e-9)))
+
+        if self.ziel_tps is None:
+            anzahl = moeglich
+        else:
+            anzahl = min(moeglich, max(1, math.ceil(self.ziel_tps / self.ziel_fps)))
+        self._ticks_pro_bild = anzahl
+        return anzahl
+
+    def verzoegerung_ms(self):
+        """Wartezeit bis zum nächsten Bild, damit die Ziel-Tickrate eingehalten wird"""
+        if self.ziel_tps is None or self.tick_kosten is None or self.render_kosten is None:
+            return 1
+        anzahl = self._ticks_pro_bild
+        periode = anzahl / self.ziel_tps
+        rest = periode - anzahl * self.tick_kosten - self.render_kosten
+        return max(1, int(rest * 1000))
+
+    def bild_fertig(self, anzahl, zeitpunkt):
+        """Aktualisiert die erreichte Tickrate aus dem Abstand zum vorigen Bild"""
+        if self._letztes_bild is not None and zeitpunkt > self._letztes_bild:
+            tps = anzahl / (zeitpunkt - self._letztes_bild)
+            self.gemessene_tps = tps if not self.gemessene_tps else self._glaetten(self.gemessene_tps, tps)
+        self._letztes_bild = zeitpunkt
+
+    def neu_starten(self):
+        """Vergisst den Zeitpunkt des letzten Bildes (nach Pause oder Stopp)"""
+        self._letztes_bild = None
@@ -0,0 +1,286 @@
+#!/usr/bin/env python3
+"""
+Primaten – Telemetrie
+Ein lokaler Server (asyncio, TCP oder Unix-Socket), der Kennzahlen jedes Ticks, die Zahl
+der Ereignisse und auf Wunsch verkleinerte Kulturbilder an beliebig viele Abonnenten sendet.
+
+Die Simulation läuft unabhängig vom Server: jeder Abonnent hat eine begrenzte Warteschlange,
+ist sie voll, wird die älteste Nachricht verworfen. Langsame Empfänger verlieren also
+Nachrichten, bremsen aber weder die Simulation noch die anderen Empfänger.
+
+Protokoll (little endian): jede Nachricht beginnt mit Länge des Inhalts (uint32) und Typ
+(uint8), danach folgt der Inhalt:
+  STATISTIK  tick, population (int64), Ereignisse je Art (3 x uint16), Anzahl n (uint32),
+             n Kulturen (uint16), n Zähler (uint32)
+  BILD       tick (int64), hoehe, breite (uint16), faktor (uint8), hoehe*breite Kulturen (uint16)
+  ENDE       tick (int64)
+
+Als Gegenstelle dient der Testclient: python primaten_telemetrie.py --port PORT
+"""
+
+import argparse
+import asyncio
+import struct
+import threading
+
+import numpy as np
+
+from primaten_export import EREIGNIS_ARTEN
+
+STATISTIK, BILD, ENDE = 1, 2, 3
+
+KOPF = struct.Struct('<IB')
+STATISTIK_KOPF = struct.Struct('<qq3HI')
+BILD_KOPF = struct.Struct('<qHHB')
+ENDE_KOPF = struct.Struct('<q')
+
+
+def _nachricht(typ, inhalt):
+    """Setzt Kopf und Inhalt zu einer Nachricht zusammen"""
+    return KOPF.pack(len(inhalt), typ) + inhalt
+
+
+def kodiere_statistik(tick, population, ereignisse, kulturen, counts):
+    """STATISTIK-Nachricht aus einem Verlaufseintrag und den Ereigniszahlen des Ticks"""
+    inhalt = (STATISTIK_KOPF.pack(tick, population, *ereignisse, len(kulturen)) +
+              np.asarray(kulturen, dtype='<u2').tobytes() + np.asarray(counts, dtype='<u4').tobytes())
+    return _nachricht(STATISTIK, inhalt)
+
+
+def kodiere_bild(tick, kultur, faktor):
+    """BILD-Nachricht aus einem bereits verkleinerten Kulturfeld"""
+    hoehe, breite = kultur.shape
+    inhalt = BILD_KOPF.pack(tick, hoehe, breite, faktor) + np.ascontiguousarray(kultur, dtype='<u2').tobytes()
+    return _nachricht(BILD, inhalt)
+
+
+def dekodiere(typ, inhalt):
+    """Entschlüsselt den Inhalt einer Nachricht in ein Dictionary"""
+    if typ == STATISTIK:
+        tick, population, *ereignisse, n = STATISTIK_KOPF.unpack_from(inhalt)
+        start = STATISTIK_KOPF.size
+        kulturen = np.frombuffer(inhalt, dtype='<u2', count=n, offset=start)
+        counts = np.frombuffer(inhalt, dtype='<u4', count=n, offset=start + 2 * n)
+        return {'typ': 'statistik', 'tick': tick, 'population': population,
+                'ereignisse': dict(zip(EREIGNIS_ARTEN, ereignisse)),
+                'kulturen': kulturen, 'kultur_counts': counts}
+    if typ == BILD:
+        tick, hoehe, breite, faktor = BILD_KOPF.unpack_from(inhalt)
+        kultur = np.frombuffer(inhalt, dtype='<u2', offset=BILD_KOPF.size).reshape(hoehe, breite)
+        return {'typ': 'bild', 'tick': tick, 'faktor': faktor, 'kultur': kultur}
+    if typ == ENDE:
+        return {'typ': 'ende', 'tick': ENDE_KOPF.unpack(inhalt)[0]}
+    raise ValueError(f"Unbekannter Nachrichtentyp {typ}")
+
+
+async def lies_nachricht(reader):
+    """Liest die nächste Nachricht vom Stream; None am Verbindungsende"""
+    try:
+        kopf = await reader.readexactly(KOPF.size)
+        laenge, typ = KOPF.unpack(kopf)
+        return dekodiere(typ, await reader.readexactly(laenge))
+    except asyncio.IncompleteReadError:
+        return None
+
+
+class TelemetrieServer:
+    """Beobachter, der den Verlauf einer Simulation an Abonnenten verteilt.
+
+    `bild_intervall` > 0 sendet alle so viele Ticks das Kulturfeld, verkleinert um
+    `bild_faktor` (jede faktor-te Zelle je Richtung; leere Zellen als 0).
+    """
+
+    def __init__(self, host='127.0.0.1', port=0, pfad=None, warteschlange=64, bild_intervall=0,
+                 bild_faktor=4):
+        self.host = host
+        self.port = port
+        self.pfad = pfad
+        self.warteschlange = warteschlange
+        self.bild_intervall = bild_intervall
+        self.bild_faktor = bild_faktor
+        self.adresse = None
+        self.gesendet = 0
+        self.verworfen = 0
+
+        self._simulation = None
+        self._ausstehend = None              # Statistik des letzten Ticks (Ereignisse folgen noch)
+        self._ereignisse = [0] * len(EREIGNIS_ARTEN)
+        self._abonnenten = {}                # Warteschlange -> Writer, nur im Server-Thread verändert
+        self._loop = None
+        self._server = None
+        self._thread = None
+
+    # --- Server-Thread ---
+
+    def starten(self):
+        """Startet den Server in einem eigenen Thread und wartet, bis er erreichbar ist"""
+        bereit = threading.Event()
+        fehler = []
+
+        def laufen():
+            self._loop = asyncio.new_event_loop()
+            try:
+                self._loop.run_until_complete(self._oeffnen())
+            except OSError as e:
+                fehler.append(e)
+                bereit.set()
+                return
+            bereit.set()
+            self._loop.run_forever()
+            self._loop.close()
+
+        self._thread = threading.Thread(target=laufen, name='primaten-telemetrie', daemon=True)
+        self._thread.start()
+        bereit.wait()
+        if fehler:
+            raise fehler[0]
+        return self
+
+    async def _oeffnen(self):
+        if self.pfad:
+            self._server = await asyncio.start_unix_server(self._abonnent, path=self.pfad)
+            self.adresse = self.pfad
+        else:
+            self._server = await asyncio.start_server(self._abonnent, self.host, self.port)
+            self.adresse = self._server.sockets[0].getsockname()[:2]
+
+    async def _abonnent(self, reader, writer):
+        """Bedient einen Abonnenten, bis er die Verbindung trennt oder der Server endet"""
+        schlange = asyncio.Queue(self.warteschlange)
+        self._abonnenten[schlange] = writer
+        try:
+            while True:
+                nachricht = await schlange.get()
+                if nachricht is None:
+                    break
+                writer.write(nachricht)
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            self._abonnenten.pop(schlange, None)
+            writer.close()
+
+    def _einreihen(self, schlange, nachricht):
+        """Reiht eine Nachricht ein; bei voller Warteschlange fällt die älteste heraus"""
+        if schlange.full():
+            schlange.get_nowait()
+            self.verworfen += 1
+        schlange.put_nowait(nachricht)
+
+    def _verteilen(self, nachricht):
+        """Reiht eine Nachricht bei allen Abonnenten ein (im Server-Thread)"""
+        for schlange in self._abonnenten:
+            self._einreihen(schlange, nachricht)
+            self.gesendet += 1
+
+    async def _stoppen(self):
+        self._server.close()
+        for schlange in list(self._abonnenten):
+            self._einreihen(schlange, None)
+        # Abonnenten ihre Warteschlangen noch zustellen lassen, wer dann noch hängt, wird getrennt
+        for _ in range(100):
+            if not self._abonnenten:
+                break
+            await asyncio.sleep(0.01)
+        for writer in list(self._abonnenten.values()):
+            writer.transport.abort()
+        while self._abonnenten:
+            await asyncio.sleep(0)
+        await self._server.wait_closed()
+
+    def beenden(self):
+        """Trennt alle Abonnenten (nach Zustellung ihrer Warteschlangen) und stoppt den Server"""
+        if self._loop is None:
+            return
+        asyncio.run_coroutine_threadsafe(self._stoppen(), self._loop).result()
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join()
+        self._loop = None
+
+    def abonnenten(self):
+        """Anzahl der verbundenen Abonnenten"""
+        return len(self._abonnenten)
+
+    # --- Beobachter-Schnittstelle (Simulations-Thread) ---
+
+    def _senden(self, nachricht):
+        if self._loop is not None:
+            self._loop.call_soon_threadsafe(self._verteilen, nachricht)
+
+    def _statistik_senden(self):
+        """Sendet die zurückgehaltene Statistik samt den inzwischen gemeldeten Ereignissen"""
+        if self._ausstehend is not None:
+            self._senden(kodiere_statistik(*self._ausstehend[:2], self._ereignisse, *self._ausstehend[2:]))
+            self._ausstehend = None
+        self._ereignisse = [0] * len(EREIGNIS_ARTEN)
+
+    def verfolge(self, simulation):
+        """Meldet sich als Beobachter an; die Simulation wird für Bilder gebraucht"""
+        self._simulation = simulation
+        simulation.beobachter.append(self)
+        return self
+
+    def schreibe(self, datenpunkt):
+        """Verlaufseintrag eines Ticks; gesendet wird er mit dem nächsten Tick, weil die
+        Ereignisse eines Ticks erst nach seinem Verlaufseintrag gemeldet werden"""
+        self._statistik_senden()
+        if not self._abonnenten:
+            return
+        tick = datenpunkt['tick']
+        self._ausstehend = (tick, datenpunkt['population'], datenpunkt['kulturen'].copy(),
+                            datenpunkt['kultur_counts'].copy())
+        if self.bild_intervall and self._simulation is not None and tick % self.bild_intervall == 0:
+            zustand = self._simulation.zustand_arrays()
+            f = self.bild_faktor
+            kultur = np.where(zustand['status'][::f, ::f] > 0, zustand['kultur'][::f, ::f], 0)
+            self._senden(kodiere_bild(tick, kultur, f))
+
+    def ereignis(self, tick, art, kultur):
+        """Zählt die Ereignisse des laufenden Ticks"""
+        self._ereignisse[EREIGNIS_ARTEN.index(art)] += 1
+
+    def schliessen(self):
+        """Ende eines Laufs: letzte Statistik und ENDE senden (der Server läuft weiter)"""
+        tick = self._ausstehend[0] if self._ausstehend is not None else 0
+        self._statistik_senden()
+        self._senden(_nachricht(ENDE, ENDE_KOPF.pack(tick)))
+        self._simulation = None
+
+
+async def _testclient(host, port, pfad, anzahl):
+    """Verbindet sich mit dem Server und gibt die empfangenen Nachrichten aus"""
+    if pfad:
+        reader, writer = await asyncio.open_unix_connection(pfad)
+    else:
+        reader, writer = await asyncio.open_connection(host, port)
+    empfangen = 0
+    while anzahl is None or empfangen < anzahl:
+        nachricht = await lies_nachricht(reader)
+        if nachricht is None:
+            break
+        empfangen += 1
+        if nachricht['typ'] == 'statistik':
+            ereignisse = ", ".join(f"{art} {n}" for art, n in nachricht['ereignisse'].items() if n)
+            print(f"Tick {nachricht['tick']}: Population {nachricht['population']}, "
+                  f"{len(nachricht['kulturen'])} Kulturen" + (f" ({ereignisse})" if ereignisse else ""))
+        elif nachricht['typ'] == 'bild':
+            print(f"Tick {nachricht['tick']}: Bild {nachricht['kultur'].shape[1]}x{nachricht['kultur'].shape[0]}")
+        else:
+            print(f"Lauf beendet nach Tick {nachricht['tick']}")
+    writer.close()
+
+
+def main():
+    """Testclient für die Kommandozeile"""
+    parser = argparse.ArgumentParser(description="Telemetrie eines Primaten-Laufs empfangen")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--pfad', default=None, help="Unix-Socket statt TCP")
+    parser.add_argument('--anzahl', type=int, default=None, help="Nach so vielen Nachrichten beenden")
+    args = parser.parse_args()
+    asyncio.run(_testclient(args.host, args.port, args.pfad, args.anzahl))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+"""
+Primaten – Topologien
+Nachbarschaften als vorab berechnete Indextabellen: eine dichte Tabelle (N × k) für den
+schnellen Zugriff aller Engines und eine CSR-Darstellung für unregelmäßige Graphen.
+
+Zellen werden zeilenweise durchnummeriert (i = y * breite + x). Fehlende Nachbarn
+(Rand eines begrenzten Gitters, Knoten mit kleinerem Grad) verweisen auf den Index N,
+eine zusätzliche, dauerhaft leere Zelle am Ende der Zustandsarrays. Außerhalb des Gebiets
+verhält sich die Welt also wie eine leere Zelle.
+"""
+
+import warnings
+
+import numpy as np
+
+# Moore-Nachbarschaft in der Reihenfolge der Referenz (dy äußere, dx innere Schleife)
+MOORE_VERSATZ = [(dy, dx) for dy in (-1, 0, 1) for dx in (-1, 0, 1) if (dy, dx) != (0, 0)]
+
+# Hexagonales Gitter mit versetzten Zeilen ("odd-r"): Versatz je nach Zeilenparität
+HEX_VERSATZ = {
+    0: [(-1, -1), (-1, 0), (0, -1), (0, 1), (1, -1), (1, 0)],
+    1: [(-1, 0), (-1, 1), (0, -1), (0, 1), (1, 0), (1, 1)],
+}
+
+# Ab diesem Verhältnis von Maximal- zu mittlerem Grad warnt aus_csr() vor der dichten Tabelle
+GRAD_WARNSCHWELLE = 8
+
+
+class Topologie:
+    """Nachbarschaftstabelle einer Welt mit N Zellen"""
+
+    def __init__(self, index, form, name=''):
+        self.index = np.ascontiguousarray(index, dtype=np.int64)  # (N, k), Lücken = N
+        self.form = tuple(form)                                   # (hoehe, breite) für Ansichten
+        self.name = name
+        self.anzahl = self.index.shape[0]
+        self.k = self.index.shape[1]
+        if self.form[0] * self.form[1] != self.anzahl:
+            raise ValueError(f"Form {self.form} passt nicht zu {self.anzahl} Zellen")
+        # Transponiert (k, N): Nachbar j aller Zellen liegt zusammenhängend im Speicher
+        self.index_t = np.ascontiguousarray(self.index.T)
+        self.grad = (self.index < self.anzahl).sum(axis=1)
+        self._csr = None
+
+    @property
+    def hoehe(self):
+        """Zeilen der Ansicht"""
+        return self.form[0]
+
+    @property
+    def breite(self):
+        """Spalten der Ansicht"""
+        return self.form[1]
+
+    def csr(self):
+        """CSR-Darstellung (indptr, indices) ohne Lücken"""
+        if self._csr is None:
+            gueltig = self.index < self.anzahl
+            indptr = np.zeros(self.anzahl + 1, dtype=np.int64)
+            np.cumsum(gueltig.sum(axis=1), out=indptr[1:])
+            self._csr = (indptr, self.index[gueltig])
+        return self._csr
+
+    def nachbarn(self, i):
+        """Echte Nachbarn (ohne Lücken) der Zelle i"""
+        zeile = self.index[i]
+        return zeile[zeile < self.anzahl]
+
+    def sammle(self, feld_flach):
+        """Nachbarwerte (k, N) aus einem flachen Feld der Länge N+1 (inkl. leerer Zelle)"""
+        return feld_flach[self.index_t]
+
+
+def _gitter(breite, hoehe, versatz_fuer_zeile, toroidal, name):
+    """Baut die Indextabelle eines Gitters aus Versätzen (dy, dx) je Zeile"""
+    n = breite * hoehe
+    y, x = np.divmod(np.arange(n), breite)
+    spalten = []
+    for j in range(len(versatz_fuer_zeile(0))):
+        dy = np.empty(n, dtype=np.int64)
+        dx = np.empty(n, dtype=np.int64)
+        for paritaet in (0, 1):
+            maske = (y % 2) == paritaet
+            dy[maske], dx[maske] = versatz_fuer_zeile(paritaet)[j]
+        ny = y + dy
+        nx = x + dx
+        if toroidal:
+            spalten.append((ny % hoehe) * breite + (nx % breite))
+        else:
+            innen = (ny >= 0) & (ny < hoehe) & (nx >= 0) & (nx < breite)
+            spalten.append(np.where(innen, ny * breite + nx, n))
+    return Topologie(np.stack(spalten, axis=1), (hoehe, breite), name)
+
+
+def torus(breite, hoehe):
+    """Moore-Nachbarschaft mit toroidalem Rand (Standard der Simulation)"""
+    return _gitter(breite, hoehe, lambda p: MOORE_VERSATZ, True, 'torus')
+
+
+def begrenzt(breite, hoehe):
+    """Moore-Nachbarschaft mit festem Rand; außerhalb liegt leere Welt"""
+    return _gitter(breite, hoehe, lambda p: MOORE_VERSATZ, False, 'begrenzt')
+
+
+def hexagonal(breite, hoehe, toroidal=True):
+    """Sechser-Nachbarschaft auf versetzten Zeilen; toroidal nur mit gerader Höhe"""
+    if toroidal and hoehe % 2:
+        raise ValueError("Ein toroidales Hexagonalgitter braucht eine gerade Höhe")
+    return _gitter(breite, hoehe, lambda p: HEX_VERSATZ[p], toroidal, 'hexagonal')
+
+
+def aus_csr(indptr, indices, form=None, name='graph'):
+    """Beliebiger Graph aus CSR-Arrays.
+
+    Die Engines arbeiten nur mit der dichten Tabelle, sie wird auf den Maximalgrad aufgefüllt
+    (mindestens eine Spalte, auch für Graphen ohne Kanten). Bei stark schiefer Gradverteilung
+    (ein Knoten mit sehr vielen Nachbarn) belegt sie daher N × Maximalgrad Einträge und jeder
+    Tick prüft entsprechend viele leere Nachbarn; dann wird gewarnt.
+    """
+    indptr = np.asarray(indptr, dtype=np.int64)
+    indices = np.asarray(indices, dtype=np.int64)
+    n = len(indptr) - 1
+    grad = np.diff(indptr)
+    k = max(1, int(grad.max()) if n else 0)
+    if n and len(indices) and k > GRAD_WARNSCHWELLE * len(indices) / n:
+        warnings.warn(f"Maximalgrad {k} bei mittlerem Grad {len(indices) / n:.1f}: die dichte "
+                      f"Nachbartabelle ist {k * n / len(indices):.0f}-mal größer als der Graph",
+                      stacklevel=2)
+    tabelle = np.full((n, k), n, dtype=np.int64)
+    zeilen = np.repeat(np.arange(n), grad)
+    spalten = np.arange(len(indices)) - np.repeat(indptr[:-1], grad)
+    tabelle[zeilen, spalten] = indices
+    topologie = Topologie(tabelle, form or (1, n), name)
+    topologie._csr = (indptr, indices)
+    return topologie
+
+
+def graph(kanten, anzahl, form=None, gerichtet=False):
+    """Sozialnetz aus einer Kantenliste [(a, b), ...] mit `anzahl` Knoten"""
+    kanten = np.asarray(kanten, dtype=np.int64).reshape(-1, 2)
+    if not gerichtet:
+        kanten = np.concatenate([kanten, kanten[:, ::-1]])
+    kanten = np.unique(kanten[kanten[:, 0] != kanten[:, 1]], axis=0)
+    indptr = np.zeros(anzahl + 1, dtype=np.int64)
+    np.cumsum(np.bincount(kanten[:, 0], minlength=anzahl), out=indptr[1:])
+    return aus_csr(indptr, kanten[:, 1], form)
+
+
+TOPOLOGIEN = {
+    'torus': torus,
+    'begrenzt': begrenzt,
+    'hexagonal': hexagonal,
+}
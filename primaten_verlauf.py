@@ -0,0 +1,177 @@
+#!/usr/bin/env python3
+"""
+Primaten – Verlaufsspeicher
+Spaltenorientierte Historie: Tick, Population und die Histogramme fester Breite (Alter, Macht,
+Geschlecht) als Arrays, die sparsamen Einträge variabler Länge – Kulturzähler und
+Hybridisierungspaare – je Gruppe hintereinander in gemeinsamen Puffern (Zeiger je Eintrag
+wie bei CSR).
+
+Einmal geschriebene Einträge werden nie überschrieben – beim Wachsen und beim Verwerfen
+alter Einträge entstehen neue Puffer. Ansichten (Einträge oder Spalten) bleiben daher
+gültig und zeigen immer die Daten zum Zeitpunkt ihrer Entstehung.
+"""
+
+import numpy as np
+
+# Klassen der Histogramme: Alter 0–19 und »20 und älter«, Macht abgerundet 0–9,
+# Geschlecht weiblich/männlich
+ALTER_KLASSEN = 21
+MACHT_KLASSEN = 10
+GESCHLECHTER = 2
+
+# Spalten fester Breite je Eintrag: Name -> (Breite oder None für Skalare, dtype)
+FESTE_SPALTEN = {
+    'tick': (None, np.int64),
+    'population': (None, np.int64),
+    'alter_hist': (ALTER_KLASSEN, np.int64),
+    'macht_hist': (MACHT_KLASSEN, np.int64),
+    'geschlecht_hist': (GESCHLECHTER, np.int64),
+}
+
+# Gruppen variabler Länge: Zeigername -> Spalten (alle gleich lang je Eintrag)
+GRUPPEN = {
+    'kultur_zeiger': {'kulturen': np.int64, 'kultur_counts': np.int64, 'anteile': np.float64},
+    'hybrid_zeiger': {'hybrid_primaer': np.int64, 'hybrid_sekundaer': np.int64, 'hybrid_counts': np.int64},
+}
+
+
+class Verlauf:
+    """Liste von Verlaufseinträgen mit Spaltenzugriff ohne Kopie"""
+
+    def __init__(self, kapazitaet=1024, kultur_kapazitaet=None):
+        self._erster = 0   # Index des ältesten noch gültigen Eintrags in den Puffern
+        self._ende = 0     # Index hinter dem jüngsten Eintrag
+        werte = kultur_kapazitaet or kapazitaet * 16
+        self._anlegen(kapazitaet, {zeiger: werte for zeiger in GRUPPEN})
+
+    @classmethod
+    def aus_spalten(cls, spalten):
+        """Baut einen Verlauf aus den Spalten von spalten() wieder auf (die Werte werden kopiert)"""
+        laenge = len(spalten['tick'])
+        verlauf = cls.__new__(cls)
+        verlauf._erster, verlauf._ende = 0, laenge
+        verlauf._anlegen(max(2 * laenge, 16),
+                         {zeiger: max(2 * len(spalten[next(iter(namen))]), 256)
+                          for zeiger, namen in GRUPPEN.items()})
+        for name in FESTE_SPALTEN:
+            verlauf._fest[name][:laenge] = spalten[name]
+        for zeiger, namen in GRUPPEN.items():
+            verlauf._zeiger[zeiger][:laenge + 1] = spalten[zeiger]
+            for name in namen:
+                verlauf._werte[name][:len(spalten[name])] = spalten[name]
+        return verlauf
+
+    def _anlegen(self, kapazitaet, gruppen_kapazitaet):
+        """Legt leere Puffer der gewünschten Größe an"""
+        self._fest = {name: np.zeros(kapazitaet if breite is None else (kapazitaet, breite), dtype=dtype)
+                      for name, (breite, dtype) in FESTE_SPALTEN.items()}
+        self._zeiger = {zeiger: np.zeros(kapazitaet + 1, dtype=np.int64) for zeiger in GRUPPEN}
+        self._werte = {name: np.zeros(gruppen_kapazitaet[zeiger], dtype=dtype)
+                       for zeiger, spalten in GRUPPEN.items() for name, dtype in spalten.items()}
+
+    def _umziehen(self, kapazitaet, gruppen_kapazitaet):
+        """Kopiert die gültigen Einträge an den Anfang neuer Puffer"""
+        a, b = self._erster, self._ende
+        fest, zeiger, werte = self._fest, self._zeiger, self._werte
+        self._anlegen(kapazitaet, gruppen_kapazitaet)
+        for name, feld in fest.items():
+            self._fest[name][:b - a] = feld[a:b]
+        for name_zeiger, spalten in GRUPPEN.items():
+            ka, kb = zeiger[name_zeiger][a], zeiger[name_zeiger][b]
+            self._zeiger[name_zeiger][:b - a + 1] = zeiger[name_zeiger][a:b + 1] - ka
+            for name in spalten:
+                self._werte[name][:kb - ka] = werte[name][ka:kb]
+        self._erster, self._ende = 0, b - a
+
+    def append(self, datenpunkt):
+        """Hängt einen Verlaufseintrag an (die Arrays des Eintrags werden kopiert)"""
+        anzahl = {zeiger: len(datenpunkt[next(iter(spalten))]) for zeiger, spalten in GRUPPEN.items()}
+        start = {zeiger: self._zeiger[zeiger][self._ende] for zeiger in GRUPPEN}
+        if self._ende == len(self._fest['tick']) or any(
+                start[zeiger] + anzahl[zeiger] > len(self._werte[next(iter(spalten))])
+                for zeiger, spalten in GRUPPEN.items()):
+            laenge = len(self)
+            groessen = {zeiger: max(2 * (start[zeiger] - self._zeiger[zeiger][self._erster] + anzahl[zeiger]), 256)
+                        for zeiger in GRUPPEN}
+            self._umziehen(max(2 * laenge, 16), groessen)
+            start = {zeiger: self._zeiger[zeiger][self._ende] for zeiger in GRUPPEN}
+        i = self._ende
+        for name, feld in self._fest.items():
+            feld[i] = datenpunkt[name]
+        for zeiger, spalten in GRUPPEN.items():
+            a, b = start[zeiger], start[zeiger] + anzahl[zeiger]
+            for name in spalten:
+                self._werte[name][a:b] = datenpunkt[name]
+            self._zeiger[zeiger][i + 1] = b
+        self._ende += 1
+
+    def entferne_aelteste(self, anzahl=1):
+        """Verwirft die ältesten Einträge (der Speicher wird beim nächsten Umzug frei)"""
+        self._erster = min(self._ende, self._erster + anzahl)
+
+    def __len__(self):
+        return self._ende - self._erster
+
+    def _eintrag(self, i):
+        """Eintrag i (Pufferindex) als Dictionary mit Ansichten auf die Puffer"""
+        eintrag = {
+            'tick': int(self._fest['tick'][i]),
+            'population': int(self._fest['population'][i]),
+        }
+        for zeiger, spalten in GRUPPEN.items():
+            a, b = self._zeiger[zeiger][i], self._zeiger[zeiger][i + 1]
+            for name in spalten:
+                eintrag[name] = self._werte[name][a:b]
+        for name, (breite, _) in FESTE_SPALTEN.items():
+            if breite is not None:
+                eintrag[name] = self._fest[name][i]
+        return eintrag
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self._eintrag(self._erster + i) for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("Verlaufsindex außerhalb des Bereichs")
+        return self._eintrag(self._erster + index)
+
+    def __iter__(self):
+        for i in range(self._erster, self._ende):
+            yield self._eintrag(i)
+
+    def speicherbedarf(self):
+        """Belegte Bytes aller Puffer (samt Reserve und verworfener, noch nicht umgezogener Einträge)"""
+        return (sum(feld.nbytes for feld in self._fest.values()) +
+                sum(feld.nbytes for feld in self._zeiger.values()) +
+                sum(feld.nbytes for feld in self._werte.values()))
+
+    def werte_je_eintrag(self):
+        """Mittlere Zahl der Werte je Eintrag in jeder Gruppe (Zeigername -> Anzahl)"""
+        laenge = len(self)
+        return {zeiger: (self._zeiger[zeiger][self._ende] - self._zeiger[zeiger][self._erster]) / laenge
+                if laenge else 0.0 for zeiger in GRUPPEN}
+
+    def bytes_pro_eintrag(self, werte=None):
+        """Platzbedarf eines Eintrags: feste Spalten, Zeiger und Gruppenwerte (`werte`:
+        Zeigername -> Werte je Eintrag, Standard: Mittel der vorhandenen Einträge)"""
+        werte = werte or self.werte_je_eintrag()
+        groesse = sum(np.dtype(dtype).itemsize * (breite or 1) for breite, dtype in FESTE_SPALTEN.values())
+        for zeiger, spalten in GRUPPEN.items():
+            groesse += np.dtype(np.int64).itemsize
+            groesse += werte.get(zeiger, 0) * sum(np.dtype(dtype).itemsize for dtype in spalten.values())
+        return groesse
+
+    def spalten(self):
+        """Alle Einträge als Spalten: tick, population und die Histogramme (eine Zeile je Eintrag)
+        sowie je Gruppe die Werte hintereinander mit Zeigern (Eintrag j belegt z. B.
+        kultur_zeiger[j]:kultur_zeiger[j+1] von kulturen, kultur_counts und anteile).
+        Bis auf die Zeiger sind es Ansichten auf die Puffer."""
+        a, b = self._erster, self._ende
+        spalten = {name: feld[a:b] for name, feld in self._fest.items()}
+        for zeiger, namen in GRUPPEN.items():
+            ka, kb = self._zeiger[zeiger][a], self._zeiger[zeiger][b]
+            spalten[zeiger] = self._zeiger[zeiger][a:b + 1] - ka
+            for name in namen:
+                spalten[name] = self._werte[name][ka:kb]
+        return spalten
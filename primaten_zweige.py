@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+"""
+Primaten – Verzweigung
+Rechnet Was-wäre-wenn-Zweige ab dem Zustand eines laufenden Simulationsobjekts, ohne von
+Tick 0 neu zu beginnen: jeder Zweig läuft in einem mit os.fork abgespaltenen Prozess, der
+den Zustand des Elternprozesses per Copy-on-write erbt. Das Abzweigen kostet daher weder
+Kopie noch Serialisierung; Speicher wird erst belegt, wenn ein Zweig Seiten verändert.
+
+Die Feld-Engine schreibt ihre Felder nie an Ort und Stelle, sondern legt je Tick neue an –
+die geerbten Felder bleiben geteilt. Bei der Objekt-Engine berührt schon das Lesen die
+Referenzzähler der Primat-Objekte, sie wird daher nach und nach kopiert.
+
+Jeder Zweig (Zweig) kann Seed, Toleranztabelle und Regeln ändern, eine Kultur einwandern
+lassen oder eine beliebige Funktion auf die Simulation anwenden. Zurück kommt je Zweig das
+Ergebnis der Auswertungsfunktion (Standard: Endstand und Verlauf seit dem Abzweigen).
+Benötigt die Startmethode 'fork' (Linux, macOS).
+"""
+
+import multiprocessing
+import os
+
+import numpy as np
+
+from primaten_verlauf import FESTE_SPALTEN, GRUPPEN
+
+# Elternsimulation und Aufträge; die Kindprozesse erben sie beim Abspalten
+_auftrag = None
+
+
+class Zweig:
+    """Beschreibung eines Zweigs.
+
+    `seed` setzt die Zufallsquelle neu, `toleranz` ersetzt die Toleranztabelle (Index =
+    Kultur), `regeln` ändert einzelne Regeln, `einwanderung` = (kultur, anzahl) setzt
+    Primaten einer Kultur in leere Zellen, `aenderung` ist eine Funktion(simulation),
+    die zuletzt aufgerufen wird.
+    """
+
+    def __init__(self, name=None, seed=None, toleranz=None, regeln=None, einwanderung=None,
+                 aenderung=None):
+        self.name = name
+        self.seed = seed
+        self.toleranz = toleranz
+        self.regeln = regeln
+        self.einwanderung = einwanderung
+        self.aenderung = aenderung
+
+    def anwenden(self, simulation):
+        """Wendet die Änderungen des Zweigs auf die (abgezweigte) Simulation an"""
+        if self.seed is not None:
+            simulation.neu_saeen(self.seed)
+        if self.toleranz is not None:
+            if len(self.toleranz) != simulation.anzahl_kulturen + 1:
+                raise ValueError(f"Die Toleranztabelle braucht {simulation.anzahl_kulturen + 1} Einträge")
+            simulation.kultur_toleranz = list(self.toleranz)
+        if self.regeln:
+            simulation.regeln_aendern(self.regeln)
+        if self.einwanderung is not None:
+            kultur, anzahl = self.einwanderung
+            simulation.einwanderung(kultur, anzahl, self.seed)
+        if self.aenderung is not None:
+            self.aenderung(simulation)
+
+
+def endstand(simulation, start_tick):
+    """Standardauswertung: Endstand und Verlauf ab dem Abzweigen (Spalten wie verlauf_arrays)"""
+    spalten = simulation.verlauf_arrays()
+    ab = int(np.searchsorted(spalten['tick'], start_tick))
+    verlauf = {name: np.array(spalten[name][ab:]) for name in FESTE_SPALTEN}
+    for zeiger, namen in GRUPPEN.items():
+        z = spalten[zeiger]
+        verlauf[zeiger] = z[ab:] - z[ab]
+        for name in namen:
+            verlauf[name] = np.array(spalten[name][z[ab]:])
+    letzter = simulation.history[-1]
+    return {
+        'tick': simulation.tick_index,
+        'population': letzter['population'],
+        'kulturen': np.array(letzter['kulturen']),
+        'kultur_counts': np.array(letzter['kultur_counts']),
+        'verlauf': verlauf,
+    }
+
+
+def _zweig_rechnen(nummer):
+    """Läuft im Kindprozess: Zweig anwenden, rechnen, auswerten"""
+    simulation, zweige, ticks, auswertung = _auftrag
+    simulation.nach_verzweigung()
+    start_tick = simulation.tick_index
+    zweig = zweige[nummer]
+    zweig.anwenden(simulation)
+    for _ in range(ticks):
+        simulation.tick()
+    ergebnis = auswertung(simulation, start_tick)
+    simulation.schliessen()
+    return ergebnis
+
+
+def verzweige(simulation, zweige, ticks, auswertung=None, prozesse=None):
+    """Rechnet jeden Zweig `ticks` Ticks ab dem aktuellen Zustand von `simulation`.
+
+    Jeder Zweig bekommt einen frisch abgespaltenen Prozess (höchstens `prozesse` gleichzeitig,
+    Standard: Zahl der Kerne); die Elternsimulation bleibt unverändert. `auswertung` ist eine
+    Funktion(simulation, start_tick), ihr Ergebnis muss sich pickeln lassen. Gibt eine Liste
+    von (name, ergebnis) in der Reihenfolge der Zweige zurück.
+    """
+    global _auftrag
+    if 'fork' not in multiprocessing.get_all_start_methods():
+        raise RuntimeError("Verzweigen braucht die Startmethode 'fork' (nicht unter Windows)")
+    zweige = [zweig if isinstance(zweig, Zweig) else Zweig(**zweig) for zweig in zweige]
+    prozesse = min(prozesse or os.cpu_count() or 1, len(zweige)) or 1
+    _auftrag = (simulation, zweige, ticks, auswertung or endstand)
+    try:
+        kontext = multiprocessing.get_context('fork')
+        # maxtasksperchild=1: jeder Zweig startet vom unveränderten Zustand des Elternprozesses
+        with kontext.Pool(prozesse, maxtasksperchild=1) as pool:
+            ergebnisse = pool.map(_zweig_rechnen, range(len(zweige)), chunksize=1)
+    finally:
+        _auftrag = None
+    return [(zweig.name if zweig.name is not None else nummer, ergebnis)
+            for nummer, (zweig, ergebnis) in enumerate(zip(zweige, ergebnisse))]
+
+
+def vergleiche(ergebnisse):
+    """Endzähler aller Zweige als Matrix: (namen, kulturen, matrix Zweige × Kulturen)"""
+    namen = [name for name, _ in ergebnisse]
+    if not ergebnisse:
+        return namen, np.zeros(0, dtype=np.int64), np.zeros((0, 0), dtype=np.int64)
+    kulturen = np.unique(np.concatenate([e['kulturen'] for _, e in ergebnisse]))
+    matrix = np.zeros((len(ergebnisse), len(kulturen)), dtype=np.int64)
+    for zeile, (_, ergebnis) in enumerate(ergebnisse):
+        matrix[zeile, np.searchsorted(kulturen, ergebnis['kulturen'])] = ergebnis['kultur_counts']
+    return namen, kulturen, matrix